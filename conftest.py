@@ -5,6 +5,7 @@ import pytest
 pytest_plugins = [
     # Plugins
     'pytest_plugins.auto_vault',
+    'pytest_plugins.collection_profiler',
     'pytest_plugins.disable_rp_params',
     'pytest_plugins.external_logging',
     'pytest_plugins.fixture_markers',
@@ -26,6 +27,9 @@ pytest_plugins = [
     'pytest_plugins.select_random_tests',
     'pytest_plugins.capsule_n-minus',
     'pytest_plugins.upstream_pr',
+    'pytest_plugins.xdist_scheduling',
+    'pytest_plugins.run_planner',
+    'pytest_plugins.lock_metrics',
     # Fixtures
     'pytest_fixtures.core.broker',
     'pytest_fixtures.core.sat_cap_factory',
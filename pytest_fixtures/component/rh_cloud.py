@@ -1,6 +1,7 @@
 import pytest
 
 from robottelo.constants import CAPSULE_REGISTRATION_OPTS
+from robottelo.utils.concurrency import run_on_hosts
 
 
 def enable_insights(host, satellite, org, activation_key):
@@ -59,13 +60,17 @@ def rhcloud_registered_hosts(
     rhcloud_activation_key, rhcloud_manifest_org, mod_content_hosts, module_target_sat_insights
 ):
     """Fixture that registers content hosts to Satellite and Insights."""
-    for vm in mod_content_hosts:
+
+    def _configure_insights(vm):
         vm.configure_insights_client(
             satellite=module_target_sat_insights,
             activation_key=rhcloud_activation_key,
             org=rhcloud_manifest_org,
             rhel_distro=f"rhel{vm.os_version.major}",
         )
+
+    run_on_hosts(mod_content_hosts, _configure_insights)
+    for vm in mod_content_hosts:
         assert vm.subscribed
     return mod_content_hosts
 
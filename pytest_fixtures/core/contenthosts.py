@@ -12,6 +12,7 @@ from robottelo import constants
 from robottelo.config import settings
 from robottelo.enums import NetworkType
 from robottelo.hosts import ContentHost, Satellite
+from robottelo.utils.concurrency import run_on_hosts
 
 
 def host_conf(request):
@@ -176,11 +177,14 @@ def rex_contenthost(request, module_org, target_sat, module_ak_with_cv):
 def rex_contenthosts(request, module_org, target_sat, module_ak_with_cv):
     request.param['no_containers'] = True
     with Broker(**host_conf(request), host_class=ContentHost, _count=2) as hosts:
-        for host in hosts:
+
+        def _register(host):
             repo = settings.repos['SATCLIENT_REPO'][f'RHEL{host.os_version.major}']
-            host.register(
+            return host.register(
                 module_org, None, module_ak_with_cv.name, target_sat, repo_data=f'repo={repo}'
             )
+
+        run_on_hosts(hosts, _register)
         yield hosts
 
 
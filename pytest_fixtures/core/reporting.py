@@ -5,6 +5,8 @@ import pytest
 from xdist import get_xdist_worker_id
 
 from robottelo.config import setting_is_set, settings
+from robottelo.logging import logger
+from robottelo.utils import http
 
 FMT_XUNIT_TIME = '%Y-%m-%dT%H:%M:%S'
 
@@ -44,6 +46,17 @@ def pytest_sessionstart(session):
             )
 
 
+def pytest_sessionfinish(session):
+    """Log the API request counters of this worker's shared HTTP sessions"""
+    worker_id = get_xdist_worker_id(session)
+    for url, stats in http.stats().items():
+        logger.info(
+            f'API requests from {worker_id} to {url}: {stats["requests"]} requests, '
+            f'{stats["errors"]} errors, {stats["connections"]} connections, '
+            f'mean {stats["mean_time"]:.3f}s, max {stats["max_time"]:.3f}s'
+        )
+
+
 @pytest.fixture(autouse=False, scope='session')
 def record_testsuite_timestamp_xml(record_testsuite_property):
     now = datetime.datetime.now(datetime.UTC)
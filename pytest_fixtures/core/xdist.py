@@ -49,7 +49,14 @@ def align_to_satellite(request, worker_id, satellite_factory):
         elif settings.server.hostnames and worker_pos < len(settings.server.hostnames):
             settings.set("server.hostname", settings.server.hostnames[worker_pos])
         elif settings.server.xdist_behavior == 'balance' and settings.server.hostnames:
-            settings.set("server.hostname", random.choice(settings.server.hostnames))
+            if request.config.getoption('schedule_durations', False) or request.config.getoption(
+                'schedule_affinity', False
+            ):
+                # as many workers per Satellite, the scheduler balances the workers
+                hostname = settings.server.hostnames[worker_pos % len(settings.server.hostnames)]
+            else:
+                hostname = random.choice(settings.server.hostnames)
+            settings.set("server.hostname", hostname)
         # get current satellite information
         elif settings.server.xdist_behavior == 'on-demand':
             on_demand_sat = satellite_factory()
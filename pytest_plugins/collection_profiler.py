@@ -0,0 +1,111 @@
+"""Profile the collection of the test suite.
+
+``--profile-collection=PATH`` writes to PATH (JSON) the time every test module took to collect,
+which includes its import, and the time every plugin and fixture module spent in the
+collection hooks of :data:`PROFILED_HOOKS`, along with the events of a speedscope profile.
+``scripts/profile_collection.py`` runs the collection with it and adds the import time of
+every module::
+
+    python scripts/profile_collection.py tests/foreman
+"""
+
+from collections import defaultdict
+import functools
+import json
+from pathlib import Path
+import time
+
+import pytest
+
+PROFILED_HOOKS = ('pytest_collection_modifyitems', 'pytest_generate_tests')
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--profile-collection',
+        metavar='PATH',
+        help='Write the time spent collecting every test module and in the collection hooks '
+        'of every plugin to PATH (JSON)',
+    )
+
+
+def pytest_configure(config):
+    if path := config.getoption('profile_collection'):
+        path = Path(path)
+        if worker := getattr(config, 'workerinput', {}).get('workerid'):
+            path = path.with_stem(f'{path.stem}_{worker}')
+        config.pluginmanager.register(CollectionProfiler(path), 'collection_profiler_instance')
+
+
+class CollectionProfiler:
+    """Times the profiled hooks of every plugin and the collection of every test module"""
+
+    def __init__(self, path):
+        self.path = path
+        self.start = time.perf_counter()
+        self.events = []
+        self.hooks = defaultdict(lambda: [0, 0.0])
+        self.modules = {}
+
+    def _open(self, frame):
+        at = time.perf_counter()
+        self.events.append(('O', frame, round((at - self.start) * 1e6)))
+        return at
+
+    def _close(self, frame, started):
+        at = time.perf_counter()
+        self.events.append(('C', frame, round((at - self.start) * 1e6)))
+        return at - started
+
+    def _timed(self, hook_name, plugin_name, function):
+        frame = f'{plugin_name}:{hook_name}'
+
+        @functools.wraps(function)
+        def timed(*args):
+            started = self._open(frame)
+            try:
+                return function(*args)
+            finally:
+                stats = self.hooks[(hook_name, plugin_name)]
+                stats[0] += 1
+                stats[1] += self._close(frame, started)
+
+        return timed
+
+    @pytest.hookimpl
+    def pytest_plugin_registered(self, plugin, manager):
+        """Time the profiled hooks of every plugin, already registered ones included"""
+        for hook_name in PROFILED_HOOKS:
+            for impl in getattr(manager.hook, hook_name).get_hookimpls():
+                # wrappers are generators, their time is part of the hooks they wrap
+                if impl.plugin is plugin and not (impl.hookwrapper or impl.wrapper):
+                    # modules by their name, other plugins by their class
+                    plugin_name = getattr(plugin, '__name__', type(plugin).__name__)
+                    impl.function = self._timed(hook_name, plugin_name, impl.function)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector):
+        if not isinstance(collector, pytest.Module):
+            yield
+            return
+        started = self._open(collector.nodeid)
+        yield
+        self.modules[collector.nodeid] = self._close(collector.nodeid, started)
+
+    def pytest_collection_finish(self, session):
+        self.path.write_text(
+            json.dumps(
+                {
+                    'hooks': [
+                        {'hook': hook, 'plugin': plugin, 'calls': calls, 'seconds': seconds}
+                        for (hook, plugin), (calls, seconds) in self.hooks.items()
+                    ],
+                    'modules': [
+                        {'module': module, 'seconds': seconds}
+                        for module, seconds in self.modules.items()
+                    ],
+                    'events': self.events,
+                },
+                indent=1,
+            )
+        )
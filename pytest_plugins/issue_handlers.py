@@ -9,6 +9,7 @@ from robottelo.utils.issue_handlers import (
     add_workaround,
     should_deselect,
 )
+from robottelo.utils.marker_cache import get_cache
 
 
 def pytest_configure(config):
@@ -48,6 +49,26 @@ IMPORTANCE = re.compile(
 )
 
 
+def source_workarounds(source):
+    """Return the issues of the `is_open` and `not is_open` workarounds in ``source``"""
+    if 'is_open(' not in source:
+        return {'is_open': [], 'not is_open': []}
+    return {'is_open': IS_OPEN.findall(source), 'not is_open': NOT_IS_OPEN.findall(source)}
+
+
+def item_workarounds(item):
+    return source_workarounds(inspect.getsource(item.function))
+
+
+def module_tokens(test_module):
+    module_source = inspect.getsource(test_module)
+    component_matches = COMPONENT.findall(module_source)
+    return {
+        'component': component_matches[0] if component_matches else None,
+        **source_workarounds(module_source),
+    }
+
+
 def generate_issue_collection(items, config):  # pragma: no cover
     """Generates a dictionary with the usage of Issue blockers
 
@@ -94,6 +115,7 @@ def generate_issue_collection(items, config):  # pragma: no cover
     deselect_data = {}  # a local cache for deselected tests
 
     test_modules = set()
+    cache = get_cache(config)
 
     # --- Build the issue marked usage collection ---
     for item in items:
@@ -135,8 +157,11 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 deselect_data[item.location] = issue_key
 
         # Then take the workarounds using `is_open` helper.
-        source = inspect.getsource(item.function)
-        if 'is_open(' in source:
+        if cache:
+            workarounds = cache.item_tokens(item, 'source', item_workarounds)
+        else:
+            workarounds = item_workarounds(item)
+        if workarounds['is_open'] or workarounds['not is_open']:
             kwargs = {
                 'filepath': filepath,
                 'lineno': lineno,
@@ -145,41 +170,30 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 'importance': importance_mark,
                 'component_mark': component_slug,
             }
-            add_workaround(collected_data, IS_OPEN.findall(source), 'is_open', **kwargs)
-            add_workaround(collected_data, NOT_IS_OPEN.findall(source), 'not is_open', **kwargs)
+            for usage, matches in workarounds.items():
+                add_workaround(collected_data, matches, usage, **kwargs)
 
     # Take uses of `is_open` from outside of test cases e.g: SetUp methods
     for test_module in test_modules:
-        module_source = inspect.getsource(test_module)
-        component_matches = COMPONENT.findall(module_source)
-        module_component = None
-        if component_matches:
-            module_component = component_matches[0]
-        if 'is_open(' in module_source:
+        if cache:
+            tokens = cache.tokens(test_module.__file__, 'module', module_tokens, test_module)
+        else:
+            tokens = module_tokens(test_module)
+        if tokens['is_open'] or tokens['not is_open']:
             kwargs = {
                 'filepath': test_module.__file__,
                 'lineno': 1,
                 'testcase': test_module.__name__,
-                'component': module_component,
+                'component': tokens['component'],
             }
 
             def validation(data, issue, usage, **kwargs):
                 return issue not in data
 
-            add_workaround(
-                collected_data,
-                IS_OPEN.findall(module_source),
-                'is_open',
-                validation=validation,
-                **kwargs,
-            )
-            add_workaround(
-                collected_data,
-                NOT_IS_OPEN.findall(module_source),
-                'not is_open',
-                validation=validation,
-                **kwargs,
-            )
+            for usage in ('is_open', 'not is_open'):
+                add_workaround(
+                    collected_data, tokens[usage], usage, validation=validation, **kwargs
+                )
 
     # --- add deselect markers dynamically ---
     for item in items:
@@ -0,0 +1,46 @@
+"""Report the contention of the function locks, see :mod:`robottelo.utils.decorators.func_locker`.
+
+The xdist controller, or the only process without xdist, clears the lock metrics left by the
+previous runs when the session starts. Every process exports its lock metrics when its session
+finishes, and the controller reports the :data:`LOCK_METRICS_SUMMARY_SIZE` locks waited for the
+longest in the terminal summary.
+"""
+
+import pytest
+
+from robottelo.utils.decorators import func_locker
+
+LOCK_METRICS_SUMMARY_SIZE = 10
+
+report_key = pytest.StashKey()
+
+
+def pytest_configure(config):
+    if hasattr(config, 'workerinput') or config.option.collectonly:
+        return
+    config.stash[report_key] = True
+    func_locker.clear_lock_metrics()
+
+
+def pytest_sessionfinish(session):
+    # the workers export before the controller reads, not when they exit
+    func_locker.export_lock_metrics()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.stash.get(report_key, False):
+        return
+    contended = {
+        lock_name: metrics
+        for lock_name, metrics in func_locker.read_lock_metrics().items()
+        if metrics['contended']
+    }
+    if not contended:
+        return
+    terminalreporter.write_sep('-', 'lock contention')
+    for lock_name, metrics in list(contended.items())[:LOCK_METRICS_SUMMARY_SIZE]:
+        terminalreporter.write_line(
+            f'{lock_name}: {metrics["contended"]} of {metrics["acquired"]} acquisitions '
+            f'contended, waited {metrics["wait_time"]:.1f}s (max {metrics["max_wait_time"]:.1f}s), '
+            f'held {metrics["hold_time"]:.1f}s (max {metrics["max_hold_time"]:.1f}s)'
+        )
@@ -9,6 +9,7 @@ from robottelo.hosts import get_sat_rhel_version
 from robottelo.logging import collection_logger as logger
 from robottelo.utils import parse_comma_separated_list
 from robottelo.utils.issue_handlers.jira import are_any_jira_open
+from robottelo.utils.marker_cache import get_cache
 
 FMT_XUNIT_TIME = '%Y-%m-%dT%H:%M:%S'
 IMPORTANCE_LEVELS = []
@@ -49,6 +50,13 @@ def pytest_addoption(parser):
         help='Comma separated list of Jiras to collect tests matching Verifies testimony marker. '
         'If no issue is provided all the tests with Verifies testimony marker will be selected.',
     )
+    parser.addoption(
+        '--warm-marker-cache',
+        action='store_true',
+        help='Extract the testimony tokens of every collected test again and store them in the '
+        'marker token cache, to be reused by later collections, see robottelo.utils.marker_cache. '
+        'e.g. pytest --collect-only -q --warm-marker-cache tests/foreman',
+    )
 
 
 def pytest_configure(config):
@@ -94,6 +102,25 @@ verifies_regex = re.compile(
 )
 
 
+def docstring_tokens(item):
+    """Return the testimony tokens of the docstrings of ``item``, smallest scope first"""
+    item_docstrings = [
+        d
+        for d in map(inspect.getdoc, (item.function, getattr(item, 'cls', None), item.module))
+        if d is not None
+    ]
+    return [
+        {
+            'component': component_regex.findall(docstring),
+            'importance': importance_regex.findall(docstring),
+            'team': team_regex.findall(docstring),
+            'verifies': verifies_regex.findall(docstring),
+            'blocked_by': blocked_by_regex.findall(docstring),
+        }
+        for docstring in item_docstrings
+    ]
+
+
 def handle_verification_issues(item, verifies_marker, verifies_issues):
     """Handles the logic for deselecting tests based on Verifies testimony token
     and --verifies-issues pytest option.
@@ -159,6 +186,7 @@ def pytest_collection_modifyitems(items, config):
     team = [a.lower() for a in (config.getoption('team') or '').split(',') if a != '']
     verifies_issues = config.getoption('verifies_issues')
     blocked_by = config.getoption('blocked_by')
+    cache = get_cache(config)
     logger.info('Processing test items to add testimony token markers')
     for item in items:
         item.user_properties.append(
@@ -170,30 +198,29 @@ def pytest_collection_modifyitems(items, config):
 
         # apply the marks for importance, component, and team
         # Find matches from docstrings starting at smallest scope
-        item_docstrings = [
-            d
-            for d in map(inspect.getdoc, (item.function, getattr(item, 'cls', None), item.module))
-            if d is not None
-        ]
+        if cache:
+            item_tokens = cache.item_tokens(item, 'docstrings', docstring_tokens)
+        else:
+            item_tokens = docstring_tokens(item)
         blocked_by_marks_to_add = []
         verifies_marks_to_add = []
-        for docstring in item_docstrings:
+        for tokens in item_tokens:
             item_mark_names = [m.name for m in item.iter_markers()]
             # Add marker starting at smallest docstring scope
             # only add the mark if it hasn't already been applied at a lower scope
-            doc_component = component_regex.findall(docstring)
+            doc_component = tokens['component']
             if doc_component and 'component' not in item_mark_names:
                 item.add_marker(pytest.mark.component(doc_component[0].lower()))
-            doc_importance = importance_regex.findall(docstring)
+            doc_importance = tokens['importance']
             if doc_importance and 'importance' not in item_mark_names:
                 item.add_marker(pytest.mark.importance(doc_importance[0].lower()))
-            doc_team = team_regex.findall(docstring)
+            doc_team = tokens['team']
             if doc_team and 'team' not in item_mark_names:
                 item.add_marker(pytest.mark.team(doc_team[0].lower()))
-            doc_verifies = verifies_regex.findall(docstring)
+            doc_verifies = tokens['verifies']
             if doc_verifies and 'verifies_issues' not in item_mark_names:
                 verifies_marks_to_add.extend(str(b.strip()) for b in doc_verifies[-1].split(','))
-            doc_blocked_by = blocked_by_regex.findall(docstring)
+            doc_blocked_by = tokens['blocked_by']
             if doc_blocked_by and 'blocked_by' not in item_mark_names:
                 blocked_by_marks_to_add.extend(
                     str(b.strip()) for b in doc_blocked_by[-1].split(',')
@@ -280,3 +307,9 @@ def pytest_collection_modifyitems(items, config):
     # selected will be empty if no filter option was passed, defaulting to full items list
     items[:] = selected if deselected else items
     config.hook.pytest_deselected(items=deselected)
+
+
+def pytest_collection_finish(session):
+    """Store the tokens extracted during the collection in the marker token cache"""
+    if cache := get_cache(session.config):
+        cache.save()
@@ -0,0 +1,203 @@
+"""Plan a run of the selected tests without running them.
+
+``--plan`` stops after the collection, fixture parametrization and marker deselection included,
+and reports what running the selected tests would cost: the Broker checkouts of the
+Satellites, Capsules and content hosts their fixtures deploy, the wall time estimated from the
+historical test durations, see :mod:`robottelo.utils.durations`, and the number of xdist
+workers to run them on::
+
+    pytest tests/foreman/api -m 'not destructive' --plan
+
+A fixture checks out hosts when its source does, see :data:`CHECKOUT_CALL`. It is instantiated
+once per scope and parameter, a session scoped fixture once per worker needing it, tests being
+scheduled by work unit like ``--schedule-durations`` does.
+"""
+
+from collections import Counter, defaultdict
+import datetime
+import functools
+import inspect
+import os
+import re
+
+from _pytest.skipping import evaluate_skip_marks
+import pytest
+
+from pytest_plugins.xdist_scheduling import analyze
+from robottelo.config import settings
+from robottelo.utils.durations import DurationHistory, module_of
+from robottelo.utils.scheduling import group_units, recommend_workers, wall_time
+
+CHECKOUT_CALL = re.compile(
+    r'\bwith Broker\(|\.checkout\b|\b(?:satellite|capsule)_factory\(|'
+    r'\b_target_(?:satellite|capsule)_host\(|\blru_sat_ready_rhel\('
+)
+# Broker(..., _count=2) checks out 2 hosts
+HOST_COUNT = re.compile(r'\b_count=(\d+)')
+# target_sat and its scoped variants check out a Satellite for destructive tests only
+DESTRUCTIVE_CHECKOUT = re.compile(r'\b_target_sat_imp\(')
+# the factories check out a host every time they are called, by the tests requesting them
+FACTORY_FIXTURES = ('satellite_factory', 'capsule_factory')
+# checks out a Satellite per worker with the on-demand xdist behavior, counted by worker
+WORKER_FIXTURE = 'align_to_satellite'
+MAX_WORKERS = 16
+# recommending the fewest workers within 10% of the wall time on the most workers
+WALL_TIME_TOLERANCE = 0.1
+
+plan_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--plan',
+        action='store_true',
+        help='Report the Broker checkouts, the estimated wall time and the recommended xdist '
+        'worker count of the selected tests, without running them',
+    )
+    parser.addoption(
+        '--plan-max-workers',
+        type=int,
+        default=MAX_WORKERS,
+        metavar='N',
+        help=f'Most xdist workers --plan recommends, {MAX_WORKERS} by default',
+    )
+
+
+@functools.cache
+def fixture_checkouts(func):
+    """Return the hosts the fixture function ``func`` checks out, and if for destructive tests only"""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        return 0, False
+    if DESTRUCTIVE_CHECKOUT.search(source):
+        return 1, True
+    if not CHECKOUT_CALL.search(source):
+        return 0, False
+    return max((int(count) for count in HOST_COUNT.findall(source)), default=1), False
+
+
+def scope_instance(item, scope):
+    """Return what the fixtures of ``scope`` are instantiated for in ``item``"""
+    if scope == 'function':
+        return item.nodeid
+    if scope == 'class':
+        return item.nodeid.rsplit('::', 1)[0]
+    if scope == 'module':
+        return module_of(item.nodeid)
+    if scope == 'package':
+        return os.path.dirname(module_of(item.nodeid))
+    return None
+
+
+def checkouts(item):
+    """Yield the ``(fixture, scope, instance, hosts)`` of the Broker checkouts ``item`` needs"""
+    params = getattr(getattr(item, 'callspec', None), 'params', {})
+    destructive = item.get_closest_marker('destructive') is not None
+    for name, fixturedefs in item._fixtureinfo.name2fixturedefs.items():
+        if not fixturedefs or name == WORKER_FIXTURE:
+            continue
+        if name in FACTORY_FIXTURES:
+            scope = 'function'
+            hosts, destructive_only = int(name in item._fixtureinfo.argnames), False
+        else:
+            scope = fixturedefs[-1].scope
+            hosts, destructive_only = fixture_checkouts(fixturedefs[-1].func)
+        if hosts and (destructive or not destructive_only):
+            instance = (scope_instance(item, scope), repr(params.get(name)))
+            yield name, scope, instance, hosts
+
+
+def plan(items, history, max_workers=MAX_WORKERS, hostnames=0, on_demand=False):
+    """Return the checkouts, wall time and recommended workers of running ``items``
+
+    :param history: :class:`robottelo.utils.durations.DurationHistory` of the tests
+    :param hostnames: Satellites already available to the workers
+    :param on_demand: workers without an available Satellite check one out
+    """
+    # skipped tests check out nothing and take no time
+    selected, skipped = [], []
+    for item in items:
+        (skipped if evaluate_skip_marks(item) else selected).append(item)
+    items = selected
+    tests = {item.nodeid: analyze(item) for item in items}
+    units = group_units(tests, history)
+    workers = recommend_workers(units, max_workers, WALL_TIME_TOLERANCE)
+    instances = {}
+    session_units = defaultdict(set)
+    for item in items:
+        for name, scope, instance, hosts in checkouts(item):
+            instances[(name, instance)] = hosts
+            if scope == 'session':
+                session_units[(name, instance)].add(tests[item.nodeid]['unit'])
+    by_fixture = Counter()
+    for (name, instance), hosts in instances.items():
+        if (name, instance) in session_units:
+            hosts *= min(workers, len(session_units[(name, instance)]))
+        by_fixture[name] += hosts
+    if on_demand and workers > hostnames:
+        by_fixture[WORKER_FIXTURE] = workers - hostnames
+    return {
+        'tests': len(items),
+        'skipped': len(skipped),
+        'factory_instance': sum(
+            item.get_closest_marker('factory_instance') is not None for item in items
+        ),
+        'without_history': sum(history.get(nodeid) is None for nodeid in tests),
+        'checkouts': sum(by_fixture.values()),
+        'checkouts_by_fixture': dict(by_fixture.most_common()),
+        'serial_time': round(sum(duration for _, duration, _ in units)),
+        'workers': workers,
+        'max_workers': max_workers,
+        'wall_time': round(wall_time(units, workers)) if units else 0,
+    }
+
+
+def duration(seconds):
+    return str(datetime.timedelta(seconds=seconds))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    if config.getoption('plan'):
+        # the plan is made after the collection of this process, no xdist worker is started
+        config.option.dist = 'no'
+
+
+def pytest_runtestloop(session):
+    config = session.config
+    if not config.getoption('plan'):
+        return None
+    if session.testsfailed and not config.option.continue_on_collection_errors:
+        # pytest reports the collection errors and stops
+        return None
+    config.stash[plan_key] = plan(
+        session.items,
+        DurationHistory.load(junit_files=config.getoption('durations_junit', [])),
+        config.getoption('plan_max_workers'),
+        len(settings.server.hostnames),
+        settings.server.xdist_behavior == 'on-demand',
+    )
+    return True
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if report := config.stash.get(plan_key, None):
+        fixtures = ', '.join(
+            f'{count} {name}' for name, count in report['checkouts_by_fixture'].items()
+        )
+        terminalreporter.write_sep('-', 'plan')
+        terminalreporter.write_line(
+            f'{report["tests"]} tests and {report["skipped"]} skipped, '
+            f'{report["factory_instance"]} with a fresh Satellite or Capsule (factory_instance), '
+            f'{report["without_history"]} without duration history'
+        )
+        terminalreporter.write_line(
+            f'{report["checkouts"]} Broker checkouts on {report["workers"]} workers'
+            + (f': {fixtures}' if fixtures else '')
+        )
+        terminalreporter.write_line(
+            f'estimated {duration(report["serial_time"])} of tests, '
+            f'{duration(report["wall_time"])} on {report["workers"]} workers, the fewest within '
+            f'{WALL_TIME_TOLERANCE:.0%} of the wall time on {report["max_workers"]}'
+        )
@@ -0,0 +1,242 @@
+"""Schedule the tests across xdist workers by their historical durations.
+
+``--schedule-durations`` replaces the xdist scheduler with :class:`DurationScheduling`. Tests
+are split into work units, a test sharing module scoped fixtures with the other tests of its
+module runs with them, and work units are handed out longest first to the worker running out
+of tests (longest processing time first), so the long tail of the run is spread across the
+workers instead of being left to one of them. Every worker being aligned to a Satellite, see
+``align_to_satellite``, this also balances the Satellites.
+
+``--schedule-affinity`` also makes a worker take the longest work unit needing only session
+scoped fixtures it already built, if there is one, so expensive session scoped fixtures are
+built by fewer workers. The module and session scoped fixtures every test needs are analyzed
+after collection, and the fixture instantiations saved are estimated at the end of the run,
+see :func:`robottelo.utils.scheduling.affinity_report`.
+
+Durations are the ones recorded by the runs with ``--record-durations`` or a scheduling option
+in :data:`robottelo.utils.durations.DURATIONS_FILE`, merged with the durations recorded before,
+and those of the junit XML reports given with ``--durations-junit``.
+"""
+
+from collections import defaultdict
+import json
+import os
+from pathlib import Path
+
+import pytest
+from xdist.scheduler import LoadScopeScheduling
+
+from robottelo.config import robottelo_tmp_dir
+from robottelo.logging import logger
+from robottelo.utils.durations import DurationHistory, module_of
+from robottelo.utils.scheduling import affinity_report, pick_unit, shared_fixtures
+
+work_units_key = pytest.StashKey()
+affinity_report_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--schedule-durations',
+        action='store_true',
+        help='Distribute the tests across xdist workers longest first, by their historical '
+        'durations, keeping the tests sharing module scoped fixtures together',
+    )
+    parser.addoption(
+        '--record-durations',
+        action='store_true',
+        help='Merge the durations of the tests run into the historical test durations, '
+        'implied by --schedule-durations and --schedule-affinity',
+    )
+    parser.addoption(
+        '--durations-junit',
+        action='append',
+        default=[],
+        metavar='PATH',
+        help='junit XML report of a previous run to take test durations from, can be repeated',
+    )
+    parser.addoption(
+        '--schedule-affinity',
+        action='store_true',
+        help='Like --schedule-durations, also giving xdist workers the tests needing the '
+        'session scoped fixtures they already built',
+    )
+
+
+def fixture_scopes(item):
+    """Return the scope of every fixture ``item`` needs"""
+    return {
+        name: fixturedefs[-1].scope
+        for name, fixturedefs in item._fixtureinfo.name2fixturedefs.items()
+        if fixturedefs
+    }
+
+
+def work_unit(item):
+    """Return the work unit of ``item``: its module or class when it uses fixtures of that scope"""
+    scopes = set(fixture_scopes(item).values())
+    if scopes & {'package', 'module'}:
+        return module_of(item.nodeid)
+    if 'class' in scopes:
+        return item.nodeid.rsplit('::', 1)[0]
+    return item.nodeid
+
+
+def analyze(item):
+    """Return the work unit of ``item`` and the module and session scoped fixtures it needs"""
+    scopes = fixture_scopes(item)
+    return {
+        'unit': work_unit(item),
+        'module': sorted(name for name, scope in scopes.items() if scope in ('package', 'module')),
+        'session': sorted(name for name, scope in scopes.items() if scope == 'session'),
+    }
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """xdist scheduler handing out the longest work units first, see the module documentation
+
+    :param history: :class:`robottelo.utils.durations.DurationHistory` of the tests
+    :param work_units_file: JSON file of the :func:`analyze` of every test, written by a worker
+        after collection, tests are grouped by module without fixture affinity when it is missing
+    :param affinity: prefer the work units needing the session scoped fixtures a worker built
+    """
+
+    def __init__(self, config, log=None, history=None, work_units_file=None, affinity=False):
+        super().__init__(config, log)
+        self.history = history or DurationHistory()
+        self.work_units_file = work_units_file
+        self.affinity = affinity
+        self.tests = None
+        self.sorted = False
+        self.unit_fixtures = {}
+        self.built = defaultdict(set)
+
+    def _split_scope(self, nodeid):
+        if self.tests is None:
+            try:
+                self.tests = json.loads(Path(self.work_units_file).read_text())
+            except (TypeError, OSError, ValueError):
+                logger.warning('No work units were collected, grouping tests by module')
+                self.tests = {}
+        test = self.tests.get(nodeid)
+        return test['unit'] if test else module_of(nodeid)
+
+    def unit_duration(self, work_unit):
+        return sum(self.history.estimate(nodeid) for nodeid in work_unit)
+
+    def _sort_workqueue(self):
+        durations = {scope: self.unit_duration(unit) for scope, unit in self.workqueue.items()}
+        for scope in sorted(durations, key=durations.get, reverse=True):
+            self.workqueue.move_to_end(scope)
+        logger.info(
+            f'Scheduling {len(durations)} work units of an estimated '
+            f'{sum(durations.values()):.0f}s longest first'
+        )
+        if not self.affinity:
+            return
+        ignored = shared_fixtures(self.tests)
+        for scope, unit in self.workqueue.items():
+            self.unit_fixtures[scope] = frozenset(
+                fixture
+                for nodeid in unit
+                if nodeid in self.tests
+                for fixture in self.tests[nodeid]['session']
+                if fixture not in ignored
+            )
+        report = affinity_report(self.tests, self.history, len(self.nodes))
+        self.config.stash[affinity_report_key] = report
+        logger.info(f'Fixture affinity: {report}')
+
+    def _assign_work_unit(self, node):
+        if not self.sorted:
+            # the work queue is complete before the first unit is assigned
+            self._sort_workqueue()
+            self.sorted = True
+        if self.affinity:
+            scopes = list(self.workqueue)
+            units = [(scope, None, self.unit_fixtures.get(scope, frozenset())) for scope in scopes]
+            scope = scopes[pick_unit(units, self.built[node])]
+            self.workqueue.move_to_end(scope, last=False)
+            self.built[node] |= self.unit_fixtures.get(scope, frozenset())
+        super()._assign_work_unit(node)
+
+
+class DurationRecorder:
+    """Records the durations of the tests run, merged into the duration file at the end"""
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.skipped = set()
+
+    def pytest_runtest_logreport(self, report):
+        # unit tests are not scheduled
+        if report.nodeid.startswith('tests/robottelo/'):
+            return
+        self.durations[report.nodeid] += report.duration
+        if report.skipped:
+            self.skipped.add(report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        durations = {
+            nodeid: round(duration, 3)
+            for nodeid, duration in self.durations.items()
+            if nodeid not in self.skipped
+        }
+        if durations:
+            DurationHistory.merge(durations)
+
+
+def pytest_configure(config):
+    # durations are recorded by the xdist controller, or the only process without xdist
+    if hasattr(config, 'workerinput') or config.option.collectonly:
+        return
+    scheduling = config.getoption('schedule_durations') or config.getoption('schedule_affinity')
+    if scheduling or config.getoption('record_durations'):
+        config.pluginmanager.register(DurationRecorder(), 'duration_recorder')
+    if scheduling:
+        config.stash[work_units_key] = robottelo_tmp_dir / f'work_units_{os.getpid()}.json'
+
+
+def pytest_unconfigure(config):
+    if work_units_file := config.stash.get(work_units_key, None):
+        work_units_file.unlink(missing_ok=True)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    if work_units_file := node.config.stash.get(work_units_key, None):
+        node.workerinput['work_units_file'] = str(work_units_file)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_finish(session):
+    # written before the worker tells the controller its collection is finished
+    workerinput = getattr(session.config, 'workerinput', {})
+    if workerinput.get('workerid') == 'gw0' and 'work_units_file' in workerinput:
+        Path(workerinput['work_units_file']).write_text(
+            json.dumps({item.nodeid: analyze(item) for item in session.items})
+        )
+
+
+@pytest.hookimpl(tryfirst=True, optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption('schedule_durations') or config.getoption('schedule_affinity'):
+        return DurationScheduling(
+            config,
+            log,
+            DurationHistory.load(junit_files=config.getoption('durations_junit')),
+            config.stash.get(work_units_key, None),
+            affinity=config.getoption('schedule_affinity'),
+        )
+    return None
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if report := config.stash.get(affinity_report_key, None):
+        terminalreporter.write_sep('-', 'fixture affinity')
+        terminalreporter.write_line(
+            f'{report["fixtures"]} module and session scoped fixtures needed by '
+            f'{report["tests"]} tests on {report["workers"]} workers: an estimated '
+            f'{report["grouped_instantiations"]} instantiations instead of '
+            f'{report["scattered_instantiations"]}, {report["saved_instantiations"]} saved'
+        )
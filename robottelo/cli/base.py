@@ -1,15 +1,28 @@
 """Generic base class for cli hammer commands."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import itertools
 import re
 
 from wait_for import wait_for
 
 from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import hammer, hammer_shell, schema
+from robottelo.cli.batch import HammerBatch
 from robottelo.config import settings
 from robottelo.exceptions import CLIDataBaseError, CLIError, CLIReturnCodeError
 from robottelo.logging import logger
-from robottelo.utils.ssh import get_client
+from robottelo.utils import read_cache
+
+# ``command_base`` of the entities whose hammer json create output was checked to hold every
+# field of their ``info`` output, the only ones created without the ``info`` round trip when
+# ``settings.performance.json_create`` is enabled. Most create commands only answer the message,
+# id and name of the object, and organizations are polled with ``info`` until they are usable.
+JSON_CREATE_ENTITIES = frozenset()
+# what the json output of most hammer create commands holds, the created object still needs info
+JSON_CREATE_STUB_FIELDS = frozenset({'message', 'id', 'name'})
 
 
 class Base:
@@ -24,6 +37,8 @@ class Base:
     command_end = None  # extending commands like for directory to pass
     command_requires_org = False  # True when command requires organization-id
     hostname = None  # Now used for Satellite class hammer execution
+    create_required_fields = ('id', 'name')  # json create output without these needs info
+    list_page_size = 1000  # default number of rows per hammer call of iter_list
     logger = logger
     _db_error_regex = re.compile(r'.*INSERT INTO|.*SELECT .*FROM|.*violates foreign key')
 
@@ -93,7 +108,26 @@ class Base:
         if options is None:
             options = {}
 
-        result = cls.execute(cls._construct_command(options), output_format='csv', timeout=timeout)
+        if cls._use_json_create():
+            result = cls.execute(
+                cls._construct_command(options), output_format='json', timeout=timeout
+            )
+            if isinstance(result, list):
+                result = result[0] if result else None
+            if (
+                result
+                and set(result) - JSON_CREATE_STUB_FIELDS
+                and all(result.get(field) for field in cls.create_required_fields)
+                # nested values, booleans and nulls are not shaped like parse_info shapes them
+                and all(isinstance(value, str) for value in result.values())
+            ):
+                return result
+            # the create output is the stub, lacks required fields or is nested, use info
+            result = [result] if result else []
+        else:
+            result = cls.execute(
+                cls._construct_command(options), output_format='csv', timeout=timeout
+            )
 
         # Extract new object ID if it was successfully created
         if len(result) > 0 and 'id' in result[0]:
@@ -126,6 +160,14 @@ class Base:
 
         return result
 
+    @classmethod
+    def _use_json_create(cls):
+        """Whether ``create`` should build its result from the json create output"""
+        return (
+            settings.performance.get('json_create') is True
+            and cls.command_base in JSON_CREATE_ENTITIES
+        )
+
     @classmethod
     def delete(cls, options=None, timeout=None):
         """Deletes existing record."""
@@ -172,6 +214,39 @@ class Base:
 
         return (username, password)
 
+    @classmethod
+    def _resolve_credentials(cls, username=None, password=None):
+        """Return the credentials hammer should be called with, ``(None, None)`` when
+        credentials are omitted.
+        """
+        if cls.omitting_credentials:
+            return (None, None)
+        return cls._get_username_password(username, password)
+
+    @classmethod
+    def _hammer_args(cls, command, user=None, password=None, output_format=None):
+        """Build the hammer arguments (everything after ``hammer``) to run ``command``"""
+        return '-v {} {} {} {}'.format(
+            f'-u {user}' if user else "--interactive no",
+            f'-p {password}' if password else "",
+            f'--output={output_format}' if output_format else "",
+            command,
+        )
+
+    @classmethod
+    @contextmanager
+    def batch(cls, stop_on_error=True, timeout=None):
+        """Context manager collecting hammer commands to run them in one ssh round trip
+
+        Commands are queued with :meth:`robottelo.cli.batch.HammerBatch.add` and run when
+        the block exits, their parsed results are then available in ``batch.results``.
+        See :mod:`robottelo.cli.batch`.
+        """
+        batch = HammerBatch(hostname=cls.hostname, stop_on_error=stop_on_error, timeout=timeout)
+        yield batch
+        if batch.results is None:
+            batch.run()
+
     @classmethod
     def execute(
         cls,
@@ -184,38 +259,83 @@ class Base:
         ignore_stderr=None,
         return_raw_response=None,
     ):
-        """Executes the cli ``command`` on the server via ssh"""
-        if cls.omitting_credentials:
-            user, password = None, None
-        else:
-            user, password = cls._get_username_password(user, password)
-        time_hammer = settings.performance.time_hammer
+        """Executes the cli ``command`` on the server via ssh
 
-        # add time to measure hammer performance
-        cmd = 'LANG={} {} hammer -v {} {} {} {}'.format(
-            settings.robottelo.locale,
-            'time -p' if time_hammer else '',
-            f'-u {user}' if user else "--interactive no",
-            f'-p {password}' if password else "",
-            f'--output={output_format}' if output_format else "",
-            command,
-        )
-        response = ssh.command(
-            cmd,
-            hostname=hostname or cls.hostname or settings.server.hostname,
-            output_format=output_format,
-            timeout=timeout,
-        )
+        ``info`` and ``list`` results are served from :mod:`robottelo.utils.read_cache` when
+        it is enabled, any other command drops the cached results of its resource.
+        """
+        user, password = cls._resolve_credentials(user, password)
+        hostname = hostname or cls.hostname or settings.server.hostname
+        resource, command_sub = read_cache.hammer_command(command)
+        cache = None if return_raw_response else read_cache.get_cache()
+        if cache is not None and read_cache.is_cached_command(resource, command_sub):
+            key = ('cli', hostname, resource, user, command, output_format)
+            return cache.get_or_set(
+                key,
+                lambda: cls._handle_response(
+                    cls._run_command(command, hostname, user, password, output_format, timeout),
+                    ignore_stderr=ignore_stderr,
+                ),
+            )
+        try:
+            response = cls._run_command(command, hostname, user, password, output_format, timeout)
+        finally:
+            if command_sub not in read_cache.CACHED_SUBCOMMANDS:
+                read_cache.invalidate('cli', hostname, resource)
         if return_raw_response:
             return response
         return cls._handle_response(response, ignore_stderr=ignore_stderr)
 
+    @classmethod
+    def _run_command(cls, command, hostname, user, password, output_format, timeout):
+        """Run hammer ``command`` and return its response, parsed as ``output_format``"""
+        time_hammer = settings.performance.time_hammer
+        hammer_args = cls._hammer_args(command, user, password, output_format)
+        response = None
+        # the long-lived hammer process can't be timed, so time_hammer forces one-shot runs
+        if settings.performance.get('hammer_shell') is True and not time_hammer:
+            response = hammer_shell.execute(
+                hammer_args,
+                hostname,
+                user=user,
+                password=password,
+                env={'LANG': settings.robottelo.locale},
+                timeout=timeout,
+            )
+            if response is not None:
+                response = ssh.parse_output(response, output_format)
+        if response is None:
+            # add time to measure hammer performance
+            cmd = 'LANG={} {} hammer {}'.format(
+                settings.robottelo.locale,
+                'time -p' if time_hammer else '',
+                hammer_args,
+            )
+            response = ssh.command(
+                cmd,
+                hostname=hostname,
+                output_format=output_format,
+                timeout=timeout,
+            )
+        return response
+
+    @classmethod
+    async def aexecute(cls, command, **kwargs):
+        """Asynchronous counterpart of ``execute``, hammer runs in a worker thread
+
+        Takes the same keyword arguments as :meth:`execute`.
+        """
+        return await asyncio.to_thread(cls.execute, command, **kwargs)
+
     @classmethod
     def sm_execute(cls, command, hostname=None, timeout=None, **kwargs):
         """Executes the satellite-maintain cli commands on the server via ssh"""
         env_var = kwargs.get('env_var') or ''
-        client = get_client(hostname=hostname or cls.hostname)
-        return client.execute(f'{env_var} satellite-maintain {command}', timeout=timeout)
+        return ssh.command(
+            f'{env_var} satellite-maintain {command}',
+            hostname=hostname or cls.hostname,
+            timeout=timeout,
+        )
 
     @classmethod
     def exists(cls, options=None, search=None):
@@ -284,6 +404,57 @@ class Base:
 
         return cls.execute(cls._construct_command(options), output_format=output_format)
 
+    @classmethod
+    def iter_list(cls, options=None, per_page=None, until=None, prefetch=False):
+        """Yield the rows of the ``list`` command, fetching them one page at a time
+
+        Unlike :meth:`list`, only a page of rows is held in memory and no request has to
+        return everything at once. Example, stopping at the first matching row::
+
+            for host in Host.iter_list(until=lambda host: host['name'] == name):
+                ...
+
+        :param dict options: options of the ``list`` command, ``page`` and ``per-page`` are
+            set by this method.
+        :param int per_page: rows fetched per hammer call, ``list_page_size`` by default.
+        :param until: callable called with every row, the iteration stops once the row it
+            returned a true value for has been yielded.
+        :param bool prefetch: fetch the next page in a background thread while the rows of
+            the current page are being consumed.
+        """
+        if cls.command_requires_org and 'organization-id' not in (options or {}):
+            raise CLIError(f'organization-id option is required for {cls.__name__}.iter_list')
+        options = {
+            key: value for key, value in (options or {}).items() if key not in ('page', 'per-page')
+        }
+        per_page = per_page or cls.list_page_size
+
+        def command(page):
+            # built in the calling thread, a prefetching thread only executes it
+            cls.command_sub = 'list'
+            return cls._construct_command({**options, 'page': page, 'per-page': per_page})
+
+        def fetch(command):
+            return cls.execute(command, output_format='csv') or []
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        next_page = executor.submit(fetch, command(1)) if prefetch else None
+        try:
+            for page in itertools.count(1):
+                rows = next_page.result() if prefetch else fetch(command(page))
+                last_page = len(rows) < per_page
+                if prefetch and not last_page:
+                    next_page = executor.submit(fetch, command(page + 1))
+                for row in rows:
+                    yield row
+                    if until is not None and until(row):
+                        return
+                if last_page:
+                    return
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
     @classmethod
     def puppetclasses(cls, options=None):
         """
@@ -355,19 +526,26 @@ class Base:
 
     @classmethod
     def _construct_command(cls, options=None):
-        """Build a hammer cli command based on the options passed"""
-        tail = ''
+        """Build a hammer cli command based on the options passed
 
+        The options are validated against the hammer schema first, when enabled, see
+        :mod:`robottelo.cli.schema`.
+        """
         if options is None:
             options = {}
 
+        hammer_schema = schema.get_schema()
+        if hammer_schema is not None:
+            hammer_schema.validate(cls.command_base, cls.command_sub, options)
+
+        tail = []
         for key, val in options.items():
-            if val is None:
+            if val is None or val is False:
                 continue
             if val is True:
-                tail += f' --{key}'
-            elif val is not False:
+                tail.append(f'--{key}')
+            else:
                 if isinstance(val, list):
                     val = ','.join(str(el) for el in val)
-                tail += f' --{key}="{val}"'
-        return f"{cls.command_base or ''} {cls.command_sub or ''} {tail.strip()} {cls.command_end or ''}"
+                tail.append(f'--{key}="{val}"')
+        return f"{cls.command_base or ''} {cls.command_sub or ''} {' '.join(tail)} {cls.command_end or ''}"
@@ -0,0 +1,170 @@
+"""Run several hammer commands in a single ssh round trip.
+
+Fixtures often issue long sequences of tiny hammer commands, each one paying an ssh
+command and a hammer start up. :class:`HammerBatch` collects such commands and ships them as
+one remote script, which prints every command output between delimiters together with its
+exit status, so results can be split and parsed per command afterwards.
+
+Example::
+
+    with target_sat.cli.batch() as batch:
+        batch.add(target_sat.cli.Org, 'info', {'id': org_id}, output_format='info')
+        batch.add(target_sat.cli.Repository, 'list', {'product-id': product_id}, 'csv')
+    org, repos = batch.results
+"""
+
+from dataclasses import dataclass
+import re
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.exceptions import CLIBaseError, CLIReturnCodeError
+from robottelo.utils import read_cache
+
+BATCH_MARKER = '@@ROBOTTELO-BATCH'
+BATCH_FUNCTION = f"""_robottelo_batch_run() {{
+    local index=$1 err rc
+    shift
+    err=$(mktemp)
+    printf '\\n{BATCH_MARKER}-OUT %s@@\\n' "$index"
+    "$@" 2>"$err"
+    rc=$?
+    printf '\\n{BATCH_MARKER}-ERR %s@@\\n' "$index"
+    cat "$err"
+    rm -f "$err"
+    printf '\\n{BATCH_MARKER}-RC %s %s@@\\n' "$index" "$rc"
+    return $rc
+}}"""
+BATCH_OUTPUT_REGEX = re.compile(
+    rf'\n{BATCH_MARKER}-OUT (?P<index>\d+)@@\n(?P<stdout>.*?)'
+    rf'\n{BATCH_MARKER}-ERR (?P=index)@@\n(?P<stderr>.*?)'
+    rf'\n{BATCH_MARKER}-RC (?P=index) (?P<status>\d+)@@\n',
+    re.DOTALL,
+)
+BATCH_OUTPUT_FORMATS = (None, 'csv', 'json', 'info')
+
+
+@dataclass
+class BatchCommand:
+    """A hammer command queued in a :class:`HammerBatch`"""
+
+    cli_cls: type
+    command_sub: str
+    hammer_args: str
+    output_format: str = None
+    ignore_stderr: bool = None
+
+
+class HammerBatch:
+    """Collect hammer commands and run them in one remote script
+
+    :param str hostname: Satellite to run the commands on, defaults to the server hostname.
+    :param bool stop_on_error: stop at the first failing command and raise its error,
+        otherwise run everything and put the error in place of the failed command result.
+    :param int timeout: Time to wait for the whole batch to finish.
+    """
+
+    def __init__(self, hostname=None, stop_on_error=True, timeout=None):
+        self.hostname = hostname
+        self.stop_on_error = stop_on_error
+        self.timeout = timeout
+        self.commands = []
+        self.results = None
+
+    def __len__(self):
+        return len(self.commands)
+
+    def add(self, cli_cls, command_sub, options=None, output_format=None, ignore_stderr=None):
+        """Queue ``hammer <cli_cls.command_base> <command_sub> <options>``
+
+        :param cli_cls: a :class:`robottelo.cli.base.Base` subclass, its credentials and
+            hostname are used the same way :meth:`Base.execute` would.
+        :param str command_sub: the hammer subcommand, like ``info`` or ``create``.
+        :param dict options: options passed to :meth:`Base._construct_command`.
+        :param str output_format: csv, json, info (hammer default output parsed with
+            :func:`robottelo.cli.hammer.parse_info`) or None for the raw ``stdout``.
+        :return: index of the command result in :attr:`results`.
+        """
+        if output_format not in BATCH_OUTPUT_FORMATS:
+            raise ValueError(f'Unsupported batch output format: {output_format}')
+        cli_cls.command_sub = command_sub
+        command = cli_cls._construct_command(options)
+        user, password = cli_cls._resolve_credentials()
+        hammer_args = cli_cls._hammer_args(
+            command,
+            user=user,
+            password=password,
+            output_format=None if output_format == 'info' else output_format,
+        )
+        self.hostname = self.hostname or cli_cls.hostname
+        self.commands.append(
+            BatchCommand(cli_cls, command_sub, hammer_args, output_format, ignore_stderr)
+        )
+        return len(self.commands) - 1
+
+    def script(self):
+        """Return the remote script running every queued command"""
+        from robottelo.config import settings
+
+        lines = [BATCH_FUNCTION]
+        on_error = ' || exit 0' if self.stop_on_error else ''
+        for index, command in enumerate(self.commands):
+            lines.append(
+                f'_robottelo_batch_run {index} env LANG={settings.robottelo.locale} '
+                f'hammer {command.hammer_args}{on_error}'
+            )
+        return '\n'.join(lines)
+
+    def run(self):
+        """Run the queued commands and return their parsed results in order
+
+        :raises robottelo.exceptions.CLIReturnCodeError: in ``stop_on_error`` mode, for the
+            first failing command, or when a command produced no output at all.
+        """
+        from robottelo.config import settings
+
+        self.results = []
+        if not self.commands:
+            return self.results
+        hostname = self.hostname or settings.server.hostname
+        try:
+            response = ssh.command(self.script(), hostname=hostname, timeout=self.timeout)
+        finally:
+            for command in self.commands:
+                if command.command_sub not in read_cache.CACHED_SUBCOMMANDS:
+                    resource = command.cli_cls.command_base.split()[0]
+                    read_cache.invalidate('cli', hostname, resource)
+        outputs = {
+            int(match.group('index')): match
+            for match in BATCH_OUTPUT_REGEX.finditer(response.stdout)
+        }
+        for index, command in enumerate(self.commands):
+            if index not in outputs:
+                raise CLIReturnCodeError(
+                    response.status,
+                    response.stderr,
+                    f'Batched command "hammer {command.hammer_args}" produced no output',
+                )
+            match = outputs[index]
+            result = hammer.HammerResult(
+                status=int(match.group('status')),
+                stdout=match.group('stdout'),
+                stderr=match.group('stderr'),
+            )
+            if command.output_format != 'info':
+                ssh.parse_output(result, command.output_format)
+            # _handle_response reports the failing subcommand from the class state
+            command.cli_cls.command_sub = command.command_sub
+            try:
+                stdout = command.cli_cls._handle_response(
+                    result, ignore_stderr=command.ignore_stderr
+                )
+            except CLIBaseError as err:
+                if self.stop_on_error:
+                    raise
+                self.results.append(err)
+                continue
+            if command.output_format == 'info':
+                stdout = hammer.parse_info(stdout)
+            self.results.append(stdout)
+        return self.results
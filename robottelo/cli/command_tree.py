@@ -0,0 +1,133 @@
+"""Generate the hammer command tree by inspecting the help of every hammer command.
+
+The tree is walked breadth-first: the help pages of a whole level are fetched in parallel by a
+bounded pool of workers, over the pooled ssh connections of :mod:`robottelo.ssh`. Help pages
+are cached per Satellite version and command path in a :class:`HelpCache`, and a later
+incremental run only fetches the ``hammer`` help page, the commands whose parent help page
+changed, and the ones that were never fetched. A full run is needed to see changes below
+unchanged parents, like a new option of an existing command.
+
+The tree has the format of :func:`robottelo.cli.hammer.parse_help`, every subcommand being
+updated with its own contents. :func:`dumps_tree` serializes it with sorted keys, options and
+subcommands, so regenerated trees diff cleanly.
+
+Used by ``scripts/hammer_command_tree.py``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pathlib import Path
+import threading
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.logging import logger
+
+HELP_CACHE_FORMAT = 1
+
+
+class HelpCache:
+    """Hammer help pages stored per Satellite version and command path in a json file
+
+    :param path: json file the pages are loaded from and saved to
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._pages = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            if data.get('format') == HELP_CACHE_FORMAT:
+                self._pages = data['pages']
+
+    def get(self, version, command):
+        return self._pages.get(version, {}).get(command)
+
+    def set(self, version, command, page):
+        with self._lock:
+            self._pages.setdefault(version, {})[command] = page
+
+    def save(self):
+        with self._lock:
+            data = {'format': HELP_CACHE_FORMAT, 'pages': self._pages}
+            self.path.write_text(json.dumps(data, indent=1, sort_keys=True))
+
+
+def fetch_help(command, hostname=None):
+    """Return the help page of the hammer ``command``, like ``hammer host list``"""
+    return ssh.command(f'{command} --help', hostname=hostname).stdout
+
+
+def generate_command_tree(
+    hostname=None, version=None, cache=None, incremental=True, workers=4, fetch=fetch_help
+):
+    """Walk the hammer commands and subcommands and return their parsed help pages as a tree
+
+    :param str hostname: Satellite to fetch the help pages from
+    :param str version: Satellite version the help pages are cached for
+    :param HelpCache cache: cache the fetched help pages are stored in
+    :param bool incremental: reuse the cached help page of a command when the help page of its
+        parent did not change, otherwise every help page is fetched
+    :param int workers: maximum number of help pages fetched at once
+    :param fetch: callable returning the help page of a command, given the command and
+        ``hostname``
+    """
+    pages = {}
+    level = [('hammer', True)]  # (command, whether its parent changed)
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hammer-help') as pool:
+        while level:
+            cached = {
+                command: cache.get(version, command) if cache is not None else None
+                for command, _ in level
+            }
+            to_fetch = [
+                command
+                for command, parent_changed in level
+                if cached[command] is None or parent_changed or not incremental
+            ]
+            fresh = dict(
+                zip(
+                    to_fetch,
+                    pool.map(lambda command: fetch(command, hostname), to_fetch),
+                    strict=True,
+                )
+            )
+            fetched += len(to_fetch)
+            next_level = []
+            for command, _ in level:
+                page = fresh.get(command, cached[command])
+                changed = command in fresh and fresh[command] != cached[command]
+                if changed and cache is not None:
+                    cache.set(version, command, page)
+                pages[command] = hammer.parse_help(page)
+                next_level.extend(
+                    (f'{command} {subcommand["name"]}', changed)
+                    for subcommand in pages[command]['subcommands']
+                )
+            level = next_level
+    logger.info(f'Fetched {fetched} of {len(pages)} hammer help pages')
+    return _assemble(pages, 'hammer')
+
+
+def _assemble(pages, command):
+    contents = pages[command]
+    for subcommand in contents['subcommands']:
+        subcommand.update(_assemble(pages, f'{command} {subcommand["name"]}'))
+    return contents
+
+
+def _sorted_tree(node):
+    node = dict(node)
+    for key in ('options', 'subcommands'):
+        if key in node:
+            node[key] = sorted(
+                (_sorted_tree(item) for item in node[key]), key=lambda item: item['name']
+            )
+    return node
+
+
+def dumps_tree(tree):
+    """Serialize a command tree with sorted keys, options and subcommands"""
+    return json.dumps(_sorted_tree(tree), indent=2, sort_keys=True) + '\n'
@@ -0,0 +1,210 @@
+"""Single pass parsers for the csv, json and info outputs of hammer.
+
+These are the parsers behind :func:`robottelo.cli.hammer.parse_csv`,
+:func:`robottelo.cli.hammer.parse_json` and :func:`robottelo.cli.hammer.parse_info`. They
+return exactly what the line by line parsers they replaced returned, but are meant for big
+outputs (``Base.list`` asks hammer for 10000 rows per page):
+
+* regular expressions are compiled once, at import time;
+* header and key normalization results are cached;
+* csv output can be consumed row by row with :func:`iter_csv`;
+* info output is tokenized in one pass, computing the indentation of each line once.
+
+``scripts/benchmark_hammer_parser.py`` compares them with the former implementation.
+"""
+
+import csv
+from functools import lru_cache
+import json
+import re
+
+from robottelo.logging import logger
+
+JSON_OBJECTS_SEPARATOR = '\n}\n{'
+NUMBERED_KEY = re.compile(r'(\d+)\)')
+NUMBERED_KEY_PREFIX = re.compile(r'\d+\)')
+NUMBERED_VALUE = re.compile(r'\d+\)\s+(.+)$')
+TAB_SPACES = 4
+INDENTATION_SPACES = 4
+
+
+@lru_cache(maxsize=4096)
+def normalize_header(header):
+    """Replace empty spaces with '-' and lower all chars"""
+    return header.replace(' ', '-').lower()
+
+
+@lru_cache(maxsize=4096)
+def _normalize_key(key):
+    return key.lstrip().replace(' ', '-').lower()
+
+
+def _csv_rows(output):
+    """Return the normalized headers and a reader of the remaining rows of a csv output"""
+    rows = csv.reader(output.splitlines())
+    return [normalize_header(header) for header in next(rows, ())], rows
+
+
+def _csv_row(keys, row):
+    """Build a row dict the way ``csv.DictReader`` does when its length doesn't match"""
+    values = dict(zip(keys, row, strict=False))
+    if len(keys) < len(row):
+        values[None] = row[len(keys) :]
+    for key in keys[len(row) :]:
+        values[key] = None
+    return values
+
+
+def iter_csv(output):
+    """Yield the rows of a hammer csv output as dicts keyed by the normalized headers
+
+    Rows are built like ``csv.DictReader`` does: empty lines are skipped, missing values are
+    ``None`` and extra values are listed under the ``None`` key.
+    """
+    try:
+        keys, rows = _csv_rows(output)
+        width = len(keys)
+        for row in rows:
+            if len(row) == width:
+                yield dict(zip(keys, row, strict=True))
+            elif row:
+                yield _csv_row(keys, row)
+    except csv.Error as err:
+        logger.error(f'Exception while parsing CSV output {output.splitlines()}: {err}')
+        raise
+
+
+def parse_csv(output):
+    """Parse CSV output from Hammer CLI and return a list of dicts, see :func:`iter_csv`"""
+    try:
+        keys, rows = _csv_rows(output)
+        width = len(keys)
+        return [
+            dict(zip(keys, row, strict=True)) if len(row) == width else _csv_row(keys, row)
+            for row in rows
+            if row
+        ]
+    except csv.Error as err:
+        logger.error(f'Exception while parsing CSV output {output.splitlines()}: {err}')
+        raise
+
+
+def _json_int(literal):
+    # integers are returned as strings to conform to the csv parser
+    return str(int(literal))
+
+
+def _json_object(pairs):
+    return {normalize_header(key): value for key, value in pairs}
+
+
+def parse_json(stdout):
+    """Parse JSON output from Hammer CLI and convert it to python dictionary
+    while normalizing keys.
+
+    Only the last object is parsed when hammer printed several of them.
+    """
+    new_object_index = stdout.find(JSON_OBJECTS_SEPARATOR)
+    if new_object_index > -1:
+        stdout = stdout[new_object_index + 3 :]
+    return json.loads(stdout, object_pairs_hook=_json_object, parse_int=_json_int)
+
+
+def tokenize_info(output):
+    """Yield ``(indentation level, line)`` for the meaningful lines of a hammer info output
+
+    Empty lines and ``---`` dividers are skipped. The level is computed like
+    :func:`robottelo.cli.hammer.get_line_indentation_level` does.
+    """
+    for line in output.splitlines():
+        if line == '' or line == '---':
+            continue
+        if len(line) < TAB_SPACES:
+            yield 0, line
+            continue
+        indent = len(line) - len(line.lstrip(' \t'))
+        if not indent:
+            yield 0, line
+            continue
+        spaces = indent + line.count('\t', 0, indent) * (TAB_SPACES - 1)
+        yield -(-spaces // INDENTATION_SPACES), line
+
+
+def parse_info(output):
+    """Parse the info output and returns a dict mapping the values."""
+    # info dictionary
+    contents = {}
+    sub_prop = None  # stores name of the last group of sub-properties
+    sub_num = None  # is not None when list of properties
+    second_level_key = None  # is set when a possible second level is detected
+
+    for current_indent_level, line in tokenize_info(output):
+        if current_indent_level <= 1:
+            # we are entering or leaving a second level from lower/upper levels
+            second_level_key = None
+        if line[0] != ' ':
+            sub_num = None  # new property implies no sub property
+            key, value = line.lstrip().split(':', 1)
+            key = _normalize_key(key)
+            value = value.lstrip()
+            if value == '':  # 'key:' no value, new sub-property
+                sub_prop = key
+                contents[sub_prop] = {}
+            else:  # 'key: value' line
+                contents[key] = value
+            continue
+
+        # sub-properties are indented, values are separated by ':' or '=>', but not by '::'
+        # which can be entity name like 'test::params::keys'
+        stripped = line.lstrip()
+        if ':' in line and '::' not in line:
+            key, value = stripped.split(':', 1)
+        elif '=>' in line and ' =>' in stripped:
+            key, value = stripped.split(' =>', 1)
+        else:
+            # single attribute collection properties, numbered (" 1) template1") or not
+            match = NUMBERED_VALUE.match(stripped)
+            value = match.group(1) if match else stripped
+            sub_value = contents[sub_prop]
+            if isinstance(sub_value, dict) and not sub_value:
+                contents[sub_prop] = [value]
+            elif isinstance(sub_value, list):
+                sub_value.append(value)
+            else:
+                # list on the second level, like registered-by-activation-keys
+                last_key = next(reversed(sub_value))
+                if not sub_value[last_key]:
+                    sub_value[last_key] = [value]
+                else:
+                    sub_value[last_key].append(value)
+            continue
+
+        # some properties have many numbered values, like " 1) Repo Name: repo1"
+        starts_with_number = NUMBERED_KEY.match(key)
+        if starts_with_number:
+            # numbered lists on the second level are not supported
+            if current_indent_level >= 2:
+                continue
+            sub_num = int(starts_with_number.group(1))
+            # no. 1) we need to change dict() to list()
+            if sub_num == 1:
+                contents[sub_prop] = []
+            key = NUMBERED_KEY_PREFIX.sub('', key)
+            contents[sub_prop].append({})
+
+        key = _normalize_key(key)
+        value = value.lstrip()
+        if sub_num is not None:
+            contents[sub_prop][-1][key] = value
+            continue
+        # a third level is always a dictionary under the last second level key without value
+        if current_indent_level == 2 and second_level_key:
+            if not contents[sub_prop][second_level_key]:
+                contents[sub_prop][second_level_key] = {}
+            contents[sub_prop][second_level_key][key] = value
+        else:
+            contents[sub_prop][key] = value
+        if current_indent_level == 1 and not value:
+            second_level_key = key
+
+    return contents
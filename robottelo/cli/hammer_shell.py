@@ -0,0 +1,250 @@
+"""Long-lived hammer execution backend.
+
+Every ``hammer`` invocation pays the full Ruby and apipie start up on the Satellite. When
+``settings.performance.hammer_shell`` is enabled, :meth:`robottelo.cli.base.Base.execute`
+hands its commands to a hammer process kept running per Satellite and credential pair
+instead. The remote driver loads hammer once (exactly like ``/usr/bin/hammer`` does), then
+reads one JSON encoded argument list per line and answers with one framed JSON line holding
+the exit status, ``stdout`` and ``stderr`` of that command. Every command runs with its own
+copy of the hammer context and environment, options like ``--output`` do not carry over.
+
+Commands that rely on the remote shell (variables, pipes, redirections, ...) and commands
+issued while the driver cannot be started are executed the usual one-shot way.
+"""
+
+import atexit
+import json
+import shlex
+import threading
+
+from robottelo import ssh
+from robottelo.cli.hammer import HammerResult
+from robottelo.exceptions import CLIError, HammerShellError
+from robottelo.logging import logger
+
+# in the home of the ssh user, expanded by the remote shell
+DRIVER_PATH = '~/.robottelo_hammer_shell.rb'
+FRAME_MARKER = '\x1eROBOTTELO-HAMMER '
+READY_STATUS = 'ready'
+SHELL_OPERATORS = frozenset('|&;<>()')
+
+DRIVER = r"""
+require 'json'
+require 'stringio'
+
+FRAME_MARKER = "\x1eROBOTTELO-HAMMER "
+real_stdout, real_stderr = $stdout, $stderr
+real_stdout.sync = true
+
+def frame(io, payload)
+  io.write(FRAME_MARKER + JSON.generate(payload) + "\n")
+end
+
+# Bootstrap hammer (settings, modules, apipie cache) the same way the executable does,
+# by running it once with a cheap command and keeping everything it loaded.
+ARGV.replace(['--version'])
+begin
+  $stdout = StringIO.new
+  load Gem.bin_path('hammer_cli', 'hammer')
+rescue SystemExit
+ensure
+  $stdout = real_stdout
+end
+# The main options (--output, --csv, --show-ids, -u, -p, ...) are stored in the context,
+# every command gets a copy of the bootstrap one, only the connection and defaults are shared.
+SHARED_CONTEXT_KEYS = [:api_connection, :defaults]
+bootstrap_context = HammerCLI.context.dup
+frame(real_stdout, {'status' => 'ready'})
+
+while (line = $stdin.gets)
+  request = JSON.parse(line)
+  env = request['env'] || {}
+  previous_env = env.keys.to_h { |key| [key, ENV[key]] }
+  env.each { |key, value| ENV[key] = value }
+  context = bootstrap_context.to_h do |key, value|
+    [key, SHARED_CONTEXT_KEYS.include?(key) ? value : value.dup]
+  end
+  out, err = StringIO.new, StringIO.new
+  $stdout, $stderr = out, err
+  status = begin
+    HammerCLI::MainCommand.run('hammer', request['args'], context) || 0
+  rescue SystemExit => e
+    e.status
+  rescue Exception => e
+    err.puts("#{e.class}: #{e.message}")
+    70
+  ensure
+    $stdout, $stderr = real_stdout, real_stderr
+    # assigning nil unsets the variables the command set
+    previous_env.each { |key, value| ENV[key] = value }
+  end
+  frame(real_stdout, {
+    'status' => status,
+    'stdout' => out.string.force_encoding('UTF-8').scrub,
+    'stderr' => err.string.force_encoding('UTF-8').scrub,
+  })
+end
+"""
+
+
+def split_command(command):
+    """Split a hammer command line into arguments the way the remote shell would
+
+    :return: list of arguments or ``None`` when the command needs a real shell to run
+    """
+    if '$' in command or '`' in command:
+        return None
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        return None
+    if any(token and set(token) <= SHELL_OPERATORS for token in tokens):
+        return None
+    return tokens
+
+
+class HammerShell:
+    """A hammer driver process running over a dedicated ssh channel
+
+    :param str hostname: Satellite to run the hammer process on.
+    :param int timeout: Default time to wait for a command reply, in milliseconds.
+    """
+
+    def __init__(self, hostname, timeout):
+        self.hostname = hostname
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._client = None
+        self._channel = None
+        self._buffer = ''
+
+    @property
+    def alive(self):
+        return self._channel is not None
+
+    def start(self):
+        """Upload the driver and start the hammer process"""
+        self._client = ssh.get_client(hostname=self.hostname)
+        upload = self._client.execute(
+            f"cat > {DRIVER_PATH} << 'ROBOTTELO_EOF'\n{DRIVER}\nROBOTTELO_EOF"
+        )
+        if upload.status != 0:
+            raise CLIError(f'Unable to upload hammer shell driver: {upload.stderr}')
+        raw_session = self._client.session.session
+        raw_session.set_timeout(self.timeout)
+        self._channel = raw_session.open_session()
+        self._channel.execute(f'ruby {DRIVER_PATH} 2>&1')
+        ready = self._read_frame()
+        if ready.get('status') != READY_STATUS:
+            raise CLIError(f'Unexpected hammer shell handshake: {ready}')
+        logger.debug(f'Started hammer shell on {self.hostname}')
+
+    def close(self):
+        for closer in (getattr(self._channel, 'close', None), getattr(self._client, 'close', None)):
+            try:
+                if closer:
+                    closer()
+            except Exception as err:
+                logger.debug(f'Failed to close hammer shell on {self.hostname}: {err}')
+        self._channel = self._client = None
+        self._buffer = ''
+
+    def _read_frame(self):
+        """Read output until a complete frame is available, skipping unframed noise"""
+        while True:
+            marker = self._buffer.find(FRAME_MARKER)
+            if marker > -1:
+                end = self._buffer.find('\n', marker)
+                if end > -1:
+                    payload = self._buffer[marker + len(FRAME_MARKER) : end]
+                    if noise := self._buffer[:marker].strip():
+                        logger.debug(f'hammer shell output outside of a frame: {noise}')
+                    self._buffer = self._buffer[end + 1 :]
+                    return json.loads(payload)
+            size, data = self._channel.read()
+            if size <= 0:
+                raise HammerShellError(
+                    0, '', f'hammer shell on {self.hostname} exited unexpectedly'
+                )
+            self._buffer += data.decode('utf-8', errors='replace')
+
+    def run(self, args, env=None, timeout=None):
+        """Send one hammer command and wait for its result
+
+        :raises BrokenPipeError: if the command could not be sent to the hammer process
+        :raises robottelo.exceptions.HammerShellError: if the reply can't be read once the
+            command was sent
+        """
+        request = json.dumps({'args': args, 'env': env or {}}) + '\n'
+        try:
+            self._client.session.session.set_timeout(timeout or self.timeout)
+            self._channel.write(request.encode())
+        except Exception as err:
+            self.close()
+            raise BrokenPipeError(f'Unable to send command to hammer shell: {err}') from err
+        try:
+            reply = self._read_frame()
+        except Exception as err:
+            self.close()
+            raise HammerShellError(
+                -1, str(err), f'Lost hammer shell on {self.hostname} while running {args}'
+            ) from err
+        return HammerResult(
+            status=int(reply['status']), stdout=reply['stdout'], stderr=reply['stderr']
+        )
+
+
+_shells = {}
+_shells_lock = threading.Lock()
+
+
+def execute(command, hostname, user=None, password=None, env=None, timeout=None):
+    """Run ``hammer <command>`` through the long-lived hammer process of ``hostname``
+
+    :param str command: everything that follows ``hammer`` on the command line
+    :return: a result object with ``status``, ``stdout`` and ``stderr`` or ``None`` when the
+        command has to be executed the one-shot way instead.
+    """
+    from robottelo.config import settings
+
+    args = split_command(command)
+    if args is None:
+        return None
+    default_timeout = settings.server.ssh_client.command_timeout
+    with _shells_lock:
+        shell = _shells.setdefault(
+            (hostname, user, ssh.password_digest(password)), HammerShell(hostname, default_timeout)
+        )
+    with shell.lock:
+        if not shell.alive:
+            try:
+                shell.start()
+            except Exception as err:
+                logger.warning(
+                    f'Unable to start hammer shell on {hostname}, falling back to '
+                    f'one-shot hammer execution: {err}'
+                )
+                shell.close()
+                return None
+        try:
+            return shell.run(args, env=env, timeout=timeout if isinstance(timeout, int) else None)
+        except OSError as err:
+            # the request never reached the remote process, safe to run it the usual way
+            logger.warning(f'hammer shell on {hostname} is gone, falling back: {err}')
+            shell.close()
+            return None
+
+
+def close_all():
+    """Stop every long-lived hammer process started by this process"""
+    with _shells_lock:
+        shells = list(_shells.values())
+        _shells.clear()
+    for shell in shells:
+        with shell.lock:
+            shell.close()
+
+
+atexit.register(close_all)
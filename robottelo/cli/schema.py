@@ -0,0 +1,164 @@
+"""Hammer command schema, to reject unknown hammer options before any ssh call.
+
+The schema is compiled from the help tree produced by ``scripts/hammer_command_tree.py``
+(see :func:`robottelo.cli.hammer.parse_help`): every leaf command, like
+``content-view version list``, is mapped to the long options it accepts, grouped options such
+as ``--hostgroup[s|-ids|-titles]`` being already exploded by the parser. Compiled schemas are
+stored per Satellite version in ``robottelo.tmp_dir`` and loaded once per process.
+
+:meth:`robottelo.cli.base.Base._construct_command` validates the options of every command it
+builds when ``settings.performance.hammer_schema`` is enabled. Commands missing from the
+schema, like the satellite-maintain ones, are not validated.
+"""
+
+from functools import lru_cache
+import json
+import os
+from pathlib import Path
+import tempfile
+
+from robottelo.exceptions import CLIOptionError
+from robottelo.logging import logger
+
+# bump when the compiled schema layout changes, older files are then ignored
+SCHEMA_FORMAT = 1
+
+
+def compile_tree(tree):
+    """Map the path of every leaf command of a hammer help ``tree`` to its option names
+
+    Options of the root ``hammer`` command are accepted by every command.
+    """
+    global_options = {option['name'] for option in tree.get('options', [])}
+    commands = {}
+
+    def walk(node, path):
+        if not node.get('subcommands'):
+            options = global_options | {option['name'] for option in node.get('options', [])}
+            commands[' '.join(path)] = sorted(options)
+            return
+        for subcommand in node['subcommands']:
+            walk(subcommand, [*path, subcommand['name']])
+
+    for subcommand in tree.get('subcommands', []):
+        walk(subcommand, [subcommand['name']])
+    return commands
+
+
+class HammerSchema:
+    """Options accepted by each hammer command
+
+    :param dict commands: command paths mapped to option names, see :func:`compile_tree`
+    :param str version: Satellite version the schema was compiled for
+    """
+
+    def __init__(self, commands, version=None):
+        self.version = version
+        self._commands = {path: frozenset(options) for path, options in commands.items()}
+
+    def __contains__(self, path):
+        return path in self._commands
+
+    def __len__(self):
+        return len(self._commands)
+
+    def options(self, path):
+        """Return the options accepted by the ``path`` command, ``None`` if it is unknown"""
+        return self._commands.get(path)
+
+    def validate(self, command_base, command_sub, options):
+        """Raise if ``options`` has keys hammer does not accept for the command
+
+        Negated flags are accepted for every known option, like ``no-verbose``.
+
+        :raises robottelo.exceptions.CLIOptionError: listing every unknown option
+        """
+        path = f'{command_base} {command_sub}' if command_sub else command_base
+        accepted = self._commands.get(path)
+        if accepted is None:
+            return
+        unknown = [
+            key
+            for key, value in options.items()
+            if value is not None
+            and value is not False
+            and key not in accepted
+            and key.removeprefix('no-') not in accepted
+        ]
+        if unknown:
+            raise CLIOptionError(
+                f'hammer {path} does not accept --{", --".join(unknown)} '
+                f'(Satellite {self.version} schema)'
+            )
+
+    def to_dict(self):
+        return {
+            'format': SCHEMA_FORMAT,
+            'version': self.version,
+            'commands': {path: sorted(options) for path, options in self._commands.items()},
+        }
+
+
+def schema_path(version):
+    """Return where the compiled schema of Satellite ``version`` is stored"""
+    from robottelo.config import settings
+
+    return Path(settings.robottelo.tmp_dir).joinpath(f'hammer_schema_{version}.json')
+
+
+def write_schema(tree, version, path=None):
+    """Compile a hammer help ``tree`` and store it as the schema of Satellite ``version``
+
+    :return: the compiled :class:`HammerSchema`
+    """
+    schema = HammerSchema(compile_tree(tree), version=version)
+    path = Path(path or schema_path(version))
+    # written aside and renamed, xdist workers may read the schema while another writes it
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, delete=False) as schema_file:
+        json.dump(schema.to_dict(), schema_file, indent=1, sort_keys=True)
+    os.replace(schema_file.name, path)
+    return schema
+
+
+def read_schema(path):
+    """Return the :class:`HammerSchema` stored in ``path``, ``None`` if missing or outdated"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    data = json.loads(path.read_text())
+    if data.get('format') != SCHEMA_FORMAT:
+        logger.warning(f'Ignoring hammer schema {path} in an outdated format')
+        return None
+    return HammerSchema(data['commands'], version=data.get('version'))
+
+
+@lru_cache
+def load_schema(version):
+    """Return the schema of Satellite ``version``, loaded once per process
+
+    When no schema was compiled for ``version`` yet and it is the version the bundled
+    ``hammer_commands.json`` was generated for (or ``stream``), that tree is compiled and
+    stored. Returns ``None`` when no schema is available.
+    """
+    from robottelo.constants import SATELLITE_VERSION, DataFile
+
+    path = schema_path(version)
+    schema = read_schema(path)
+    if schema is None and (version == 'stream' or version.startswith(SATELLITE_VERSION)):
+        tree = json.loads(DataFile.HAMMER_COMMANDS_JSON.read_text())
+        schema = write_schema(tree, version, path)
+    if schema is None:
+        logger.warning(
+            f'No hammer schema for Satellite {version}, hammer options are not validated. '
+            'Run scripts/hammer_command_tree.py to compile it.'
+        )
+    return schema
+
+
+def get_schema():
+    """Return the schema of the configured Satellite version, ``None`` if validation is off"""
+    from robottelo.config import settings
+
+    if settings.performance.get('hammer_schema') is not True:
+        return None
+    return load_schema(str(settings.server.version.release))
@@ -4,44 +4,60 @@ import os
 from pathlib import Path
 from urllib.parse import urlunsplit
 
-from dynaconf import LazySettings
 from dynaconf.validator import ValidationError
 from nailgun.config import ServerConfig
 
+from robottelo.config import snapshot
+from robottelo.config.validation import LazyValidatedSettings
 from robottelo.config.validators import VALIDATORS
 from robottelo.logging import logger, robottelo_root_dir
+from robottelo.utils import http
 
 if not os.getenv('ROBOTTELO_DIR'):
     # dynaconf robottelo file uses ROBOTELLO_DIR for screenshots
     os.environ['ROBOTTELO_DIR'] = str(robottelo_root_dir)
 
 
+SETTINGS_OPTIONS = {
+    'envvar_prefix': "ROBOTTELO",
+    'root_path': str(robottelo_root_dir),
+    'envless_mode': True,
+    'lowercase_read': True,
+}
+
+
 def get_settings():
     """Return Lazy settings object after validating
 
+    Settings are loaded from a compiled snapshot when one matches the current configuration,
+    see :mod:`robottelo.config.snapshot`. Otherwise all sections are validated, or each one
+    when it is first read with lazy validation, see :mod:`robottelo.config.validation`.
+
     :return: A validated Lazy settings object
     """
     if getattr(builtins, "__sphinx_build__", False):
         return None
-    settings = LazySettings(
-        envvar_prefix="ROBOTTELO",
+    key = snapshot.fingerprint()
+    settings = snapshot.load(key, **SETTINGS_OPTIONS)
+    if settings is not None:
+        settings.validators.register(**VALIDATORS)
+        return settings
+    settings = LazyValidatedSettings(
+        VALIDATORS,
+        **SETTINGS_OPTIONS,
         core_loaders=["YAML"],
-        root_path=str(robottelo_root_dir),
         settings_file="settings.yaml",
         preload=["conf/*.yaml"],
         includes=["settings.local.yaml", ".secrets.yaml", ".secrets_*.yaml"],
-        envless_mode=True,
-        lowercase_read=True,
         load_dotenv=True,
     )
     settings.validators.register(**VALIDATORS)
-    try:
-        settings.validators.validate()
-    except ValidationError as err:
-        if settings.robottelo.settings.get('ignore_validation_errors'):
-            logger.warning(f'Dynaconf validation failed with\n{err}')
-        else:
-            raise err
+    compiled = snapshot.is_compilable(settings)
+    # sections are otherwise validated when first read, see robottelo.config.validation
+    if compiled or not settings.get('robottelo.settings.lazy_validation'):
+        settings.validate_all()
+    if compiled:
+        snapshot.save(settings, key)
     return settings
 
 
@@ -94,7 +110,7 @@ def admin_nailgun_config():
     :return: ``nailgun.config.ServerConfig`` object, populated from admin user credentials.
 
     """
-    return ServerConfig(get_url(), get_credentials(), verify=settings.server.verify_ca)
+    return pooled(ServerConfig(get_url(), get_credentials(), verify=settings.server.verify_ca))
 
 
 def user_nailgun_config(username=None, password=None):
@@ -108,7 +124,18 @@ def user_nailgun_config(username=None, password=None):
 
     """
     creds = (username, password)
-    return ServerConfig(get_url(), creds, verify=settings.server.verify_ca)
+    return pooled(ServerConfig(get_url(), creds, verify=settings.server.verify_ca))
+
+
+def pooled(server_config):
+    """Send the requests of ``server_config`` through the shared HTTP session of its server
+
+    See :mod:`robottelo.utils.http`.
+
+    :return: ``server_config`` itself
+    """
+    http.register(server_config)
+    return server_config
 
 
 def setting_is_set(option):
@@ -116,16 +143,14 @@ def setting_is_set(option):
     set or not respectively.
     """
     # Example: `settings.clients`
-    # TODO: Use dynaconf 3.2 selective validation
-    # Within the split world of Legacy settings and dynaconf, there is a limitation on validating
-    # against the dynaconf settings within the scope of this method, and its use to skip tests.
-    # With dynaconf 3.2, selective validation is available, and this is a perfect use for it.
-    # Otherwise dynaconf validation is done above when the instance is created
-    # Validation misses are allowed while the SettingsFacade still exists, because the opposite
-    # configuration provider may have that field and will resolve.
+    # Sections are validated when first read (robottelo.config.validation), an invalid section
+    # is reported as not set.
     from dynaconf.utils.boxing import DynaBox
 
-    opt_inst = getattr(settings, option, None)
+    try:
+        opt_inst = getattr(settings, option, None)
+    except ValidationError:
+        return False
     if opt_inst is None:
         raise ValueError(f'Setting {option} did not resolve in settings')
     if hasattr(opt_inst, 'validate'):
@@ -144,15 +169,15 @@ def configure_nailgun():
     * Set ``nailgun.entity_mixins.DEFAULT_SERVER_CONFIG`` to whatever is
         returned by :meth:`robottelo.helpers.get_nailgun_config`. See
         ``robottelo.entity_mixins.Entity`` for more information on the effects
-        of this.
+        of this. Its requests use the shared HTTP session, see :func:`pooled`.
     * Set a default value for ``nailgun.entities.GPGKey.content``.
     """
     from nailgun import entities, entity_mixins
     from nailgun.config import ServerConfig
 
     entity_mixins.CREATE_MISSING = True
-    entity_mixins.DEFAULT_SERVER_CONFIG = ServerConfig(
-        get_url(), get_credentials(), verify=settings.server.verify_ca
+    entity_mixins.DEFAULT_SERVER_CONFIG = pooled(
+        ServerConfig(get_url(), get_credentials(), verify=settings.server.verify_ca)
     )
     gpgkey_init = entities.GPGKey.__init__
 
@@ -0,0 +1,115 @@
+"""Compiled settings: frozen snapshots of validated settings, loaded instead of the sources.
+
+Building the settings means parsing every ``conf/*.yaml`` file, merging the secrets, running
+the dynaconf hooks and all the validators, which every xdist worker and script pays on import.
+With ``robottelo.settings.compiled`` enabled, :func:`robottelo.config.get_settings` saves the
+validated settings in a snapshot named after the :func:`fingerprint` of everything they were
+built from: the contents of the settings files, of the hooks and validators, of the repository
+caches the hooks read (``settings_cache-*.json``), the ``ROBOTTELO_`` and dynaconf environment
+variables and the dynaconf version. Later imports with the same
+fingerprint load the snapshot, skipping the sources, hooks and validation.
+
+Snapshots are not saved when validation errors were ignored, nor when the hooks fetch fresh
+repositories (``robottelo.settings.get_fresh`` outside of nightly), since those would be
+frozen in the snapshot.
+
+Snapshots contain secrets, they are only readable by their owner.
+"""
+
+import hashlib
+from importlib.metadata import version
+import os
+from pathlib import Path
+import pickle
+import tempfile
+
+from dynaconf import LazySettings
+
+from robottelo.logging import logger, robottelo_root_dir
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_DIR = '.settings_snapshots'
+# every file settings are built from, relative to the robottelo root directory
+SOURCES = (
+    'settings.yaml',
+    'conf/*.yaml',
+    'conf/*.py',
+    'settings.local.yaml',
+    '.secrets.yaml',
+    '.secrets_*.yaml',
+    '.env',
+    'robottelo/config/validators.py',
+)
+# the repository caches conf/dynaconf_hooks.py reads, relative to the working directory
+CACHE_SOURCES = ('settings_cache-*.json',)
+ENV_PREFIXES = ('ROBOTTELO_', 'DYNACONF_')
+
+
+def fingerprint(root=robottelo_root_dir, environ=None, cwd=None):
+    """Return a hash of everything the settings are built from"""
+    root = Path(root)
+    cwd = Path.cwd() if cwd is None else Path(cwd)
+    environ = os.environ if environ is None else environ
+    digest = hashlib.sha256(f'{SNAPSHOT_FORMAT} {version("dynaconf")}'.encode())
+    for base, patterns in ((root, SOURCES), (cwd, CACHE_SOURCES)):
+        for pattern in patterns:
+            for path in sorted(base.glob(pattern)):
+                digest.update(f'\0{path.relative_to(base)}\0'.encode())
+                digest.update(path.read_bytes())
+    for name in sorted(environ):
+        if name.startswith(ENV_PREFIXES) or name.endswith('_FOR_DYNACONF'):
+            digest.update(f'\0{name}={environ[name]}'.encode())
+    return digest.hexdigest()
+
+
+def snapshot_path(key, root=robottelo_root_dir):
+    return Path(root, SNAPSHOT_DIR, f'{key}.pickle')
+
+
+def is_compilable(settings):
+    """Tell whether ``settings`` can be frozen, see the module documentation"""
+    options = settings.robottelo.settings
+    if not options.get('compiled') or options.get('ignore_validation_errors'):
+        return False
+    return not options.get('get_fresh', True) or settings.server.version.source == 'nightly'
+
+
+def save(settings, key, root=robottelo_root_dir):
+    """Save ``settings`` as the snapshot of ``key``, replacing the snapshots of other keys"""
+    path = snapshot_path(key, root)
+    path.parent.mkdir(mode=0o700, exist_ok=True)
+    # written aside and renamed, xdist workers may save the same snapshot at once
+    with tempfile.NamedTemporaryFile('wb', dir=path.parent, delete=False) as snapshot:
+        pickle.dump(settings.as_dict(), snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+    os.chmod(snapshot.name, 0o400)
+    os.replace(snapshot.name, path)
+    for old in path.parent.glob('*.pickle'):
+        if old != path:
+            old.unlink(missing_ok=True)
+    logger.debug(f'Saved compiled settings {path}')
+
+
+def load(key, root=robottelo_root_dir, **settings_kwargs):
+    """Return the settings saved in the snapshot of ``key``, ``None`` if there is none
+
+    :param settings_kwargs: passed to ``LazySettings``, no file nor environment variable is
+        loaded since they are already part of the snapshot
+    """
+    path = snapshot_path(key, root)
+    try:
+        data = pickle.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as err:
+        logger.warning(f'Ignoring unreadable compiled settings {path}: {err}')
+        return None
+    settings = LazySettings(
+        **settings_kwargs,
+        core_loaders=[],
+        loaders_for_dynaconf=[],
+        settings_files=[],
+        load_dotenv=False,
+    )
+    settings.update(data, loader_identifier='compiled_settings')
+    logger.debug(f'Loaded compiled settings {path}')
+    return settings
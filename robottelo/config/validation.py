@@ -0,0 +1,124 @@
+"""Settings validated one section at a time, the first time the section is read.
+
+Validating every section of :data:`robottelo.config.validators.VALIDATORS` takes a large part
+of the settings start up, mostly for integrations a run never uses. With
+``robottelo.settings.lazy_validation`` enabled, :func:`robottelo.config.get_settings` returns
+a :class:`LazyValidatedSettings`, which runs the validators of a section (and so applies its
+defaults) right before the section is first read, through attribute access, ``get``,
+indexing or ``in``. The outcome is memoized: a section failing validation raises the same
+``ValidationError`` on every read, unless ``robottelo.settings.ignore_validation_errors`` is
+set, in which case the failure is logged once.
+
+Reading the whole settings, like ``as_dict``, validates every section.
+"""
+
+import threading
+
+from dynaconf import LazySettings
+from dynaconf.utils.functional import empty
+from dynaconf.validator import CombinedValidator, ValidationError
+
+from robottelo.logging import logger
+
+# settings methods reading more than one section
+WHOLE_SETTINGS_READS = frozenset({'as_dict', 'to_dict', 'items', 'keys', 'values', 'store'})
+
+
+def validator_sections(validator):
+    """Return the lowercase top level sections the names of ``validator`` belong to"""
+    if isinstance(validator, CombinedValidator):
+        return validator_sections(validator.validators[0]) | validator_sections(
+            validator.validators[1]
+        )
+    return {name.split('.')[0].lower() for name in validator.names}
+
+
+def group_by_section(validators):
+    """Map each top level section to the validators of its settings
+
+    :param validators: mapping of lists of validators, like ``VALIDATORS``
+    """
+    sections = {}
+    for validator_list in validators.values():
+        for validator in validator_list:
+            for section in validator_sections(validator):
+                sections.setdefault(section, []).append(validator)
+    return sections
+
+
+class LazyValidatedSettings(LazySettings):
+    """``LazySettings`` validating each section right before it is first read
+
+    :param validators: mapping of lists of validators, like ``VALIDATORS``
+    :param kwargs: passed to ``LazySettings``
+    """
+
+    def __init__(self, validators=None, **kwargs):
+        super().__init__(**kwargs)
+        # LazyObject forwards attribute assignments to the wrapped settings
+        self.__dict__['_pending_sections'] = group_by_section(validators or {})
+        self.__dict__['_validating'] = set()
+        self.__dict__['_section_errors'] = {}
+        self.__dict__['_validation_lock'] = threading.RLock()
+
+    def validate_section(self, section):
+        """Validate ``section`` unless it already was, see the module documentation
+
+        :raises dynaconf.validator.ValidationError: if the section is invalid
+        """
+        section = section.lower()
+        if section in self._pending_sections or section in self._validating:
+            with self._validation_lock:
+                if section in self._pending_sections:
+                    # marked first, other threads wait for the lock and the validators may
+                    # read the section they validate
+                    self._validating.add(section)
+                    try:
+                        self._run_validators(section, self._pending_sections.pop(section))
+                    finally:
+                        self._validating.discard(section)
+        if section in self._section_errors:
+            raise self._section_errors[section]
+
+    def _run_validators(self, section, validators):
+        wrapped = self._settings()
+        for validator in validators:
+            try:
+                validator.validate(wrapped)
+            except ValidationError as err:
+                if not wrapped.get('robottelo.settings.ignore_validation_errors'):
+                    self._section_errors[section] = err
+                    return
+                logger.warning(f'Dynaconf validation failed with\n{err}')
+
+    def validate_all(self):
+        """Validate every section not validated yet, raising for any invalid section"""
+        for section in [*self._pending_sections, *self._section_errors]:
+            self.validate_section(section)
+
+    def is_validated(self, section):
+        return section.lower() not in self._pending_sections
+
+    def _settings(self):
+        if self._wrapped is empty:
+            self._setup()
+        return self._wrapped
+
+    def __getattr__(self, name):
+        if name in WHOLE_SETTINGS_READS:
+            self.validate_all()
+        elif not name.startswith('_'):
+            self.validate_section(name)
+        return super().__getattr__(name)
+
+    def get(self, key, *args, **kwargs):
+        self.validate_section(key.split('.')[0])
+        return self._settings().get(key, *args, **kwargs)
+
+    def __getitem__(self, key):
+        self.validate_section(key.split('.')[0])
+        return self._settings()[key]
+
+    def __contains__(self, key):
+        self.validate_section(key.split('.')[0])
+        return key in self._settings()
@@ -36,6 +36,10 @@ VALIDATORS = dict(
         Validator('server.ssh_username', default='root'),
         Validator('server.ssh_password', default=None),
         Validator('server.verify_ca', default=False),
+        Validator('server.ssh_client.pool_max_sessions', default=4, is_type_of=int),
+        Validator('server.ssh_client.pool_idle_timeout', default=300, is_type_of=int),
+        Validator('server.ssh_client.pool_health_check_interval', default=60, is_type_of=int),
+        Validator('server.ssh_client.pool_acquire_timeout', default=None),
         Validator(
             'server.network_type',
             cast=NetworkType,
@@ -326,7 +330,24 @@ VALIDATORS = dict(
             must_exist=True,
         ),
     ],
-    performance=[Validator('performance.time_hammer', default=False)],
+    performance=[
+        Validator('performance.time_hammer', default=False),
+        Validator('performance.hammer_shell', default=False, is_type_of=bool),
+        Validator('performance.json_create', default=False, is_type_of=bool),
+        Validator('performance.api_pool_size', default=10, is_type_of=int),
+        Validator('performance.api_retries', default=3, is_type_of=int),
+        Validator('performance.api_retry_backoff', default=0.5, is_type_of=(int, float)),
+        Validator('performance.read_cache', default=False, is_type_of=bool),
+        Validator('performance.read_cache_ttl', default=30, is_type_of=(int, float)),
+        Validator('performance.read_cache_size', default=1024, is_type_of=int),
+        Validator('performance.hammer_schema', default=False, is_type_of=bool),
+        Validator('performance.marker_cache', default=False, is_type_of=bool),
+        Validator(
+            'performance.lock_backend', default='file', is_in=('file', 'flock', 'redis', 'socket')
+        ),
+        Validator('performance.lock_lease_ttl', default=60, is_type_of=(int, float), gt=0),
+        Validator('performance.lock_server_socket', default=None),
+    ],
     report_portal=[
         Validator(
             'report_portal.portal_url',
@@ -427,6 +448,8 @@ VALIDATORS = dict(
     robottelo=[
         Validator('robottelo.stage_docs_url', default='https://docs.redhat.com'),
         Validator('robottelo.settings.ignore_validation_errors', is_type_of=bool, default=False),
+        Validator('robottelo.settings.compiled', is_type_of=bool, default=False),
+        Validator('robottelo.settings.lazy_validation', is_type_of=bool, default=False),
         Validator('robottelo.rhel_source', default='ga', is_in=['ga', 'internal']),
         Validator(
             'robottelo.sat_non_ga_versions',
@@ -0,0 +1,45 @@
+"""Paths of the files in the data directory"""
+
+from pathlib import Path
+
+from box import Box
+
+from robottelo.constants import (
+    EXPIRED_MANIFEST,
+    FAKE_3_YUM_REPO_RPMS,
+    FAKE_FILE_NEW_NAME,
+    OS_TEMPLATE_DATA_FILE,
+    OSCAP_TAILORING_FILE,
+    PARTITION_SCRIPT_DATA_FILE,
+    REPORT_TEMPLATE_FILE,
+    RPM_TO_UPLOAD,
+    SNIPPET_DATA_FILE,
+    SRPM_TO_UPLOAD,
+    VALID_GPG_KEY_BETA_FILE,
+    VALID_GPG_KEY_FILE,
+    ZOO_CUSTOM_GPG_KEY,
+)
+
+
+class DataFile(Box):
+    """The boxed Data directory class with its attributes pointing to the Data directory files"""
+
+    DATA_DIR = Path('tests/foreman/data')
+    OSCAP_TAILORING_FILE = DATA_DIR.joinpath(OSCAP_TAILORING_FILE)
+    REPORT_TEMPLATE_FILE = DATA_DIR.joinpath(REPORT_TEMPLATE_FILE)
+    VALID_GPG_KEY_FILE = DATA_DIR.joinpath(VALID_GPG_KEY_FILE)
+    VALID_GPG_KEY_BETA_FILE = DATA_DIR.joinpath(VALID_GPG_KEY_BETA_FILE)
+    VALID_CERT_FILE = DATA_DIR.joinpath('valid_cert.crt')
+    RPM_TO_UPLOAD = DATA_DIR.joinpath(RPM_TO_UPLOAD)
+    SRPM_TO_UPLOAD = DATA_DIR.joinpath(SRPM_TO_UPLOAD)
+    FAKE_FILE_NEW_NAME = DATA_DIR.joinpath(FAKE_FILE_NEW_NAME)
+    ZOO_CUSTOM_GPG_KEY = DATA_DIR.joinpath(ZOO_CUSTOM_GPG_KEY)
+    SSH_KEYS_JSON = DATA_DIR.joinpath('sshkeys.json')
+    HAMMER_COMMANDS_JSON = DATA_DIR.joinpath('hammer_commands.json')
+    SNIPPET_DATA_FILE = DATA_DIR.joinpath(SNIPPET_DATA_FILE)
+    PARTITION_SCRIPT_DATA_FILE = DATA_DIR.joinpath(PARTITION_SCRIPT_DATA_FILE)
+    OS_TEMPLATE_DATA_FILE = DATA_DIR.joinpath(OS_TEMPLATE_DATA_FILE)
+    FAKE_3_YUM_REPO_RPMS_ANT = DATA_DIR.joinpath(FAKE_3_YUM_REPO_RPMS[0])
+    EXPIRED_MANIFEST_FILE = DATA_DIR.joinpath(EXPIRED_MANIFEST)
+    USAGE_REPORT_ITEMS = DATA_DIR.joinpath('usage_report.yml')
+    USAGE_REPORT_ITEMS_CONDENSED = DATA_DIR.joinpath('usage_report_condensed.yml')
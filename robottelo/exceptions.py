@@ -71,6 +71,10 @@ class CLIError(Exception):
     """Indicates that a CLI command could not be run."""
 
 
+class CLIOptionError(CLIError):
+    """Indicates that hammer does not accept an option, according to the hammer schema."""
+
+
 class CapsuleHostError(Exception):
     """Indicates error in capsule configuration etc"""
 
@@ -134,5 +138,26 @@ class CLIDataBaseError(CLIBaseError):
     """
 
 
+class HammerShellError(CLIBaseError):
+    """Error to be raised when the long-lived hammer process is lost after a command
+    was sent to it, so the command outcome is unknown.
+    """
+
+
+class ParallelExecutionError(Exception):
+    """Raised when a function run for several hosts in parallel failed for some of them.
+
+    :param results: list of ``robottelo.utils.concurrency.HostTaskResult`` for every host
+    """
+
+    def __init__(self, results):
+        self.results = results
+        self.errors = {task.host: task.error for task in results if task.failed}
+        details = '\n'.join(
+            f'{getattr(host, "hostname", host)}: {error!r}' for host, error in self.errors.items()
+        )
+        super().__init__(f'Failed on {len(self.errors)} of {len(results)} hosts:\n{details}')
+
+
 class NoManifestProvidedError(Exception):
     """Raised when a manifest is not provided to a helper function that expects one"""
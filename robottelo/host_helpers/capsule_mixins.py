@@ -1,5 +1,4 @@
 from datetime import UTC, datetime, timedelta
-import time
 
 from box import Box
 from dateutil.parser import parse
@@ -51,24 +50,20 @@ class CapsuleInfo:
         :param search_query: Search query that will be passed to API call.
         :param search_rate: Delay between searches.
         :param max_tries: How many times search should be executed.
-        :param poll_rate: Delay between the end of one task check-up and
-            the start of the next check-up. Parameter for ``sat.api.ForemanTask.poll()`` method.
-        :param poll_timeout: Maximum number of seconds to wait until timing out.
-            Parameter for ``sat.api.ForemanTask.poll()`` method.
+        :param poll_rate: Not used anymore, tasks are polled in bulk by the satellite's
+            ``task_watcher``. Kept for compatibility.
+        :param poll_timeout: Maximum number of seconds to wait for all the tasks to finish.
         :param must_succeed: Assert success result on finished task.
         :return: List of ``sat.api.ForemanTask`` entities.
         :raises: ``AssertionError``. If not tasks were found until timeout.
         """
-        for _ in range(max_tries):
-            tasks = self.satellite.api.ForemanTask().search(query={'search': search_query})
-            if tasks:
-                for task in tasks:
-                    task.poll(poll_rate=poll_rate, timeout=poll_timeout, must_succeed=must_succeed)
-                break
-            time.sleep(search_rate)
-        else:
-            raise AssertionError(f"No task was found using query '{search_query}'")
-        return tasks
+        return self.satellite.task_watcher.wait_for_search(
+            search_query,
+            search_rate=search_rate,
+            max_tries=max_tries,
+            timeout=poll_timeout,
+            must_succeed=must_succeed,
+        )
 
     def wait_for_sync(self, start_time=None, timeout=600):
         """Wait for capsule sync to finish and assert success.
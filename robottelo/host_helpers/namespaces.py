@@ -0,0 +1,194 @@
+"""Lazy per-host namespaces exposed as ``Satellite.cli``, ``Capsule.cli`` and ``Satellite.api``
+
+The classes that can be exposed are discovered once per process (:func:`cli_registry`,
+:func:`api_registry`). A host only gets a cheap namespace object, and the host-bound
+subclass of a cli or nailgun entity class is created the first time it is accessed.
+API namespaces are further shared by every ``ServerConfig`` with the same url and
+credentials, see :func:`api_namespace`.
+"""
+
+from functools import lru_cache, partialmethod, wraps
+import importlib
+import json
+from pathlib import Path
+import threading
+
+from robottelo.cli.base import Base
+from robottelo.config import pooled
+from robottelo.utils import http, read_cache
+
+
+@lru_cache
+def cli_registry(prefix=''):
+    """Map the names of all robottelo cli classes to the classes, built once per process
+
+    :param str prefix: only look at ``robottelo.cli`` modules whose name starts with it,
+        e.g. ``sm_`` for the satellite-maintain commands.
+    """
+    classes = {}
+    for file in sorted(Path(__file__).parent.parent.joinpath('cli').glob(f'{prefix}*.py')):
+        if file.name.startswith('_'):
+            continue
+        cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
+        for name, obj in cli_module.__dict__.items():
+            if isinstance(obj, type) and issubclass(obj, Base):
+                classes[name] = obj
+    return classes
+
+
+@lru_cache
+def api_registry():
+    """Map the names of all nailgun entity classes to the classes, built once per process"""
+    from nailgun import entities as _entities  # use a private import
+    from nailgun.entity_mixins import Entity
+
+    return {
+        name: obj
+        for name, obj in _entities.__dict__.items()
+        if isinstance(obj, type) and issubclass(obj, Entity)
+    }
+
+
+class LazyNamespace:
+    """Namespace whose attributes are created from a registry on first access
+
+    :param registry: callable returning a mapping of attribute names to base classes
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._lock = threading.Lock()
+
+    def _bind(self, name, base):
+        """Return the object exposed as ``name`` for the registry entry ``base``"""
+        raise NotImplementedError
+
+    def __getattr__(self, name):
+        # private and dunder lookups (copy, pickle, ...) never come from the registry
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            base = self._registry()[name]
+        except KeyError:
+            raise AttributeError(f'{type(self).__name__} has no attribute {name!r}') from None
+        with self._lock:
+            if name not in self.__dict__:
+                setattr(self, name, self._bind(name, base))
+        return self.__dict__[name]
+
+    def __dir__(self):
+        return sorted({*super().__dir__(), *self._registry()})
+
+    def materialized(self):
+        """Return the attributes created so far, by name"""
+        return {name: obj for name, obj in vars(self).items() if not name.startswith('_')}
+
+
+class CLINamespace(LazyNamespace):
+    """robottelo cli classes bound to a host
+
+    :param str hostname: host the hammer (or satellite-maintain) commands run on
+    :param bool omitting_credentials: whether hammer is called without credentials
+    :param str prefix: see :func:`cli_registry`
+    """
+
+    def __init__(self, hostname, omitting_credentials=False, prefix=''):
+        super().__init__(lambda: cli_registry(prefix))
+        self._hostname = hostname
+        self._omitting_credentials = omitting_credentials
+
+    def _bind(self, name, base):
+        # create a copy of the class and set our hostname as a class attribute
+        return type(
+            name,
+            (base,),
+            {'hostname': self._hostname, 'omitting_credentials': self._omitting_credentials},
+        )
+
+    def set_omitting_credentials(self, value):
+        """Set ``omitting_credentials`` on current and future classes of this namespace"""
+        self._omitting_credentials = value
+        for cli_cls in self.materialized().values():
+            cli_cls.omitting_credentials = value
+
+    def batch(self, **kwargs):
+        """Shortcut to :meth:`robottelo.cli.base.Base.batch` on this host"""
+        return self.Base.batch(**kwargs)
+
+
+class APINamespace(LazyNamespace):
+    """nailgun entity classes bound to a nailgun ``ServerConfig``
+
+    :param server_config: ``nailgun.config.ServerConfig`` injected into every entity
+    """
+
+    def __init__(self, server_config):
+        super().__init__(api_registry)
+        self._server_config = pooled(server_config)
+
+    @property
+    def server_config(self):
+        return self._server_config
+
+    def _bind(self, name, base):
+        # create a copy of the class and inject our server config into the __init__
+        attrs = {'__init__': partialmethod(base.__init__, server_config=self._server_config)}
+        if hasattr(base, 'search_json') and name not in read_cache.UNCACHED_RESOURCES:
+            attrs['search_json'] = _cached_search_json(base.search_json)
+        return type(name, (base,), attrs)
+
+
+def _cached_search_json(search_json):
+    """Serve ``search_json`` from :mod:`robottelo.utils.read_cache` when it is enabled
+
+    Only searches sent through a pooled session are cached, since
+    :class:`robottelo.utils.http.SessionRouter` is what drops them after any request other
+    than GET and HEAD to the same server.
+    """
+
+    @wraps(search_json)
+    def wrapper(self, fields=None, query=None):
+        cache = read_cache.get_cache()
+        config = self._server_config
+        if cache is None or http.router.session_for(config.url) is None:
+            return search_json(self, fields, query)
+        auth = config.auth
+        key = (
+            'api',
+            http.base_url(config.url),
+            auth[0] if isinstance(auth, list | tuple) else repr(auth),
+            self.path('base'),
+            json.dumps(self.search_payload(fields, query), sort_keys=True, default=str),
+        )
+        return cache.get_or_set(key, lambda: search_json(self, fields, query))
+
+    return wrapper
+
+
+_api_namespaces = {}
+_api_namespaces_lock = threading.Lock()
+
+
+def api_namespace(server_config):
+    """Return the :class:`APINamespace` of ``server_config``, memoized per url and credentials
+
+    Satellite objects created for the same server thus share their entity classes and the
+    pooled HTTP session from :func:`robottelo.utils.http.register`.
+    """
+    auth = server_config.auth
+    key = (
+        server_config.url,
+        tuple(auth) if isinstance(auth, list | tuple) else auth,
+        server_config.verify,
+    )
+    with _api_namespaces_lock:
+        if key not in _api_namespaces:
+            _api_namespaces[key] = APINamespace(server_config)
+        return _api_namespaces[key]
+
+
+def clear_api_namespaces():
+    """Forget memoized API namespaces, e.g. after nailgun was reloaded"""
+    with _api_namespaces_lock:
+        _api_namespaces.clear()
+    api_registry.cache_clear()
@@ -0,0 +1,191 @@
+"""Wait for foreman tasks without one polling loop per task and per caller.
+
+A :class:`TaskWatcher` exists once per Satellite (``Satellite.task_watcher``). Callers from
+any thread (or coroutine, see :meth:`TaskWatcher.await_tasks`) register the task ids they
+wait for, and a single background thread checks every watched task with one bulk
+``foreman_tasks`` search per tick. The delay between ticks grows exponentially (with jitter)
+while nothing new is watched. Each task gets one future, resolved with the finished
+``ForemanTask`` entity and shared by every caller waiting for that task.
+
+Example::
+
+    tasks = target_sat.task_watcher.wait_for_search('label = Actions::Katello::Host::Update')
+"""
+
+import asyncio
+from concurrent.futures import Future, wait
+import random
+import threading
+import time
+
+from robottelo.logging import logger
+
+FINISHED_STATES = ('paused', 'stopped')
+
+
+def _task_id(task):
+    return getattr(task, 'id', task)
+
+
+class TaskWatcher:
+    """Poll the foreman tasks watched by any caller in bulk
+
+    :param satellite: Satellite the tasks run on
+    :param float min_interval: seconds between the first ticks after new tasks are watched
+    :param float max_interval: upper bound of the delay between ticks
+    :param float backoff: factor the delay grows by after every tick
+    :param float jitter: relative random variation applied to every delay
+    :param int max_errors: consecutive failed searches after which all waits fail
+    """
+
+    def __init__(
+        self, satellite, min_interval=1, max_interval=15, backoff=1.5, jitter=0.1, max_errors=5
+    ):
+        self._satellite = satellite
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.max_errors = max_errors
+        self._cond = threading.Condition()
+        self._futures = {}  # task id -> Future
+        self._waiters = {}  # task id -> number of callers waiting
+        self._reset = False
+        self._thread = None
+
+    def watch(self, tasks):
+        """Start watching ``tasks`` and return their futures, in order
+
+        Every call must be matched with :meth:`unwatch` once the caller stopped waiting.
+
+        :param tasks: ``ForemanTask`` entities or task ids
+        """
+        futures = []
+        with self._cond:
+            for task_id in map(_task_id, tasks):
+                if task_id not in self._futures:
+                    self._futures[task_id] = Future()
+                self._waiters[task_id] = self._waiters.get(task_id, 0) + 1
+                futures.append(self._futures[task_id])
+            self._reset = True
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f'task-watcher-{self._satellite.hostname}', daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return futures
+
+    def unwatch(self, tasks):
+        """Stop polling ``tasks`` that no other caller is waiting for"""
+        with self._cond:
+            for task_id in map(_task_id, tasks):
+                self._waiters[task_id] = self._waiters.get(task_id, 1) - 1
+                if self._waiters[task_id] <= 0:
+                    del self._waiters[task_id]
+                    self._futures.pop(task_id, None)
+
+    def _search(self, task_ids):
+        query = ' or '.join(f'id = {task_id}' for task_id in task_ids)
+        return self._satellite.api.ForemanTask().search(
+            query={'search': query, 'per_page': len(task_ids)}
+        )
+
+    def _resolve(self, task_ids, error=None, tasks=()):
+        """Resolve the futures of finished ``tasks``, or of all ``task_ids`` with ``error``"""
+        with self._cond:
+            if error is not None:
+                futures = [self._futures.pop(task_id, None) for task_id in task_ids]
+                for future in filter(None, futures):
+                    future.set_exception(error)
+                return
+            for task in tasks:
+                if task.state in FINISHED_STATES and task.id in self._futures:
+                    self._futures.pop(task.id).set_result(task)
+
+    def _run(self):
+        interval = self.min_interval
+        errors = 0
+        while True:
+            with self._cond:
+                task_ids = list(self._futures)
+                if not task_ids:
+                    self._thread = None
+                    return
+            try:
+                tasks = self._search(task_ids)
+            except Exception as err:
+                errors += 1
+                logger.warning(f'Failed to search {len(task_ids)} watched tasks: {err}')
+                if errors >= self.max_errors:
+                    self._resolve(task_ids, error=err)
+                    # tasks watched since then get their own error budget
+                    errors = 0
+            else:
+                errors = 0
+                self._resolve(task_ids, tasks=tasks)
+            with self._cond:
+                if self._reset:
+                    interval, self._reset = self.min_interval, False
+                else:
+                    interval = min(interval * self.backoff, self.max_interval)
+                if self._futures:
+                    self._cond.wait(interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def wait(self, tasks, timeout=None, must_succeed=True):
+        """Wait until every task of ``tasks`` finished
+
+        :param tasks: ``ForemanTask`` entities or task ids
+        :param timeout: seconds to wait for all the tasks, nailgun's ``TASK_TIMEOUT`` if None
+        :param bool must_succeed: raise when a task finished with another result than success
+        :return: list of the finished ``ForemanTask`` entities, in the order of ``tasks``
+        :raises nailgun.entity_mixins.TaskTimedOutError: if the tasks did not finish in time
+        :raises nailgun.entity_mixins.TaskFailedError: if ``must_succeed`` and a task failed
+        """
+        from nailgun.entity_mixins import TASK_TIMEOUT, TaskFailedError, TaskTimedOutError
+
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        futures = self.watch(tasks)
+        try:
+            _, pending = wait(futures, timeout=TASK_TIMEOUT if timeout is None else timeout)
+        finally:
+            self.unwatch(tasks)
+        if pending:
+            unfinished = [
+                _task_id(task)
+                for task, future in zip(tasks, futures, strict=True)
+                if future in pending
+            ]
+            raise TaskTimedOutError(f'Timed out waiting for tasks {unfinished}')
+        results = [future.result() for future in futures]
+        if must_succeed:
+            for task in results:
+                if task.result != 'success':
+                    raise TaskFailedError(
+                        f'Task {task.id} did not succeed. Task information: {task.to_json_dict()}'
+                    )
+        return results
+
+    async def await_tasks(self, tasks, timeout=None, must_succeed=True):
+        """Asynchronous counterpart of :meth:`wait`"""
+        return await asyncio.to_thread(self.wait, tasks, timeout, must_succeed)
+
+    def wait_for_search(
+        self, search_query, search_rate=1, max_tries=10, timeout=None, must_succeed=True
+    ):
+        """Wait for the tasks matching ``search_query``, searching until some are found
+
+        :param search_query: foreman tasks search query
+        :param search_rate: delay between searches
+        :param max_tries: how many times the search is executed
+        :raises AssertionError: if no task was found
+        :return: see :meth:`wait`
+        """
+        for _ in range(max_tries):
+            tasks = self._satellite.api.ForemanTask().search(query={'search': search_query})
+            if tasks:
+                return self.wait(tasks, timeout=timeout, must_succeed=must_succeed)
+            time.sleep(search_rate)
+        raise AssertionError(f"No task was found using query '{search_query}'")
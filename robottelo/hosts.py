@@ -1,16 +1,17 @@
+import asyncio
 import base64
 from configparser import ConfigParser
 import contextlib
 from contextlib import contextmanager
 from datetime import UTC, datetime
 from functools import cached_property, lru_cache
-import importlib
 import io
 import json
 from pathlib import Path, PurePath
 import random
 import re
 from tempfile import NamedTemporaryFile
+import threading
 import time
 from urllib.parse import urljoin, urlparse, urlunsplit
 
@@ -30,7 +31,6 @@ from wrapanapi.entities.vm import VmState
 import yaml
 
 from robottelo import constants
-from robottelo.cli.base import Base
 from robottelo.config import (
     configure_airgun,
     configure_nailgun,
@@ -68,8 +68,11 @@ from robottelo.host_helpers import (
     ContentHostMixins,
     SatelliteMixins,
 )
+from robottelo.host_helpers.namespaces import CLINamespace, api_namespace, clear_api_namespaces
+from robottelo.host_helpers.task_watcher import TaskWatcher
 from robottelo.logging import logger
 from robottelo.utils import validate_ssh_pub_key
+from robottelo.utils.concurrency import DEFAULT_MAX_PARALLEL, run_concurrently
 from robottelo.utils.datafactory import valid_emails_list
 from robottelo.utils.installer import InstallerCommand
 
@@ -435,6 +438,63 @@ class ContentHost(Host, ContentHostMixins):
                 f'Unable to establsh SSH connection to host {self} after {timeout} seconds'
             ) from err
 
+    @property
+    def _execute_lock(self):
+        """Serialize commands sent from worker threads over this host's single ssh session"""
+        return self.__dict__.setdefault('_execute_lock_obj', threading.Lock())
+
+    async def aexecute(self, command, timeout=None):
+        """Asynchronous counterpart of ``execute``, the command runs in a worker thread"""
+
+        def _execute():
+            with self._execute_lock:
+                return self.execute(command, timeout=timeout)
+
+        return await asyncio.to_thread(_execute)
+
+    async def acall(self, method, *args, **kwargs):
+        """Run ``self.<method>(*args, **kwargs)`` (e.g. ``register``) in a worker thread"""
+        return await asyncio.to_thread(getattr(self, method), *args, **kwargs)
+
+    @staticmethod
+    def run_many(
+        hosts, command, timeout=None, max_parallel=DEFAULT_MAX_PARALLEL, return_exceptions=False
+    ):
+        """Execute ``command`` on all ``hosts`` concurrently
+
+        :param hosts: iterable of ContentHost objects
+        :param int max_parallel: maximum number of hosts running the command at once
+        :param bool return_exceptions: return exceptions in place of results instead of
+            raising the first one
+        :return: list of results, in the order of ``hosts``
+        """
+        return run_concurrently(
+            *(host.aexecute(command, timeout=timeout) for host in hosts),
+            limit=max_parallel,
+            return_exceptions=return_exceptions,
+        )
+
+    @staticmethod
+    def call_many(
+        hosts,
+        method,
+        *args,
+        max_parallel=DEFAULT_MAX_PARALLEL,
+        return_exceptions=False,
+        **kwargs,
+    ):
+        """Call ``host.<method>(*args, **kwargs)`` on all ``hosts`` concurrently
+
+        Example: ``ContentHost.call_many(hosts, 'configure_rex', satellite=sat, org=org)``
+
+        :return: list of results, in the order of ``hosts``
+        """
+        return run_concurrently(
+            *(host.acall(method, *args, **kwargs) for host in hosts),
+            limit=max_parallel,
+            return_exceptions=return_exceptions,
+        )
+
     def download_file(self, file_url, local_path=None, file_name=None):
         """Downloads file from given fileurl to directory specified by local_path by given filename
         on satellite.
@@ -1912,28 +1972,9 @@ class Capsule(ContentHost, CapsuleMixins):
 
     @property
     def cli(self):
-        """Import only satellite-maintain robottelo cli entities and wrap them under self.cli"""
-        self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if (
-                file.suffix == '.py'
-                and not file.name.startswith('_')
-                and file.name.startswith('sm_')
-            ):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(name, (obj,), {'hostname': self.hostname})
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        """satellite-maintain robottelo cli entities bound to this host, created on access"""
+        if getattr(self, '_cli', None) is None:
+            self._cli = CLINamespace(self.hostname, prefix='sm_')
         return self._cli
 
     def enable_satellite_or_capsule_module_for_rhel8(self):
@@ -1986,6 +2027,10 @@ class Capsule(ContentHost, CapsuleMixins):
         cmd = f'{base_cmd} -c "{query}"'
         return _execute_db_query(cmd).stdout
 
+    async def aquery_db(self, query, db='foreman', output_format='json'):
+        """Asynchronous counterpart of ``query_db``, the query runs in a worker thread"""
+        return await asyncio.to_thread(self.query_db, query, db=db, output_format=output_format)
+
 
 class Satellite(Capsule, SatelliteMixins):
     product_rpm_name = 'satellite'
@@ -1997,9 +2042,9 @@ class Satellite(Capsule, SatelliteMixins):
         self.port = kwargs.get('port', settings.server.port)
         kwargs.setdefault('net_type', settings.server.network_type)
         super().__init__(hostname=hostname, **kwargs)
-        # create dummy classes for later population
-        self._api = type('api', (), {'_configured': False})
-        self._cli = type('cli', (), {'_configured': False})
+        # namespaces created on first access of self.api and self.cli
+        self._api = None
+        self._cli = None
         self._apidoc = None
         self.record_property = None
 
@@ -2011,49 +2056,33 @@ class Satellite(Capsule, SatelliteMixins):
 
         pip_main(['uninstall', '-y', 'nailgun'])
         pip_main(['install', f'https://github.com/SatelliteQE/nailgun/archive/{new_version}.zip'])
-        self._api = type('api', (), {'_configured': False})
+        self._api = None
+        clear_api_namespaces()
         to_clear = [k for k in sys.modules if 'nailgun' in k]
         [sys.modules.pop(k) for k in to_clear]
 
     @property
     def api(self):
-        """Import all nailgun entities and wrap them under self.api"""
-        if not self._api:
-            self._api = type('api', (), {'_configured': False})
-        if self._api._configured:
-            return self._api
-        from nailgun import entities as _entities  # use a private import
-        from nailgun.config import ServerConfig
-        from nailgun.entity_mixins import Entity
-
-        def inject_config(cls, server_config):
-            """inject a nailgun server config into the init of nailgun entity classes"""
-            import functools
-
-            class DecClass(cls):
-                __init__ = functools.partialmethod(cls.__init__, server_config=server_config)
-
-            return DecClass
-
-        # set the server configuration to point to this satellite
-        self.nailgun_cfg = ServerConfig(
-            auth=(settings.server.admin_username, settings.server.admin_password),
-            url=f'{self.url}',
-            verify=settings.server.verify_ca,
-        )
-        # add each nailgun entity to self.api, injecting our server config
-        for name, obj in _entities.__dict__.items():
-            try:
-                if Entity in obj.mro():
-                    #  create a copy of the class and inject our server config into the __init__
-                    new_cls = type(name, (obj,), {})
-                    setattr(self._api, name, inject_config(new_cls, self.nailgun_cfg))
-            except AttributeError:
-                # not everything has an mro method, we don't care about them
-                pass
-        self._api._configured = True
+        """nailgun entities bound to this satellite's server config, created on access"""
+        if self._api is None:
+            from nailgun.config import ServerConfig
+
+            # set the server configuration to point to this satellite
+            self._api = api_namespace(
+                ServerConfig(
+                    auth=(settings.server.admin_username, settings.server.admin_password),
+                    url=f'{self.url}',
+                    verify=settings.server.verify_ca,
+                )
+            )
+            self.nailgun_cfg = self._api.server_config
         return self._api
 
+    @property
+    def task_watcher(self):
+        """Shared :class:`robottelo.host_helpers.task_watcher.TaskWatcher` of this satellite"""
+        return self.__dict__.setdefault('_task_watcher', TaskWatcher(self))
+
     @property
     def apidoc(self):
         """Provide Satellite's apidoc via apypie"""
@@ -2069,32 +2098,9 @@ class Satellite(Capsule, SatelliteMixins):
 
     @property
     def cli(self):
-        """Import all robottelo cli entities and wrap them under self.cli"""
-        if not self._cli:
-            self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if file.suffix == '.py' and not file.name.startswith('_'):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(
-                                name,
-                                (obj,),
-                                {
-                                    'hostname': self.hostname,
-                                    'omitting_credentials': self.omitting_credentials,
-                                },
-                            )
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        """robottelo cli entities bound to this satellite, created on access"""
+        if self._cli is None:
+            self._cli = CLINamespace(self.hostname, omitting_credentials=self.omitting_credentials)
         return self._cli
 
     @contextmanager
@@ -2102,24 +2108,13 @@ class Satellite(Capsule, SatelliteMixins):
         change = not self.omitting_credentials  # if not already set to omit
         if change:
             self.omitting_credentials = True
-            # if CLI is already created
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = True
+            if self._cli is not None:
+                self._cli.set_omitting_credentials(True)
         yield
         if change:
             self.omitting_credentials = False
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = False
+            if self._cli is not None:
+                self._cli.set_omitting_credentials(False)
 
     @contextmanager
     def ui_session(self, testname=None, user=None, password=None, url=None, login=True):
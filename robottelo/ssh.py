@@ -1,6 +1,201 @@
 """Utility module to handle the shared ssh connection."""
 
+import atexit
+from collections import defaultdict
+from contextlib import contextmanager
+import hashlib
+import threading
+import time
+
 from robottelo.cli import hammer
+from robottelo.logging import logger
+
+
+class SSHPoolTimeoutError(Exception):
+    """Raised when no pooled ssh session became available in time."""
+
+
+class SSHConnectionPool:
+    """Process-wide, thread-safe pool of live ssh clients.
+
+    Clients are keyed by ``(hostname, username, port, net_type, credentials)``, so every
+    caller talking to the same host with the same credentials reuses an already authenticated session
+    instead of paying a TCP handshake and ssh authentication per command.
+
+    :param int max_sessions_per_host: Maximum number of clients (idle and busy) per key.
+    :param int idle_timeout: Seconds after which an idle client is closed and evicted.
+    :param int health_check_interval: Idle seconds after which a client is probed with a
+        no-op command before being handed out again.
+    :param int acquire_timeout: Seconds to wait for a free client when the per-host limit
+        is reached, ``None`` waits forever.
+    """
+
+    health_check_command = 'true'
+    health_check_timeout = 10000  # ms, same unit as ContentHost.default_timeout
+
+    def __init__(
+        self,
+        max_sessions_per_host=4,
+        idle_timeout=300,
+        health_check_interval=60,
+        acquire_timeout=None,
+    ):
+        self.max_sessions_per_host = max_sessions_per_host
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self._cond = threading.Condition()
+        self._idle = defaultdict(list)  # key -> [(client, last_used), ...]
+        self._busy = defaultdict(int)  # key -> number of clients handed out
+
+    @staticmethod
+    def _close(client):
+        try:
+            client.close()
+        except Exception as err:  # the connection is being thrown away anyway
+            logger.debug(f'Failed to close pooled ssh client {client}: {err}')
+
+    def _pop_expired(self):
+        """Remove idle clients older than ``idle_timeout``, caller must hold the lock"""
+        expired = []
+        now = time.monotonic()
+        for idle in self._idle.values():
+            keep = []
+            for client, last_used in idle:
+                if now - last_used > self.idle_timeout:
+                    expired.append(client)
+                else:
+                    keep.append((client, last_used))
+            idle[:] = keep
+        return expired
+
+    def _is_healthy(self, client, idle_for):
+        """Check that an idle client can still be used"""
+        if hasattr(client, '_session') and client._session is None:
+            # broker.Host would transparently reconnect, which is fine, but count it as new
+            return False
+        if idle_for < self.health_check_interval:
+            return True
+        try:
+            result = client.execute(self.health_check_command, timeout=self.health_check_timeout)
+        except Exception as err:
+            logger.debug(f'Pooled ssh client {client} failed health check: {err}')
+            return False
+        return result.status == 0
+
+    def acquire(self, key, factory):
+        """Return a live client for ``key``, creating it with ``factory`` when needed"""
+        deadline = None if self.acquire_timeout is None else time.monotonic() + self.acquire_timeout
+        client = last_used = None
+        with self._cond:
+            while True:
+                expired = self._pop_expired()
+                if self._idle[key]:
+                    client, last_used = self._idle[key].pop()
+                    self._busy[key] += 1
+                    break
+                if self._busy[key] < self.max_sessions_per_host:
+                    self._busy[key] += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise SSHPoolTimeoutError(
+                        f'No ssh session to {key[0]} became available '
+                        f'in {self.acquire_timeout} seconds'
+                    )
+                self._cond.wait(timeout=remaining)
+        for old_client in expired:
+            self._close(old_client)
+        if client is not None and not self._is_healthy(client, time.monotonic() - last_used):
+            self._close(client)
+            client = None
+        if client is None:
+            try:
+                client = factory()
+            except BaseException:
+                self._release_slot(key)
+                raise
+        return client
+
+    def _release_slot(self, key):
+        with self._cond:
+            self._busy[key] -= 1
+            self._cond.notify()
+
+    def release(self, key, client, discard=False):
+        """Return ``client`` to the pool, or close it when ``discard`` is set"""
+        if discard:
+            self._close(client)
+            self._release_slot(key)
+            return
+        with self._cond:
+            self._busy[key] -= 1
+            self._idle[key].append((client, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, key, factory):
+        """Context manager handing out a pooled client for ``key``
+
+        The client is discarded instead of being reused if the block raises.
+        """
+        client = self.acquire(key, factory)
+        try:
+            yield client
+        except BaseException:
+            self.release(key, client, discard=True)
+            raise
+        self.release(key, client)
+
+    def close_all(self):
+        """Close every idle client, busy clients are closed when they are released"""
+        with self._cond:
+            idle = [client for clients in self._idle.values() for client, _ in clients]
+            self._idle.clear()
+        for client in idle:
+            self._close(client)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide :class:`SSHConnectionPool`, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from robottelo.config import settings
+
+                ssh_client = settings.server.ssh_client
+                _pool = SSHConnectionPool(
+                    max_sessions_per_host=ssh_client.get('pool_max_sessions', 4),
+                    idle_timeout=ssh_client.get('pool_idle_timeout', 300),
+                    health_check_interval=ssh_client.get('pool_health_check_interval', 60),
+                    acquire_timeout=ssh_client.get('pool_acquire_timeout'),
+                )
+                atexit.register(_pool.close_all)
+    return _pool
+
+
+def password_digest(password):
+    """Return the digest of ``password`` keying connection caches, not to keep it around"""
+    return hashlib.sha256(str(password).encode()).hexdigest()
+
+
+def _connection_kwargs(hostname=None, username=None, password=None, port=22, net_type=None):
+    """Fill in connection parameters missing from the call with the server settings"""
+    from robottelo.config import settings
+
+    return {
+        'hostname': hostname or settings.server.hostname,
+        'username': username or settings.server.ssh_username,
+        'password': password or settings.server.ssh_password,
+        'port': port or settings.server.ssh_client.port,
+        # TODO(ogajduse): we better get rid of the ssh module entirely
+        'net_type': net_type or settings.server.network_type,
+    }
 
 
 def get_client(
@@ -15,19 +210,50 @@ def get_client(
     Processes ssh credentials in the order: password, key_filename, ssh_key
     Config validation enforces one of the three must be set in settings.server
     """
-    from robottelo.config import settings
     from robottelo.hosts import ContentHost
 
     return ContentHost(
-        hostname=hostname or settings.server.hostname,
-        username=username or settings.server.ssh_username,
-        password=password or settings.server.ssh_password,
-        port=port or settings.server.ssh_client.port,
-        # TODO(ogajduse): we better get rid of the ssh module entirely
-        net_type=net_type or settings.server.network_type,
+        **_connection_kwargs(
+            hostname=hostname,
+            username=username,
+            password=password,
+            port=port,
+            net_type=net_type,
+        )
     )
 
 
+@contextmanager
+def pooled_client(
+    hostname=None,
+    username=None,
+    password=None,
+    port=22,
+    net_type=None,
+):
+    """Context manager yielding a pooled host object with a live ssh connection
+
+    The client is exclusively owned by the caller until the block exits, then it goes back
+    to the process-wide pool for reuse. Accepts the same arguments as :func:`get_client`.
+    """
+    conn_kwargs = _connection_kwargs(
+        hostname=hostname,
+        username=username,
+        password=password,
+        port=port,
+        net_type=net_type,
+    )
+    key = (
+        conn_kwargs['hostname'],
+        conn_kwargs['username'],
+        conn_kwargs['port'],
+        str(conn_kwargs['net_type']),
+        password_digest(conn_kwargs['password']),
+    )
+    with get_pool().connection(key, lambda: get_client(**conn_kwargs)) as client:
+        yield client
+
+
 def command(
     cmd,
     hostname=None,
@@ -47,15 +273,23 @@ def command(
     :param int timeout: Time to wait for the ssh command to finish.
     :param connection_timeout: Time to wait for establishing the connection.
     """
-    client = get_client(
+    with pooled_client(
         hostname=hostname,
         username=username,
         password=password,
         port=port,
         net_type=net_type,
-    )
-    result = client.execute(cmd, timeout=timeout)
+    ) as client:
+        result = client.execute(cmd, timeout=timeout)
+    return parse_output(result, output_format)
+
 
+def parse_output(result, output_format=None):
+    """Replace ``result.stdout`` with its parsed content for the json and csv formats
+
+    :param result: an object with ``status`` and ``stdout`` attributes
+    :param str output_format: json, csv or None
+    """
     if output_format and result.status == 0:
         if output_format == 'csv':
             result.stdout = hammer.parse_csv(result.stdout) if result.stdout else {}
@@ -0,0 +1,95 @@
+"""Helpers to run remote work on several hosts concurrently.
+
+The ssh transport used by robottelo (``broker``/``ssh2-python``) is blocking, so the asyncio
+helpers below run the blocking calls in worker threads and only use the event loop to
+bound and gather them. :func:`run_on_hosts` is the plain thread pool counterpart used by
+multi-host fixtures.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import time
+
+from robottelo.exceptions import ParallelExecutionError
+from robottelo.logging import logger
+
+DEFAULT_MAX_PARALLEL = 10
+
+
+async def gather_limited(*aws, limit=DEFAULT_MAX_PARALLEL, return_exceptions=False):
+    """Like :func:`asyncio.gather`, but with at most ``limit`` awaitables running at once
+
+    :param aws: coroutines to run, results are returned in the same order.
+    :param int limit: maximum number of coroutines running at the same time.
+    :param bool return_exceptions: return exceptions in place of results instead of raising
+        the first one.
+    """
+    semaphore = asyncio.Semaphore(limit or len(aws) or 1)
+
+    async def _limited(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_limited(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+def run_concurrently(*aws, limit=DEFAULT_MAX_PARALLEL, return_exceptions=False):
+    """Synchronous entry point running :func:`gather_limited` in a new event loop
+
+    Meant for fixtures and helpers that are not coroutines themselves.
+    """
+    return asyncio.run(gather_limited(*aws, limit=limit, return_exceptions=return_exceptions))
+
+
+@dataclass
+class HostTaskResult:
+    """Outcome of a function run for one host by :func:`run_on_hosts`"""
+
+    host: object
+    result: object = None
+    error: BaseException = None
+    duration: float = 0.0
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+
+def run_on_hosts(hosts, func, *args, max_workers=DEFAULT_MAX_PARALLEL, raise_errors=True, **kwargs):
+    """Run ``func(host, *args, **kwargs)`` for every host in a bounded thread pool
+
+    Example, registering all hosts at once::
+
+        run_on_hosts(hosts, ContentHost.register, org, None, ak.name, target_sat)
+
+    :param hosts: iterable of host objects
+    :param func: callable taking the host as first argument, e.g. an unbound ContentHost method
+    :param int max_workers: maximum number of hosts processed at once
+    :param bool raise_errors: raise :class:`robottelo.exceptions.ParallelExecutionError` when
+        ``func`` failed for any host, after every host has been processed
+    :return: list of :class:`HostTaskResult`, in the order of ``hosts``
+    """
+    hosts = list(hosts)
+
+    def _run(host):
+        start = time.monotonic()
+        try:
+            task = HostTaskResult(host, result=func(host, *args, **kwargs))
+        except Exception as err:
+            task = HostTaskResult(host, error=err)
+        task.duration = time.monotonic() - start
+        logger.info(
+            f'{getattr(func, "__name__", func)} on {getattr(host, "hostname", host)} '
+            f'{"failed" if task.failed else "finished"} in {task.duration:.1f}s'
+        )
+        return task
+
+    if not hosts:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers or len(hosts), len(hosts))) as pool:
+        results = list(pool.map(_run, hosts))
+    failed = [task for task in results if task.failed]
+    if failed and raise_errors:
+        raise ParallelExecutionError(results) from failed[0].error
+    return results
@@ -1,4 +1,5 @@
-"""Implements test function locking, using pytest_services file locking
+"""Implements test function locking, using the lock backend of performance.lock_backend, see
+:mod:`robottelo.utils.decorators.lock_backends`
 
 Usage::
 
@@ -38,18 +39,37 @@ Usage::
        def test_that_conflict_with_test_to_lock(self)
             with locking_function(self.test_to_lock):
                 # do some operations that conflict with test_to_lock
+
+The time every lock was waited for and held is recorded by lock name, and written to
+``lock_metrics/<process id>.json`` in the robottelo temporary directory when the process exits.
+:func:`read_lock_metrics` merges the metrics of all the processes, e.g. of all xdist workers::
+
+    >>> read_lock_metrics()
+    {'some_scope/tests.foreman.test_x.setUpClass.lock': {'acquired': 8, 'contended': 7, ...}}
+
+The ``pytest_plugins.lock_metrics`` plugin clears them when the test session starts and reports
+the most contended locks at its end.
 """
 
+import atexit
 from contextlib import contextmanager
 import functools
 import inspect
+import json
 import os
+from pathlib import Path
 import tempfile
-
-from pytest_services.locks import file_lock
+import time
 
 from robottelo.config import settings
 from robottelo.logging import logger
+from robottelo.utils.decorators.lock_backends import (
+    FileLockBackend,
+    FlockBackend,
+    FunctionLockerError,
+    RedisLeaseBackend,
+    SocketLeaseBackend,
+)
 
 TEMP_ROOT_DIR = 'robottelo'
 TEMP_FUNC_LOCK_DIR = 'lock_functions'
@@ -57,12 +77,23 @@ LOCK_DIR = None
 LOCK_DEFAULT_TIMEOUT = 1800  # 30 minutes
 LOCK_FILE_NAME_EXT = 'lock'
 LOCK_DEFAULT_SCOPE = None
+# by default performance.lock_backend
+LOCK_BACKEND = None
+TEMP_LOCK_METRICS_DIR = 'lock_metrics'
+LOCK_SERVER_SOCKET_NAME = 'lock_server.sock'
+# lock name: metrics of the locks acquired by this process
+LOCK_METRICS = {}
 
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
-
-class FunctionLockerError(Exception):
-    """the default function locker error"""
+_lock_backends = {
+    'file': FileLockBackend,
+    'flock': FlockBackend,
+    'redis': RedisLeaseBackend,
+    'socket': SocketLeaseBackend,
+}
+_lock_backend = None
+_metrics_pid = None
 
 
 def set_default_scope(value):
@@ -74,6 +105,47 @@ def set_default_scope(value):
     LOCK_DEFAULT_SCOPE = value
 
 
+def set_lock_backend(value):
+    """Set the lock backend, overriding performance.lock_backend
+
+    :type value: str
+    """
+    global LOCK_BACKEND
+    global _lock_backend
+    LOCK_BACKEND = value
+    _lock_backend = None
+
+
+def _get_lock_backend():
+    """Return the lock backend instance"""
+    global _lock_backend
+    if _lock_backend is None:
+        name = LOCK_BACKEND or settings.performance.lock_backend
+        if name not in _lock_backends:
+            raise FunctionLockerError(f'lock backend: "{name}" not supported')
+        _lock_backend = _lock_backends[name](**_get_lock_backend_kwargs(name))
+    return _lock_backend
+
+
+def _get_lock_backend_kwargs(name):
+    """Return the settings of the lock backend"""
+    if name == 'redis':
+        return dict(
+            host=settings.shared_function.redis_host,
+            port=settings.shared_function.redis_port,
+            db=settings.shared_function.redis_db,
+            password=settings.shared_function.redis_password,
+            ttl=settings.performance.lock_lease_ttl,
+        )
+    if name == 'socket':
+        return dict(
+            path=settings.performance.lock_server_socket
+            or os.path.join(get_temp_dir(), TEMP_ROOT_DIR, LOCK_SERVER_SOCKET_NAME),
+            ttl=settings.performance.lock_lease_ttl,
+        )
+    return {}
+
+
 def _get_default_scope():
     # this is the default locking scope
     return LOCK_DEFAULT_SCOPE or str(os.getpid())
@@ -121,18 +193,19 @@ def _get_scope_path(scope, scope_kwargs=None, scope_context=None, create=True):
 
     scope_path = os.path.join(*scope_path_list)
 
-    if create and not os.path.exists(scope_path):
-        try:
-            # it can happen that the workers try to create this path at the
-            # same time
-            os.makedirs(scope_path)
-        except OSError:
-            if not os.path.exists(scope_path):
-                raise
+    if create:
+        _create_dir(scope_path)
 
     return scope_path
 
 
+@functools.cache
+def _create_dir(path):
+    """Create the directory of path, once per process"""
+    # it can happen that the workers try to create this path at the same time
+    os.makedirs(path, exist_ok=True)
+
+
 def _get_function_name(function, class_name=None):
     """Return a string representation of the function as
     module_path.Class_name.function_name
@@ -155,37 +228,124 @@ def _get_function_name_lock_path(function_name, scope=None, scope_kwargs=None, s
     )
 
 
-def _check_deadlock(lock_file_path, process_id):
-    """To prevent process deadlock, raise exception if the file content is the
-    same as process_id
+def _get_lock_metrics_dir(create=True):
+    metrics_dir = os.path.join(get_temp_dir(), TEMP_ROOT_DIR, TEMP_LOCK_METRICS_DIR)
+    if create:
+        _create_dir(metrics_dir)
+    return metrics_dir
 
-    note: this function is called before the lock
 
-    :type lock_file_path: str
-    :type process_id: str
+def _record_lock_metrics(lock_name, wait_time, hold_time, holders):
+    """Add a lock acquired after wait_time seconds and held for hold_time seconds to the
+    metrics of lock_name, holders are the processes the lock was waited for
+    """
+    global _metrics_pid
+    if _metrics_pid != os.getpid():
+        # a forked process does not export the metrics of its parent
+        LOCK_METRICS.clear()
+        _metrics_pid = os.getpid()
+        atexit.register(export_lock_metrics)
+    metrics = LOCK_METRICS.setdefault(
+        lock_name,
+        {
+            'acquired': 0,
+            'contended': 0,
+            'wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'hold_time': 0.0,
+            'max_hold_time': 0.0,
+            'holders': [],
+        },
+    )
+    metrics['acquired'] += 1
+    metrics['contended'] += bool(holders)
+    metrics['wait_time'] += wait_time
+    metrics['max_wait_time'] = max(metrics['max_wait_time'], wait_time)
+    metrics['hold_time'] += hold_time
+    metrics['max_hold_time'] = max(metrics['max_hold_time'], hold_time)
+    metrics['holders'] = sorted({*metrics['holders'], *(holder for holder in holders if holder)})
+
+
+def export_lock_metrics():
+    """Write the lock metrics of this process to the lock metrics directory and return the
+    file path, None if this process did not lock anything
+    """
+    if not LOCK_METRICS or _metrics_pid != os.getpid():
+        return None
+    metrics_dir = _get_lock_metrics_dir()
+    # written aside and renamed, the metrics may be read at any time
+    with tempfile.NamedTemporaryFile('w', dir=metrics_dir, delete=False) as metrics_file:
+        json.dump(LOCK_METRICS, metrics_file)
+    metrics_path = os.path.join(metrics_dir, f'{_metrics_pid}.json')
+    os.replace(metrics_file.name, metrics_path)
+    return metrics_path
+
+
+def clear_lock_metrics(metrics_dir=None):
+    """Remove the lock metrics exported by all the processes
+
+    :type metrics_dir: str
+    :param metrics_dir: the lock metrics directory, by default the one of robottelo tmp_dir
     """
-    if os.path.exists(lock_file_path):
+    for metrics_path in Path(metrics_dir or _get_lock_metrics_dir(create=False)).glob('*.json'):
+        metrics_path.unlink(missing_ok=True)
+
+
+def read_lock_metrics(metrics_dir=None, since=None):
+    """Return the lock metrics exported by all the processes, by lock name, the locks waited
+    for the longest first
+
+    :type metrics_dir: str
+    :type since: float
+    :param metrics_dir: the lock metrics directory, by default the one of robottelo tmp_dir
+    :param since: a timestamp, to ignore the metrics exported before it, e.g. by previous runs
+    """
+    merged = {}
+    for metrics_path in Path(metrics_dir or _get_lock_metrics_dir(create=False)).glob('*.json'):
         try:
-            with open(lock_file_path) as lock_file_handler:
-                lock_file_content = lock_file_handler.read()
-        except OSError as exp:
-            # do nothing, but anyway log the exception
-            logger.exception(exp)
-            lock_file_content = None
-
-        if lock_file_content and lock_file_content == process_id:
-            raise FunctionLockerError(
-                'recursion detected: the function file already locked by the same process'
-            )
+            if since and metrics_path.stat().st_mtime < since:
+                continue
+            process_metrics = json.loads(metrics_path.read_text())
+        except (OSError, ValueError) as exp:
+            logger.warning(f'Ignoring lock metrics {metrics_path}: {exp}')
+            continue
+        for lock_name, metrics in process_metrics.items():
+            lock_metrics = merged.setdefault(lock_name, {**metrics, 'processes': []})
+            if lock_metrics['processes']:
+                for key in ('acquired', 'contended', 'wait_time', 'hold_time'):
+                    lock_metrics[key] += metrics[key]
+                for key in ('max_wait_time', 'max_hold_time'):
+                    lock_metrics[key] = max(lock_metrics[key], metrics[key])
+                lock_metrics['holders'] = sorted({*lock_metrics['holders'], *metrics['holders']})
+            lock_metrics['processes'].append(metrics_path.stem)
+    return dict(sorted(merged.items(), key=lambda item: item[1]['wait_time'], reverse=True))
 
 
-def _write_content(handler, content):
-    """write content to locked file"""
-    handler.seek(0)
-    handler.truncate()
-    if content:
-        handler.write(content)
-    handler.flush()
+@contextmanager
+def _lock(function_name, lock_file_path, timeout):
+    """Lock the lock file with the lock backend, recording the lock metrics"""
+    lock_name = os.path.relpath(lock_file_path, _get_temp_lock_function_dir())
+    holders = []
+    started = time.monotonic()
+    with _get_lock_backend().lock(
+        lock_file_path, timeout, on_contention=holders.append, lock_name=lock_name
+    ) as handler:
+        acquired = time.monotonic()
+        if holders:
+            logger.info(
+                f'lock {lock_name} acquired after waiting {acquired - started:.3f}s '
+                f'for process id: {holders[0]}'
+            )
+        logger.info(
+            f'process id: {os.getpid()} - lock function name:{function_name}  - '
+            f'using file path: {lock_file_path}'
+        )
+        try:
+            yield handler
+        finally:
+            _record_lock_metrics(
+                lock_name, acquired - started, time.monotonic() - acquired, holders
+            )
 
 
 def lock_function(
@@ -233,25 +393,9 @@ def lock_function(
             lock_file_path = _get_function_name_lock_path(
                 function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
             )
-            process_id = str(os.getpid())
-            # to prevent dead lock when recursively calling this function
-            # check if the same process is trying to acquire the lock
-            _check_deadlock(lock_file_path, process_id)
-
-            with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
-                logger.info(
-                    f'process id: {process_id} lock function using file path: {lock_file_path}'
-                )
-                # write the process id that locked this function
-                _write_content(handler, process_id)
+            with _lock(function_name, lock_file_path, timeout):
                 # call the locked function
-                try:
-                    res = func(*args, **kwargs)
-                finally:
-                    # clear the file
-                    _write_content(handler, None)
-
-            return res
+                return func(*args, **kwargs)
 
         return function_wrapper
 
@@ -294,20 +438,6 @@ def locking_function(
     lock_file_path = _get_function_name_lock_path(
         function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
     )
-    process_id = str(os.getpid())
-    # to prevent dead lock when recursively calling this function
-    # check if the same process is trying to acquire the lock
-    _check_deadlock(lock_file_path, process_id)
-
-    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
-        logger.info(
-            f'process id: {process_id} - lock function name:{function_name}  - using file path: {lock_file_path}'
-        )
-        # write the process id that locked this function
-        _write_content(handler, process_id)
+    with _lock(function_name, lock_file_path, timeout) as handler:
         # let the locked code run
-        try:
-            yield handler
-        finally:
-            # clear the file
-            _write_content(handler, None)
+        yield handler
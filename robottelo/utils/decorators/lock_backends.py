@@ -0,0 +1,453 @@
+"""Lock backends of :mod:`robottelo.utils.decorators.func_locker`
+
+A backend locks the lock file of a function across processes and writes the id of the process
+holding the lock in it while it does. The backend is chosen with ``performance.lock_backend``:
+
+``file``
+    The lock files of ``pytest_services``, polled every 50 to 150 ms while another process
+    holds them. A process locking a function it already locked, and the process a lock is
+    waited for, are known by reading the process id of the lock file.
+``flock``
+    Kernel advisory locks (``flock(2)``) of the lock files, a waiting process is woken up by the
+    kernel as soon as the lock is released. A thread locking a function it already locked is
+    detected in process, without reading the lock file.
+
+The ``redis`` and ``socket`` backends grant a :class:`Lease` of the lock instead, for
+``performance.lock_lease_ttl`` seconds, renewed while it is held. The lease of a dead process
+expires, leaving no stale lock behind, and every lease comes with a fencing token, increasing
+with every lease of the same lock, for the locked code to tell the resources it changes:
+
+``redis``
+    Leases of the Redis server of the ``shared_function`` settings, shared by the workers of
+    every node running the tests.
+``socket``
+    Leases of the lock server of :mod:`robottelo.utils.decorators.lock_server`, started on
+    demand by the first process needing it, for the workers of a single node. The lease of a
+    dead process is released as soon as its connection is closed.
+"""
+
+from contextlib import ExitStack, contextmanager
+import fcntl
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from pytest_services.locks import file_lock
+from zc.lockfile import LockError
+
+from robottelo.logging import logger
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+LEASE_DEFAULT_TTL = 60
+REDIS_KEY_PREFIX = 'robottelo:func_locker:'
+# seconds to wait for a lock server started on demand to accept connections
+LOCK_SERVER_START_TIMEOUT = 10
+
+
+class FunctionLockerError(Exception):
+    """the default function locker error"""
+
+
+def _write_content(handler, content):
+    """write content to locked file"""
+    handler.seek(0)
+    handler.truncate()
+    if content:
+        handler.write(content)
+    handler.flush()
+
+
+def _read_content(lock_file_path):
+    """Return the content of the lock file, None if it can not be read"""
+    try:
+        with open(lock_file_path) as lock_file_handler:
+            return lock_file_handler.read()
+    except OSError as exp:
+        # do nothing, but anyway log the exception
+        logger.exception(exp)
+        return None
+
+
+def _check_deadlock(lock_file_path, process_id):
+    """To prevent process deadlock, raise exception if the file content is the
+    same as process_id
+
+    note: this function is called before the lock
+
+    :type lock_file_path: str
+    :type process_id: str
+    """
+    if os.path.exists(lock_file_path):
+        lock_file_content = _read_content(lock_file_path)
+        if lock_file_content and lock_file_content == process_id:
+            raise FunctionLockerError(
+                'recursion detected: the function file already locked by the same process'
+            )
+
+
+class BaseLockBackend:
+    def lock(self, lock_file_path, timeout, on_contention=None, lock_name=None):
+        """Return the context manager locking ``lock_file_path``, yielding the lock handler
+
+        :param timeout: the time in seconds to wait for acquiring the lock
+        :param on_contention: called with the process holding the lock, if the backend knows
+            it has to wait for it
+        :param lock_name: the name of the lock, its path relative to the lock directory
+        """
+        raise NotImplementedError
+
+
+class _InProcessLocks:
+    """The locks held by the threads of this process, to detect recursion without reading
+    lock files
+    """
+
+    def __init__(self):
+        # lock: (process id, thread id) of the locks held by this process
+        self._held = {}
+
+    def acquiring(self, lock):
+        owner = (os.getpid(), threading.get_ident())
+        # a forked process inherits the locks its parent held, but does not hold them
+        if self._held.get(lock) == owner:
+            raise FunctionLockerError(
+                'recursion detected: the function file already locked by the same process'
+            )
+        return owner
+
+    def acquired(self, lock, owner):
+        self._held[lock] = owner
+
+    def released(self, lock):
+        del self._held[lock]
+
+
+class FileLockBackend(BaseLockBackend):
+    """pytest_services file locks"""
+
+    @contextmanager
+    def lock(self, lock_file_path, timeout, on_contention=None, lock_name=None):
+        process_id = str(os.getpid())
+        # to prevent dead lock when recursively calling this function
+        # check if the same process is trying to acquire the lock
+        _check_deadlock(lock_file_path, process_id)
+        with ExitStack() as stack:
+            try:
+                # a single attempt first, to report the process holding the lock
+                handler = stack.enter_context(file_lock(lock_file_path, remove=False, timeout=0))
+            except LockError:
+                if on_contention:
+                    on_contention(_read_content(lock_file_path) or None)
+                handler = stack.enter_context(
+                    file_lock(lock_file_path, remove=False, timeout=timeout)
+                )
+            # write the process id that locked this function
+            _write_content(handler, process_id)
+            try:
+                yield handler
+            finally:
+                # clear the file
+                _write_content(handler, None)
+
+
+class _FlockWaiter:
+    """Waits in a thread for the exclusive lock of ``handler``, see :meth:`acquire`"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.acquired = threading.Event()
+        self.cancelled = False
+        self._guard = threading.Lock()
+
+    def _wait(self):
+        fcntl.flock(self.handler, fcntl.LOCK_EX)
+        with self._guard:
+            if self.cancelled:
+                # nobody is waiting anymore, closing the file releases the lock
+                self.handler.close()
+            else:
+                self.acquired.set()
+
+    def acquire(self, timeout):
+        """Return whether the lock was acquired within ``timeout`` seconds
+
+        ``flock`` can not time out, it is waited for in a thread. When the lock is not acquired
+        in time, the thread releases it and closes the handler as soon as it gets it.
+        """
+        threading.Thread(target=self._wait, name='flock-waiter', daemon=True).start()
+        if self.acquired.wait(timeout):
+            return True
+        with self._guard:
+            self.cancelled = not self.acquired.is_set()
+        return not self.cancelled
+
+
+class FlockBackend(BaseLockBackend):
+    """Kernel advisory locks of the lock files"""
+
+    def __init__(self):
+        self._locks = _InProcessLocks()
+
+    @contextmanager
+    def lock(self, lock_file_path, timeout, on_contention=None, lock_name=None):
+        owner = self._locks.acquiring(lock_file_path)
+        handler = open(lock_file_path, 'a+')  # noqa: SIM115 - closed when released
+        try:
+            fcntl.flock(handler, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            if on_contention:
+                on_contention(_read_content(lock_file_path) or None)
+            # not acquired in time, the waiter closes the handler
+            if not _FlockWaiter(handler).acquire(timeout):
+                raise FunctionLockerError(
+                    f'could not acquire the lock of {lock_file_path} in {timeout} seconds'
+                ) from None
+        except OSError:
+            handler.close()
+            raise
+        self._locks.acquired(lock_file_path, owner)
+        try:
+            # write the process id that locked this function
+            _write_content(handler, str(owner[0]))
+            yield handler
+        finally:
+            self._locks.released(lock_file_path)
+            # clear the file, closing it releases the lock
+            _write_content(handler, None)
+            handler.close()
+
+
+class Lease:
+    """The lease of a lock, yielded by the lease backends while it is held
+
+    :ivar fence: the fencing token of the lease, greater than the ones of the previous leases
+        of the lock, for the resources changed by the locked code to reject older holders
+    :ivar lost: set when the lease could not be renewed before it expired, the lock may be
+        held by another process since
+    """
+
+    def __init__(self, name, owner, ttl):
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self.fence = None
+        self.expires = None
+        self.lost = threading.Event()
+
+    def renewed(self, at):
+        """Record the lease was granted or renewed by a request sent at monotonic time ``at``"""
+        self.expires = at + self.ttl
+
+    def check(self):
+        """Raise FunctionLockerError if the lease was lost or expired"""
+        if self.lost.is_set() or (self.expires is not None and time.monotonic() >= self.expires):
+            raise FunctionLockerError(f'the lease of {self.name} was lost')
+
+
+class LeaseLockBackend(BaseLockBackend):
+    """Locks granted as leases of ``ttl`` seconds, renewed every third of it while held"""
+
+    # errors of a renewal meaning the lease is not held anymore, other errors are retried
+    lost_errors = ()
+
+    def __init__(self, ttl=LEASE_DEFAULT_TTL):
+        self.ttl = ttl
+        self._locks = _InProcessLocks()
+
+    def _acquire(self, lease, timeout, on_contention):
+        """Acquire the lease within ``timeout`` seconds, set its fence and return True"""
+        raise NotImplementedError
+
+    def _renew(self, lease):
+        """Renew the lease, return False if it is not held anymore"""
+        raise NotImplementedError
+
+    def _release(self, lease):
+        """Release the lease, return False if it was not held anymore"""
+        raise NotImplementedError
+
+    def _heartbeat(self, lease, stopped):
+        while not stopped.wait(self.ttl / 3):
+            sent = time.monotonic()
+            try:
+                renewed = self._renew(lease)
+            except Exception as err:
+                if not isinstance(err, self.lost_errors) and time.monotonic() < lease.expires:
+                    # retried until the lease expires
+                    logger.warning(f'Failed to renew the lease of {lease.name}: {err}')
+                    continue
+                logger.error(f'Failed to renew the lease of {lease.name}, it is lost: {err}')
+                lease.lost.set()
+                return
+            if not renewed:
+                logger.error(f'The lease of {lease.name} expired, it is not held anymore')
+                lease.lost.set()
+                return
+            lease.renewed(sent)
+
+    @contextmanager
+    def lock(self, lock_file_path, timeout, on_contention=None, lock_name=None):
+        name = lock_name or lock_file_path
+        owner = self._locks.acquiring(name)
+        lease = Lease(name, f'{socket.gethostname()}:{owner[0]}:{uuid.uuid4().hex}', self.ttl)
+        if not self._acquire(lease, timeout, on_contention):
+            raise FunctionLockerError(f'could not acquire the lease of {name} in {timeout} seconds')
+        # granted before the answer was received, a negligible time ago
+        lease.renewed(time.monotonic())
+        self._locks.acquired(name, owner)
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(lease, stopped), name='lease-heartbeat', daemon=True
+        )
+        heartbeat.start()
+        try:
+            yield lease
+        finally:
+            stopped.set()
+            heartbeat.join()
+            self._locks.released(name)
+            try:
+                released = self._release(lease)
+            except Exception as err:
+                # expires anyway
+                logger.warning(f'Failed to release the lease of {name}: {err}')
+            else:
+                if not released:
+                    logger.error(f'The lease of {name} expired before it was released')
+
+
+class RedisLeaseBackend(LeaseLockBackend):
+    """Leases of a Redis server, the fencing tokens are counted in Redis too"""
+
+    def __init__(self, host, port, db=0, password=None, ttl=LEASE_DEFAULT_TTL):
+        if redis is None:
+            raise FunctionLockerError('the redis lock backend needs the redis package')
+        super().__init__(ttl)
+        self.client = redis.StrictRedis(host=host, port=port, db=db, password=password)
+        self._redis_locks = {}
+
+    def _acquire(self, lease, timeout, on_contention):
+        key = f'{REDIS_KEY_PREFIX}{lease.name}'
+        redis_lock = self.client.lock(key, timeout=self.ttl, thread_local=False)
+        if not redis_lock.acquire(blocking=False, token=lease.owner):
+            if on_contention:
+                holder = self.client.get(key)
+                on_contention(holder.decode() if holder else None)
+            if not redis_lock.acquire(blocking_timeout=timeout, token=lease.owner):
+                return False
+        lease.fence = self.client.incr(f'{key}:fence')
+        self._redis_locks[lease.owner] = redis_lock
+        return True
+
+    def _renew(self, lease):
+        try:
+            self._redis_locks[lease.owner].reacquire()
+        except redis.exceptions.LockNotOwnedError:
+            return False
+        return True
+
+    def _release(self, lease):
+        try:
+            self._redis_locks.pop(lease.owner).release()
+        except redis.exceptions.LockNotOwnedError:
+            return False
+        return True
+
+
+class _LockServerConnection:
+    """A connection to the lock server, sending a request at a time"""
+
+    def __init__(self, path):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile('rwb')
+        self._guard = threading.Lock()
+
+    def request(self, op, **request):
+        with self._guard:
+            self.file.write(json.dumps({'op': op, **request}).encode() + b'\n')
+            self.file.flush()
+            response = self.file.readline()
+        if not response:
+            raise ConnectionError('the lock server closed the connection')
+        return json.loads(response)
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+
+class SocketLeaseBackend(LeaseLockBackend):
+    """Leases of the lock server listening on the unix socket ``path``, started if needed"""
+
+    # the server releases the leases of a connection as soon as it is closed
+    lost_errors = (ConnectionError,)
+
+    def __init__(self, path, ttl=LEASE_DEFAULT_TTL, idle_timeout=None):
+        super().__init__(ttl)
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self._connections = {}
+
+    def _connect(self):
+        deadline = time.monotonic() + LOCK_SERVER_START_TIMEOUT
+        started = False
+        while True:
+            try:
+                return _LockServerConnection(self.path)
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise
+            if not started:
+                # exits right away when another process started a server meanwhile
+                args = [] if self.idle_timeout is None else [str(self.idle_timeout)]
+                subprocess.Popen(
+                    [sys.executable, '-m', 'robottelo.utils.decorators.lock_server', self.path]
+                    + args,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
+                started = True
+            time.sleep(0.05)
+
+    def _acquire(self, lease, timeout, on_contention):
+        # a connection per lease, closing it releases the lease
+        connection = self._connect()
+        request = {'name': lease.name, 'owner': lease.owner, 'ttl': self.ttl}
+        try:
+            response = connection.request('acquire', timeout=0, **request)
+            if not response['ok']:
+                if on_contention:
+                    on_contention(response['holder'])
+                response = connection.request('acquire', timeout=timeout, **request)
+        except BaseException:
+            connection.close()
+            raise
+        if not response['ok']:
+            connection.close()
+            return False
+        lease.fence = response['fence']
+        self._connections[lease.owner] = connection
+        return True
+
+    def _renew(self, lease):
+        connection = self._connections[lease.owner]
+        return connection.request('renew', name=lease.name, owner=lease.owner, ttl=self.ttl)['ok']
+
+    def _release(self, lease):
+        connection = self._connections.pop(lease.owner)
+        try:
+            return connection.request('release', name=lease.name, owner=lease.owner)['ok']
+        finally:
+            connection.close()
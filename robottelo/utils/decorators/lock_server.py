@@ -0,0 +1,168 @@
+"""A lock server granting leases over a unix socket, the local stand-in of Redis for the
+``socket`` lock backend of :mod:`robottelo.utils.decorators.func_locker`
+
+A lease is granted to one owner at a time with a fencing token, increasing with every lease of
+the same lock, for ``ttl`` seconds. Its owner renews it before it expires, and it is released
+as soon as the connection it was granted on is closed, e.g. when its owner dies. Waiting for a
+lease does not poll: the server wakes the waiters up when a lease is released or expires.
+
+The protocol is one JSON object per line, a request and its response::
+
+    {"op": "acquire", "name": "scope/function.lock", "owner": "host:pid:...", "ttl": 60, "timeout": 10}
+    {"ok": true, "fence": 3}
+    {"op": "renew", "name": "scope/function.lock", "owner": "host:pid:...", "ttl": 60}
+    {"ok": true}
+    {"op": "release", "name": "scope/function.lock", "owner": "host:pid:..."}
+    {"ok": true}
+
+A refused acquisition answers the current owner, ``{"ok": false, "holder": "host:pid:..."}``.
+The server is started by the first process needing it, and exits once nothing used it for
+``idle_timeout`` seconds::
+
+    python -m robottelo.utils.decorators.lock_server /var/tmp/robottelo/lock_server.sock
+
+The last fencing token of every lock is saved next to the socket (``<path>.fences``) before it
+is granted, so the tokens keep increasing across the servers started on the same socket.
+"""
+
+from collections import defaultdict
+import contextlib
+import fcntl
+import json
+import os
+from pathlib import Path
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+IDLE_TIMEOUT = 300
+
+
+class _Lease:
+    def __init__(self, owner, fence, ttl, connection):
+        self.owner = owner
+        self.fence = fence
+        self.expires = time.monotonic() + ttl
+        self.connection = connection
+
+
+class LockRequestHandler(socketserver.StreamRequestHandler):
+    """Serves the requests of a connection, releasing its leases when it is closed"""
+
+    def handle(self):
+        self.server.connected(self, 1)
+        try:
+            for line in self.rfile:
+                request = json.loads(line)
+                operation = getattr(self.server, request.pop('op'))
+                response = operation(connection=self, **request)
+                self.wfile.write(json.dumps(response).encode() + b'\n')
+        finally:
+            self.server.connected(self, -1)
+
+
+class LockServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Grants the leases of the locks, see the module documentation"""
+
+    daemon_threads = True
+
+    def __init__(self, path, idle_timeout=IDLE_TIMEOUT):
+        super().__init__(path, LockRequestHandler)
+        self.idle_timeout = idle_timeout
+        self.leases = {}
+        self.fences_path = Path(f'{path}.fences')
+        self.fences = defaultdict(int, self._load_fences())
+        self.connections = 0
+        self.idle_since = time.monotonic()
+        self.condition = threading.Condition()
+
+    def _load_fences(self):
+        try:
+            return json.loads(self.fences_path.read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _save_fences(self):
+        # written aside and renamed, a server dying meanwhile leaves the previous tokens
+        with tempfile.NamedTemporaryFile('w', dir=self.fences_path.parent, delete=False) as fences:
+            json.dump(self.fences, fences)
+        os.replace(fences.name, self.fences_path)
+
+    def connected(self, connection, count):
+        with self.condition:
+            self.connections += count
+            if count < 0:
+                for name, lease in list(self.leases.items()):
+                    if lease.connection is connection:
+                        del self.leases[name]
+                self.condition.notify_all()
+            self.idle_since = time.monotonic()
+
+    def acquire(self, name, owner, ttl, timeout=None, connection=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                lease = self.leases.get(name)
+                if lease is None or lease.expires <= now:
+                    self.fences[name] += 1
+                    self._save_fences()
+                    self.leases[name] = _Lease(owner, self.fences[name], ttl, connection)
+                    return {'ok': True, 'fence': self.fences[name]}
+                if deadline is not None and now >= deadline:
+                    return {'ok': False, 'holder': lease.owner}
+                # woken up when released, else when expired or timed out
+                wait = lease.expires - now
+                self.condition.wait(wait if deadline is None else min(wait, deadline - now))
+
+    def renew(self, name, owner, ttl, connection=None):
+        with self.condition:
+            # still renewable once expired, as long as nobody else got it
+            lease = self.leases.get(name)
+            if lease is None or lease.owner != owner:
+                return {'ok': False}
+            lease.expires = time.monotonic() + ttl
+            return {'ok': True}
+
+    def release(self, name, owner, connection=None):
+        with self.condition:
+            lease = self.leases.get(name)
+            if lease is None or lease.owner != owner:
+                return {'ok': False}
+            del self.leases[name]
+            self.condition.notify_all()
+            return {'ok': True}
+
+    def shutdown_when_idle(self):
+        """Shut the server down once it had no connection for ``idle_timeout`` seconds"""
+        while True:
+            time.sleep(min(self.idle_timeout, 10))
+            with self.condition:
+                if not self.connections and time.monotonic() - self.idle_since > self.idle_timeout:
+                    break
+        self.shutdown()
+
+
+def serve(path, idle_timeout=IDLE_TIMEOUT):
+    """Serve the leases on the unix socket ``path``, unless another server already does"""
+    with open(f'{path}.lock', 'w') as guard:
+        try:
+            fcntl.flock(guard, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return
+        # left behind by a server that did not exit cleanly
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+        with LockServer(path, idle_timeout) as server:
+            threading.Thread(target=server.shutdown_when_idle, daemon=True).start()
+            try:
+                server.serve_forever()
+            finally:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+
+
+if __name__ == '__main__':
+    serve(sys.argv[1], *map(float, sys.argv[2:3]))
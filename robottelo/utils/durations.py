@@ -0,0 +1,119 @@
+"""Historical durations of the tests, used to schedule xdist workers and to plan runs.
+
+Durations are read from the duration file the runs recording their durations merge them into
+(:data:`DURATIONS_FILE`) and from junit XML reports of previous runs. The duration of a test
+without history is estimated from the tests of its module, else from all tests.
+"""
+
+from collections import defaultdict
+import fcntl
+import json
+import os
+from pathlib import Path
+import statistics
+import tempfile
+from xml.etree import ElementTree
+
+from robottelo.config import robottelo_tmp_dir
+from robottelo.logging import logger
+
+DURATIONS_FILE = robottelo_tmp_dir / 'test_durations.json'
+# seconds, for a test without any history to compare with
+DEFAULT_DURATION = 60.0
+
+
+def junit_name(nodeid):
+    """Return the ``classname.name`` of the junit XML test case of ``nodeid``
+
+    e.g. ``tests/foreman/api/test_host.py::TestHost::test_positive_create[rhel9]`` is
+    ``tests.foreman.api.test_host.TestHost.test_positive_create[rhel9]``
+    """
+    path, _, name = nodeid.partition('::')
+    return '.'.join([path.removesuffix('.py').replace('/', '.'), *name.split('::')])
+
+
+def module_of(nodeid):
+    return nodeid.split('::', 1)[0]
+
+
+class DurationHistory:
+    """Durations of the tests in seconds, by node id or junit name"""
+
+    def __init__(self, durations=None):
+        self.durations = dict(durations or {})
+        self._estimates = None
+
+    @classmethod
+    def load(cls, path=DURATIONS_FILE, junit_files=()):
+        """Return the durations of the duration file ``path`` and of the junit XML files"""
+        history = cls()
+        try:
+            history.durations.update(json.loads(Path(path).read_text()))
+        except FileNotFoundError:
+            pass
+        except ValueError as err:
+            logger.warning(f'Ignoring unreadable test durations {path}: {err}')
+        for junit_file in junit_files:
+            history.load_junit(junit_file)
+        return history
+
+    def load_junit(self, path):
+        """Add the durations of the test cases of a junit XML report"""
+        for case in ElementTree.parse(path).iter('testcase'):
+            if case.find('skipped') is None and case.get('time'):
+                name = f'{case.get("classname")}.{case.get("name")}'
+                self.durations[name] = float(case.get('time'))
+        self._estimates = None
+
+    def update(self, durations):
+        self.durations.update(durations)
+        self._estimates = None
+
+    def save(self, path=DURATIONS_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # written aside and renamed, a planned run may read it at any time
+        with tempfile.NamedTemporaryFile('w', dir=path.parent, delete=False) as durations:
+            json.dump(self.durations, durations, indent=1, sort_keys=True)
+        os.replace(durations.name, path)
+
+    @classmethod
+    def merge(cls, durations, path=DURATIONS_FILE):
+        """Merge ``durations`` into the duration file ``path``, keeping the other recorded tests
+
+        Runs finishing at once merge one after the other, each into the file the previous saved.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f'{path}.lock', 'w') as guard:
+            fcntl.flock(guard, fcntl.LOCK_EX)
+            history = cls.load(path)
+            history.update(durations)
+            history.save(path)
+        return history
+
+    def get(self, nodeid):
+        """Return the recorded duration of ``nodeid``, ``None`` if there is none"""
+        duration = self.durations.get(nodeid)
+        return self.durations.get(junit_name(nodeid)) if duration is None else duration
+
+    def _module_estimates(self):
+        if self._estimates is None:
+            modules = defaultdict(list)
+            for name, duration in self.durations.items():
+                # junit names have no module separator, they only count in the median
+                if '::' in name:
+                    modules[module_of(name)].append(duration)
+            self._estimates = {module: statistics.mean(d) for module, d in modules.items()}
+            self._estimates[None] = (
+                statistics.median(self.durations.values()) if self.durations else DEFAULT_DURATION
+            )
+        return self._estimates
+
+    def estimate(self, nodeid):
+        """Return the duration of ``nodeid``, estimated if it has no history"""
+        duration = self.get(nodeid)
+        if duration is None:
+            estimates = self._module_estimates()
+            duration = estimates.get(module_of(nodeid), estimates[None])
+        return duration
@@ -0,0 +1,230 @@
+"""Keep-alive HTTP sessions shared by the nailgun ``ServerConfig`` objects robottelo creates.
+
+``nailgun.client`` sends every API request with the module level ``requests`` functions,
+which open (and TLS handshake) a new connection per request. :func:`install` replaces the
+``requests`` module seen by ``nailgun.client`` with a :class:`SessionRouter`: requests to a
+base URL registered with :func:`register` go through one pooled, retrying
+``requests.Session`` shared by every entity talking to that URL, anything else is sent the
+usual way.
+
+The shared sessions never store cookies, so requests keep authenticating with the
+credentials of their own ``ServerConfig`` exactly like one-shot requests do.
+
+Requests other than GET and HEAD drop the nailgun searches cached for their base URL by
+:mod:`robottelo.utils.read_cache`.
+
+Routed requests are counted per base URL in the current process (so per xdist worker),
+see :func:`stats`.
+"""
+
+import atexit
+from dataclasses import asdict, dataclass
+from http.cookiejar import DefaultCookiePolicy
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from robottelo.utils import read_cache
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (502, 503, 504)
+
+
+def base_url(url):
+    """Return the ``scheme://netloc`` part of ``url`` sessions are shared by"""
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'.lower()
+
+
+def new_session(pool_size=DEFAULT_POOL_SIZE, retries=0, backoff_factor=0):
+    """Return a cookie-less ``requests.Session`` keeping up to ``pool_size`` connections
+
+    :param int retries: how many times idempotent requests are retried after a connection
+        error or a 502, 503 or 504 response. The last response is returned when all retries
+        failed, like it would be without retrying.
+    :param float backoff_factor: see ``urllib3.util.retry.Retry``
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False,
+        ),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def open_connections(session):
+    """Return how many connections the pools of ``session`` opened so far"""
+    count = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        # urllib3's RecentlyUsedContainer is not iterable
+        count += sum(pools[key].num_connections for key in pools.keys())  # noqa: SIM118
+    return count
+
+
+@dataclass
+class HTTPStats:
+    """Counters of the requests sent through one shared session
+
+    ``errors`` counts requests that raised or got an error (4xx or 5xx) response,
+    ``connections`` the connections opened by the session pools, times are in seconds.
+    """
+
+    requests: int = 0
+    errors: int = 0
+    connections: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def mean_time(self):
+        return self.total_time / self.requests if self.requests else 0.0
+
+    def record(self, elapsed, failed=False):
+        self.requests += 1
+        self.errors += failed
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def as_dict(self):
+        return {**asdict(self), 'mean_time': self.mean_time}
+
+
+class SessionRouter:
+    """Drop-in replacement for the ``requests`` functions used by ``nailgun.client``
+
+    Attributes that are not request functions are looked up on the ``requests`` module.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    def register(self, url, **session_kwargs):
+        """Share one pooled session for every request sent to the base URL of ``url``
+
+        :param session_kwargs: passed to :func:`new_session` when the base URL is new
+        """
+        key = base_url(url)
+        with self._lock:
+            if key not in self._sessions:
+                self._sessions[key] = new_session(**session_kwargs)
+                self._stats.setdefault(key, HTTPStats())
+            return self._sessions[key]
+
+    def session_for(self, url):
+        """Return the shared session for ``url`` or ``None`` if its base URL isn't registered"""
+        return self._sessions.get(base_url(url))
+
+    def stats(self):
+        """Return the counters of every registered base URL, as dicts"""
+        with self._lock:
+            for key, session in self._sessions.items():
+                self._stats[key].connections = open_connections(session)
+            return {key: stats.as_dict() for key, stats in self._stats.items()}
+
+    def close_all(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def request(self, method, url, **kwargs):
+        key = base_url(url)
+        try:
+            return self._send(key, method, url, **kwargs)
+        finally:
+            if method.lower() not in ('get', 'head'):
+                read_cache.invalidate('api', key)
+
+    def _send(self, key, method, url, **kwargs):
+        session = self._sessions.get(key)
+        if session is None:
+            return requests.request(method, url, **kwargs)
+        start = time.monotonic()
+        failed = True
+        try:
+            response = session.request(method, url, **kwargs)
+            failed = not response.ok
+            return response
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self._stats[key].record(elapsed, failed)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('head', url, **kwargs)
+
+    def get(self, url, params=None, **kwargs):
+        return self.request('get', url, params=params, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self.request('post', url, data=data, json=json, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request('put', url, data=data, **kwargs)
+
+    def patch(self, url, data=None, **kwargs):
+        return self.request('patch', url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('delete', url, **kwargs)
+
+
+router = SessionRouter()
+atexit.register(router.close_all)
+
+
+def install():
+    """Make ``nailgun.client`` send its requests through :data:`router`"""
+    from nailgun import client
+
+    client.requests = router
+
+
+def register(server_config):
+    """Share a pooled session between all requests sent with ``server_config``
+
+    The session is configured by ``settings.performance.api_pool_size`` (``0`` disables
+    sharing), ``api_retries`` and ``api_retry_backoff``.
+
+    :return: the shared ``requests.Session`` or ``None`` when sharing is disabled
+    """
+    from robottelo.config import settings
+
+    pool_size = settings.performance.get('api_pool_size', DEFAULT_POOL_SIZE)
+    if not pool_size:
+        return None
+    install()
+    return router.register(
+        server_config.url,
+        pool_size=pool_size,
+        retries=settings.performance.get('api_retries', DEFAULT_RETRIES),
+        backoff_factor=settings.performance.get('api_retry_backoff', DEFAULT_BACKOFF_FACTOR),
+    )
+
+
+def stats():
+    """Return the request counters of this process per base URL, see :class:`HTTPStats`"""
+    return router.stats()
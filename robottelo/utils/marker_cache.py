@@ -0,0 +1,150 @@
+"""Persistent cache of the tokens extracted from test docstrings and sources during collection.
+
+``pytest_plugins.metadata_markers`` and ``pytest_plugins.issue_handlers`` run their regexes
+over the docstrings and source of every collected test. With ``performance.marker_cache``
+enabled, or the ``--warm-marker-cache`` pytest option, the extracted tokens are stored per
+test file in :data:`CACHE_FILE`, and collecting an unchanged file reuses them.
+
+A file is unchanged when its modification time and size, or else its sha256 hash, are the
+ones its tokens were extracted from. The whole cache is dropped when the code extracting the
+tokens (:data:`EXTRACTOR_FILES`) changes. Tests whose docstrings or source are not all in their
+own file, e.g. imported from another module, are extracted on every collection.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+import tempfile
+
+import pytest
+
+from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.logging import collection_logger as logger, robottelo_root_dir
+
+CACHE_FORMAT = 1
+CACHE_FILE = robottelo_tmp_dir / 'marker_token_cache.json'
+EXTRACTOR_FILES = (
+    'robottelo/utils/marker_cache.py',
+    'pytest_plugins/metadata_markers.py',
+    'pytest_plugins/issue_handlers.py',
+)
+cache_key = pytest.StashKey()
+
+
+def extractors_hash(root=robottelo_root_dir):
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    for name in EXTRACTOR_FILES:
+        digest.update(Path(root, name).read_bytes())
+    return digest.hexdigest()
+
+
+def file_hash(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def is_cacheable(item):
+    """Tell whether the docstrings and source of ``item`` are all in its own file"""
+    function, cls = item.function, getattr(item, 'cls', None)
+    code = getattr(function, '__code__', None)
+    if code is None or Path(code.co_filename) != item.path:
+        return False
+    if cls is None:
+        return True
+    # inspect.getdoc takes missing docstrings from the base classes
+    return cls.__module__ == item.module.__name__ and all(
+        obj.__doc__ is not None or inspect.getdoc(obj) is None for obj in (function, cls)
+    )
+
+
+class MarkerTokenCache:
+    """Tokens extracted from the test files, see the module documentation
+
+    :param path: cache file
+    :param root: test files are stored relative to it
+    :param fresh: ignore the tokens already in the cache file
+    """
+
+    def __init__(self, path=CACHE_FILE, root=robottelo_root_dir, fresh=False):
+        self.path = Path(path)
+        self.root = Path(root)
+        self.extractors = extractors_hash()
+        self.files = {} if fresh else self._load()
+        self.checked = set()
+        self.changed = False
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except ValueError as err:
+            logger.warning(f'Ignoring unreadable marker token cache {self.path}: {err}')
+            return {}
+        if data.get('extractors') != self.extractors:
+            logger.debug('Marker token extraction changed, ignoring the marker token cache')
+            return {}
+        return data.get('files', {})
+
+    def _file(self, path):
+        """Return the entry of ``path``, emptied if the file changed since it was stored"""
+        path = Path(path)
+        name = str(path.relative_to(self.root)) if path.is_relative_to(self.root) else str(path)
+        entry = self.files.get(name)
+        if name in self.checked:
+            return entry
+        self.checked.add(name)
+        stat = path.stat()
+        if entry and (entry['mtime'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+            return entry
+        sha256 = file_hash(path)
+        if not entry or entry['sha256'] != sha256:
+            entry = self.files[name] = {'sha256': sha256, 'tokens': {}}
+        entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+        self.changed = True
+        return entry
+
+    def tokens(self, path, key, extract, *args):
+        """Return the tokens of ``key`` in the file ``path``
+
+        :param extract: called with ``args`` to extract the tokens when they are not cached,
+            they must be serializable to JSON
+        """
+        entry = self._file(path)
+        if key not in entry['tokens']:
+            entry['tokens'][key] = extract(*args)
+            self.changed = True
+        return entry['tokens'][key]
+
+    def item_tokens(self, item, key, extract):
+        """Return the tokens of ``key`` extracted by ``extract(item)``, cached if possible"""
+        if not is_cacheable(item):
+            return extract(item)
+        # by collecting class, a test inherited in the same file has the docstring of its class
+        cls = getattr(item, 'cls', None)
+        name = f'{cls.__qualname__}.{item.function.__name__}' if cls else item.function.__name__
+        return self.tokens(item.path, f'{key}:{name}', extract, item)
+
+    def save(self):
+        if not self.changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # written aside and renamed, xdist workers may save the cache at once
+        with tempfile.NamedTemporaryFile('w', dir=self.path.parent, delete=False) as cache:
+            json.dump({'extractors': self.extractors, 'files': self.files}, cache)
+        os.replace(cache.name, self.path)
+        self.changed = False
+        logger.debug(f'Saved marker token cache {self.path} of {len(self.files)} files')
+
+
+def get_cache(config):
+    """Return the marker token cache of the pytest run, ``None`` if it is disabled"""
+    if cache_key not in config.stash:
+        warm = config.getoption('warm_marker_cache', False)
+        config.stash[cache_key] = (
+            MarkerTokenCache(fresh=warm)
+            if warm or settings.performance.get('marker_cache', False)
+            else None
+        )
+    return config.stash[cache_key]
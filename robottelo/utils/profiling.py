@@ -0,0 +1,85 @@
+"""Import time parsing and speedscope profiles, used by the startup and collection profilers.
+
+Profiles are written in the speedscope file format (https://www.speedscope.app), which
+speedscope and most flamegraph viewers open. Every profile is a list of ``(kind, frame, at)``
+events, ``kind`` being ``'O'`` when ``frame`` is entered and ``'C'`` when it is left, ``at`` a
+time in microseconds.
+"""
+
+import re
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+
+def parse_importtime(lines):
+    """Parse the ``python -X importtime`` output lines, ignoring any other line
+
+    :return: ``[(module, self microseconds, cumulative microseconds, depth), ...]``, in the
+        order modules finished importing, i.e. nested imports before their importer
+    """
+    records = []
+    for line in lines:
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            module, depth = match.group(4), len(match.group(3)) // 2
+            records.append((module, int(match.group(1)), int(match.group(2)), depth))
+    return records
+
+
+def import_events(records):
+    """Return the events of the imports parsed by :func:`parse_importtime`
+
+    Imports are laid out one after the other from 0, nested imports first in their importer.
+    """
+    pending = {}
+    for module, _, cumulative, depth in records:
+        children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append((module, cumulative, children))
+    events = []
+
+    def add(node, at):
+        module, cumulative, children = node
+        events.append(('O', module, at))
+        end = at
+        for child in children:
+            end = add(child, end)
+        end = max(end, at + cumulative)
+        events.append(('C', module, end))
+        return end
+
+    at = 0
+    for depth in sorted(pending):
+        for node in pending[depth]:
+            at = add(node, at)
+    return events
+
+
+def speedscope(profiles, name='robottelo'):
+    """Return a speedscope file of evented ``profiles``
+
+    :param profiles: mapping of profile names to their events
+    """
+    frames = {}
+    file_profiles = []
+    for profile_name, events in profiles.items():
+        file_profiles.append(
+            {
+                'type': 'evented',
+                'name': profile_name,
+                'unit': 'microseconds',
+                'startValue': events[0][2] if events else 0,
+                'endValue': events[-1][2] if events else 0,
+                'events': [
+                    {'type': kind, 'frame': frames.setdefault(frame, len(frames)), 'at': at}
+                    for kind, frame, at in events
+                ],
+            }
+        )
+    return {
+        '$schema': SPEEDSCOPE_SCHEMA,
+        'name': name,
+        'exporter': 'robottelo',
+        'shared': {'frames': [{'name': frame} for frame in frames]},
+        'profiles': file_profiles,
+    }
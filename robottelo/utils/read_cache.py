@@ -0,0 +1,126 @@
+"""Opt-in read-through cache for read-only hammer commands and nailgun searches.
+
+Enabled with ``settings.performance.read_cache``. Entries expire after
+``performance.read_cache_ttl`` seconds and at most ``performance.read_cache_size`` of them are
+kept, the least recently used going first.
+
+Keys are tuples starting with a namespace, so related entries can be dropped together:
+
+* ``('cli', hostname, resource, user, command, output_format)`` for ``info`` and ``list``
+  hammer commands, dropped by any other hammer command run on the same host for the same
+  resource (first word of ``command_base``, so ``content-view publish`` drops the cached
+  ``content-view version list`` too);
+* ``('api', base url, user, path, fields, query)`` for nailgun searches, dropped by any
+  request other than GET and HEAD sent to the same server.
+
+Cached values are deep copied in and out, callers may modify what they get.
+"""
+
+from collections import OrderedDict
+import copy
+import threading
+import time
+
+MISSING = object()
+# hammer subcommands whose results are cached, any other one drops the cached results
+CACHED_SUBCOMMANDS = frozenset({'info', 'list'})
+# resources whose state changes on the server side, without any client request
+UNCACHED_RESOURCES = frozenset({'task', 'ForemanTask'})
+
+
+class ReadCache:
+    """Thread-safe LRU mapping whose entries expire after ``ttl`` seconds
+
+    :param int maxsize: maximum number of entries
+    :param float ttl: seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expiry, value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def set(self, key, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key, func):
+        """Return the cached value of ``key``, calling ``func()`` to fill it when missing
+
+        Nothing is cached when ``func`` raises.
+        """
+        value = self.get(key)
+        if value is MISSING:
+            value = func()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, *prefix):
+        """Drop the entries whose key starts with ``prefix``, every entry if it is empty"""
+        size = len(prefix)
+        with self._lock:
+            for key in [key for key in self._entries if key[:size] == prefix]:
+                del self._entries[key]
+
+    def clear(self):
+        self.invalidate()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide :class:`ReadCache`, or ``None`` when it is not enabled"""
+    global _cache
+    from robottelo.config import settings
+
+    if settings.performance.get('read_cache') is not True:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReadCache(
+                    maxsize=settings.performance.get('read_cache_size', 1024),
+                    ttl=settings.performance.get('read_cache_ttl', 30),
+                )
+    return _cache
+
+
+def hammer_command(command):
+    """Return the resource (first word) and the subcommand of a hammer ``command``"""
+    words = command.split(' -', 1)[0].split()
+    if not words:
+        return None, None
+    return words[0], words[-1]
+
+
+def is_cached_command(resource, command_sub):
+    return command_sub in CACHED_SUBCOMMANDS and resource not in UNCACHED_RESOURCES
+
+
+def invalidate(*prefix):
+    """Drop cached entries whose key starts with ``prefix``, if the cache is enabled"""
+    if _cache is not None:
+        _cache.invalidate(*prefix)
@@ -0,0 +1,124 @@
+"""Simulation of the scheduling of tests across xdist workers.
+
+Tests are described by their work unit and the module and session scoped fixtures they need,
+see ``pytest_plugins.xdist_scheduling``. Work units are scheduled longest first on the worker
+finishing first, which with fixture affinity prefers a unit needing session scoped fixtures
+it already built, like ``DurationScheduling`` does.
+"""
+
+from collections import defaultdict
+import heapq
+
+
+def shared_fixtures(tests):
+    """Return the fixtures needed by every test, built by every worker anyway"""
+    fixture_sets = [set(test['module']) | set(test['session']) for test in tests.values()]
+    return set.intersection(*fixture_sets) if fixture_sets else set()
+
+
+def group_units(tests, history):
+    """Return the work units of ``tests``, longest first
+
+    :param tests: mapping of node ids to their ``unit``, ``module`` and ``session`` fixtures
+    :param history: :class:`robottelo.utils.durations.DurationHistory`
+    :return: ``[(unit, duration, session fixtures), ...]``
+    """
+    ignored = shared_fixtures(tests)
+    durations = defaultdict(float)
+    fixtures = defaultdict(set)
+    for nodeid, test in tests.items():
+        durations[test['unit']] += history.estimate(nodeid)
+        fixtures[test['unit']].update(set(test['session']) - ignored)
+    return sorted(
+        ((unit, duration, frozenset(fixtures[unit])) for unit, duration in durations.items()),
+        key=lambda unit: -unit[1],
+    )
+
+
+def pick_unit(units, built, affinity=True):
+    """Return the index of the unit of ``units`` a worker having ``built`` fixtures takes
+
+    The longest unit, or with ``affinity`` the longest unit needing session fixtures all
+    already built if there is one.
+    """
+    if affinity:
+        for index, (_, _, fixtures) in enumerate(units):
+            if fixtures and fixtures <= built:
+                return index
+    return 0
+
+
+def simulate(units, workers, affinity=False):
+    """Schedule ``units`` on ``workers`` workers, see the module documentation
+
+    :param units: ``[(unit, duration, session fixtures), ...]`` longest first
+    :return: ``[(busy seconds, set of session fixtures built), ...]`` of every worker
+    """
+    units = list(units)
+    loads = [[0.0, set()] for _ in range(workers)]
+    # the worker finishing first takes the next unit, ties to the first worker
+    finish = [(0.0, worker) for worker in range(workers)]
+    while units:
+        time, worker = heapq.heappop(finish)
+        _, duration, fixtures = units.pop(pick_unit(units, loads[worker][1], affinity))
+        loads[worker][0] += duration
+        loads[worker][1] |= fixtures
+        heapq.heappush(finish, (time + duration, worker))
+    return [tuple(load) for load in loads]
+
+
+def scattered_instantiations(tests_needing, workers):
+    """Return the expected instantiations of a fixture needed by tests spread over workers"""
+    return workers * (1 - (1 - 1 / workers) ** tests_needing)
+
+
+def affinity_report(tests, history, workers):
+    """Estimate the module and session scoped fixtures built with and without fixture affinity
+
+    Without it, tests are assumed spread at random across the workers; with it, tests sharing
+    module scoped fixtures run in their module's work unit on one worker and work units are
+    scheduled with :func:`simulate`. Fixtures needed by every test are left out.
+    """
+    ignored = shared_fixtures(tests)
+    module_needs = defaultdict(int)
+    session_needs = defaultdict(int)
+    for nodeid, test in tests.items():
+        module = nodeid.split('::', 1)[0]
+        for fixture in set(test['module']) - ignored:
+            module_needs[(module, fixture)] += 1
+        for fixture in set(test['session']) - ignored:
+            session_needs[fixture] += 1
+    scattered = sum(
+        scattered_instantiations(needs, workers)
+        for needs in [*module_needs.values(), *session_needs.values()]
+    )
+    loads = simulate(group_units(tests, history), workers, affinity=True)
+    grouped = len(module_needs) + sum(len(fixtures) for _, fixtures in loads)
+    return {
+        'workers': workers,
+        'tests': len(tests),
+        'fixtures': len(module_needs) + len(session_needs),
+        'scattered_instantiations': round(scattered, 1),
+        'grouped_instantiations': grouped,
+        'saved_instantiations': round(scattered - grouped, 1),
+    }
+
+
+def wall_time(units, workers):
+    """Return the estimated seconds ``units`` take on ``workers`` workers"""
+    return max(busy for busy, _ in simulate(units, workers))
+
+
+def recommend_workers(units, max_workers, tolerance=0.1):
+    """Return the fewest workers running ``units`` within ``tolerance`` of ``max_workers``
+
+    More workers stop paying off once the longest work units make most of the wall time.
+    """
+    if not units:
+        return 1
+    best = wall_time(units, max_workers)
+    return next(
+        workers
+        for workers in range(1, max_workers + 1)
+        if wall_time(units, workers) <= best * (1 + tolerance)
+    )
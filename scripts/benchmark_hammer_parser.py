@@ -0,0 +1,281 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""Benchmark the hammer output parsers of robottelo.cli.hammer_parser.
+
+Usage: python scripts/benchmark_hammer_parser.py [--rows 10000] [--repeat 5]
+
+The sample outputs of tests/robottelo/data/hammer are scaled up to ``--rows`` csv rows and
+info entries, parsed by the current parsers and by the line by line parsers they replaced
+(kept below as reference), and the script fails if any result differs.
+"""
+
+import argparse
+import csv
+from functools import partial
+import json
+from pathlib import Path
+import re
+import timeit
+
+from robottelo.cli import hammer_parser
+from robottelo.logging import logger
+
+DATA_DIR = Path(__file__).parent.parent / 'tests' / 'robottelo' / 'data' / 'hammer'
+
+
+# Reference implementation: the parsers of robottelo.cli.hammer before hammer_parser.
+
+
+def _normalize(header):
+    """Replace empty spaces with '-' and lower all chars"""
+    return header.replace(' ', '-').lower()
+
+
+def parse_json(stdout):
+    """Parse JSON output from Hammer CLI and convert it to python dictionary
+    while normalizing keys.
+    """
+    new_object_index = stdout.find('\n}\n{')
+    if new_object_index > -1:
+        stdout = stdout[new_object_index + 3 :]  # noqa: E203
+    parsed = json.loads(stdout)
+    return _normalize_obj(parsed)
+
+
+def _normalize_obj(obj):
+    """Normalize all dict's keys replacing empty spaces with "-" and lowering
+    chars
+    """
+    if isinstance(obj, dict):
+        return {_normalize(k): _normalize_obj(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_normalize_obj(v) for v in obj]
+    # doing this to conform to csv parser
+    if isinstance(obj, int) and not isinstance(obj, bool):
+        return str(obj)
+    return obj
+
+
+def parse_csv(output):
+    """Parse CSV output from Hammer CLI and return a Python dictionary."""
+    output = output.splitlines()
+
+    # Normalize the column names to use when generating the dictionary
+    try:
+        keys = [_normalize(header) for header in next(csv.reader(output))]
+        return [value for value in csv.DictReader(output[1:], fieldnames=keys)]
+    except csv.Error as err:
+        logger.error(f'Exception while parsing CSV output {output}: {err}')
+        raise
+
+
+def get_line_indentation_spaces(line, tab_spaces=4):
+    """Return the number of spaces chars the line begin with
+
+    :param str line: the line string to parse
+    :param int tab_spaces: The tab char is represent how many spaces
+    """
+    if not line or len(line) < tab_spaces:
+        return 0
+    spaces = 0
+    for char in line:
+        if char not in (' ', '\t'):
+            break
+        if char == '\t':
+            spaces += tab_spaces
+        else:
+            spaces += 1
+
+    return spaces
+
+
+def get_line_indentation_level(line, tab_spaces=4, indentation_spaces=4):
+    """Return the indentation level
+
+    :param str line: the line string to parse
+    :param int tab_spaces: The tab char is represent how many spaces
+    :param indentation_spaces: how much spaces represent an indentation level
+
+    Note::
+
+        suppose we have the following lines:
+        '''
+        level 0
+            level 1
+                level 2
+        '''
+        assert get_line_indentation_level('level 0') == 0
+        assert get_line_indentation_level('    level 1') == 1
+        assert get_line_indentation_level('        level 2') == 2
+
+    """
+    spaces = get_line_indentation_spaces(line, tab_spaces=tab_spaces)
+    return spaces // indentation_spaces + (1 if spaces % indentation_spaces > 0 else 0)
+
+
+def parse_info(output):
+    """Parse the info output and returns a dict mapping the values."""
+    # info dictionary
+    contents = {}
+    sub_prop = None  # stores name of the last group of sub-properties
+    sub_num = None  # is not None when list of properties
+    second_level_key = None  # is set when a possible second level is detected
+
+    for line in output.splitlines():
+        # skip empty lines and dividers
+        if line == '' or line == '---':
+            continue
+        current_indent_level = get_line_indentation_level(line)
+        if current_indent_level <= 1:
+            # we are entering or leaving a second level from lower/upper levels
+            # clear the second level key
+            second_level_key = None
+        if line.startswith(' '):  # sub-properties are indented
+            # values are separated by ':' or '=>', but not by '::' which can be
+            # entity name like 'test::params::keys'
+            if line.find(':') != -1 and line.find('::') == -1:
+                key, value = line.lstrip().split(":", 1)
+            elif line.find('=>') != -1 and len(line.lstrip().split(" =>", 1)) == 2:
+                key, value = line.lstrip().split(" =>", 1)
+            else:
+                key = value = None
+
+            if key is None and value is None:
+                # Parse single attribute collection properties
+                # Template
+                #  1) template1
+                #  2) template2
+                #
+                # or
+                # Template
+                #  template1
+                #  template2
+                match = re.match(r'\d+\)\s+(.+)$', line.lstrip())
+
+                if match is None:
+                    match = re.match(r'(.*)$', line.lstrip())
+
+                value = match.group(1)
+
+                # adding list to 1 level, for example:
+                # {'template': ['template1', 'template2']}
+                if isinstance(contents[sub_prop], dict) and not contents[sub_prop]:
+                    contents[sub_prop] = []
+                    contents[sub_prop].append(value)
+                elif isinstance(contents[sub_prop], list):
+                    contents[sub_prop].append(value)
+                else:
+                    # adding list to 2 level, for example:
+                    # {'subscription-information':
+                    #      {'registered-by-activation-keys': ['ak1', 'ak2']}
+                    #  }
+                    last_key = list(contents[sub_prop].keys())[-1]
+                    if not contents[sub_prop][last_key]:
+                        contents[sub_prop][last_key] = [value]
+                    else:
+                        contents[sub_prop][last_key].append(value)
+            else:
+                # some properties have many numbered values
+                # Example:
+                # Content:
+                #  1) Repo Name: repo1
+                #     URL:       /custom/4f84fc90-9ffa-...
+                #  2) Repo Name: puppet1
+                #     URL:       /custom/4f84fc90-9ffa-...
+                starts_with_number = re.match(r'(\d+)\)', key)
+                if starts_with_number:
+                    # if this is a numbered list on level 2, do nothing - this script doesn't support it
+                    if current_indent_level >= 2:
+                        continue
+                    sub_num = int(starts_with_number.group(1))
+                    # no. 1) we need to change dict() to list()
+                    if sub_num == 1:
+                        contents[sub_prop] = []
+                    # remove number from key
+                    key = re.sub(r'\d+\)', '', key)
+                    # append empty dict to array
+                    contents[sub_prop].append({})
+
+                key = key.lstrip().replace(' ', '-').lower()
+                value = value.lstrip()
+                # add value to dictionary
+                if sub_num is not None:
+                    contents[sub_prop][-1][key] = value
+                else:
+                    # a third level is always represented as a dictionary and
+                    # we need to detect if we are at third level
+                    # example:
+                    # Content Information:
+                    #     Content View:
+                    #         ID:   10
+                    #         Name: Default Organization View
+                    # the "ID" and "Name" are located at third indent level
+                    # "content view" is located at second indent level
+                    if current_indent_level == 2 and second_level_key:
+                        # we are at third level indentation
+                        if not contents[sub_prop][second_level_key]:
+                            contents[sub_prop][second_level_key] = {}
+                        contents[sub_prop][second_level_key][key] = value
+                    else:
+                        contents[sub_prop][key] = value
+                    if current_indent_level == 1 and not value:
+                        # always set the last possible second level key
+                        # that can form a third level
+                        second_level_key = key
+        else:
+            sub_num = None  # new property implies no sub property
+            key, value = line.lstrip().split(":", 1)
+            key = key.lstrip().replace(' ', '-').lower()
+            if value.lstrip() == '':  # 'key:' no value, new sub-property
+                sub_prop = key
+                contents[sub_prop] = {}
+            else:  # 'key: value' line
+                contents[key] = value.lstrip()
+
+    return contents
+
+
+REFERENCE_PARSERS = {'.csv': parse_csv, '.json': parse_json, '.txt': parse_info}
+CURRENT_PARSERS = {
+    '.csv': hammer_parser.parse_csv,
+    '.json': hammer_parser.parse_json,
+    '.txt': hammer_parser.parse_info,
+}
+
+
+def scale(path, rows):
+    """Return the content of the sample output ``path`` grown to about ``rows`` entries"""
+    output = path.read_text()
+    if path.suffix == '.csv':
+        header, *lines = output.splitlines()
+        return '\n'.join([header, *(lines[i % len(lines)] for i in range(rows))])
+    if path.suffix == '.json':
+        items = json.loads(output)
+        return json.dumps([items] * (rows // 100 or 1), indent=2)
+    # info outputs: a numbered list of properties with one entry per row
+    entries = ''.join(
+        f' {i}) Id:   {i}\n    Name: entry {i}\n    Path: /content/{i}\n'
+        for i in range(1, rows + 1)
+    )
+    return f'{output}Entries:\n{entries}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(f'{"sample":<24}{"reference (s)":>16}{"current (s)":>16}{"speedup":>10}')
+    for path in sorted(DATA_DIR.iterdir()):
+        output = scale(path, args.rows)
+        reference, current = REFERENCE_PARSERS[path.suffix], CURRENT_PARSERS[path.suffix]
+        if reference(output) != current(output):
+            raise SystemExit(f'{path.name}: parsers results differ')
+        ref_time = min(timeit.repeat(partial(reference, output), number=1, repeat=args.repeat))
+        cur_time = min(timeit.repeat(partial(current, output), number=1, repeat=args.repeat))
+        print(f'{path.name:<24}{ref_time:>16.4f}{cur_time:>16.4f}{ref_time / cur_time:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,40 @@
 """Generate hammer command tree in json format by inspecting every command's
 help.
 
+The tree is also compiled into the hammer schema of the Satellite version, used to validate
+hammer options locally, see :mod:`robottelo.cli.schema`. Help pages are cached in
+``robottelo.tmp_dir``, see :mod:`robottelo.cli.command_tree`.
+
 """
 
-import json
+import argparse
+from pathlib import Path
 
-from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import command_tree, schema
 from robottelo.config import settings
 
 
-def generate_command_tree(command):
-    """Recursively walk through the hammer commands and subcommands and fetch
-    their help. Return a dictionary with the contents.
-    """
-    output = ssh.command(f'{command} --help', hostname=settings.server.hostnames[0]).stdout
-    contents = hammer.parse_help(output)
-    if len(contents['subcommands']) > 0:
-        for subcommand in contents['subcommands']:
-            subcommand.update(generate_command_tree('{} {}'.format(command, subcommand['name'])))
-    return contents
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default='hammer_commands.json', help='tree json file')
+    parser.add_argument('--workers', type=int, default=4, help='help pages fetched at once')
+    parser.add_argument('--full', action='store_true', help='ignore cached help pages')
+    args = parser.parse_args()
+
+    version = str(settings.server.version.release)
+    cache = command_tree.HelpCache(Path(settings.robottelo.tmp_dir, 'hammer_help_cache.json'))
+    tree = command_tree.generate_command_tree(
+        hostname=settings.server.hostnames[0],
+        version=version,
+        cache=cache,
+        incremental=not args.full,
+        workers=args.workers,
+    )
+    cache.save()
+    Path(args.output).write_text(command_tree.dumps_tree(tree))
+    schema.write_schema(tree, version)
+    print(f'Hammer schema of Satellite {version} written to {schema.schema_path(version)}')
 
 
-# Generate the json file in the working directory
-with open('hammer_commands.json', 'w') as f:
-    f.write(json.dumps(generate_command_tree('hammer'), indent=2, sort_keys=True))
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Profile the import and collection of the test suite.
+
+Usage: python scripts/profile_collection.py [--output-dir collection_profile] [--sort self]
+    [--top 20] [pytest arguments, tests/foreman by default]
+
+The tests are collected with ``python -X importtime -m pytest --collect-only`` and the
+``--profile-collection`` option of :mod:`pytest_plugins.collection_profiler`. The output
+directory gets:
+
+* ``report.csv``: the import time of every module, the collection time of every test module
+  and the time every plugin spent in the collection hooks, to sort as needed
+* ``profile.speedscope.json``: the imports and the collection as flamegraphs, to open in
+  https://www.speedscope.app
+* ``collection.json``: what the pytest option recorded
+
+The entries taking the longest are also listed.
+"""
+
+import argparse
+import csv
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+from robottelo.utils.profiling import import_events, parse_importtime, speedscope
+
+REPORT_FIELDS = ('kind', 'name', 'calls', 'self_seconds', 'cumulative_seconds')
+
+
+def collect(pytest_args, output_dir):
+    """Collect the tests and return the import time records and the collection profile"""
+    collection_path = output_dir / 'collection.json'
+    collection_path.unlink(missing_ok=True)
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-X',
+            'importtime',
+            '-m',
+            'pytest',
+            '--collect-only',
+            '-q',
+            # importtime writes to stderr, pytest must not capture it
+            '-s',
+            f'--profile-collection={collection_path}',
+            *pytest_args,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if not collection_path.exists():
+        sys.exit(f'Collecting the tests failed:\n{result.stdout}\n{result.stderr}')
+    return parse_importtime(result.stderr.splitlines()), json.loads(collection_path.read_text())
+
+
+def report_rows(imports, collection):
+    for name, self_us, cumulative_us, _ in imports:
+        yield 'import', name, 1, self_us / 1e6, cumulative_us / 1e6
+    for module in collection['modules']:
+        yield 'collect', module['module'], 1, module['seconds'], module['seconds']
+    for hook in collection['hooks']:
+        name = f'{hook["plugin"]}:{hook["hook"]}'
+        yield 'hook', name, hook['calls'], hook['seconds'], hook['seconds']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output-dir', type=Path, default=Path('collection_profile'))
+    parser.add_argument('--sort', choices=('self', 'cumulative'), default='self')
+    parser.add_argument('--top', type=int, default=20, help='number of entries listed')
+    args, pytest_args = parser.parse_known_args()
+    args.output_dir.mkdir(exist_ok=True)
+    imports, collection = collect(pytest_args or ['tests/foreman'], args.output_dir)
+
+    rows = sorted(
+        report_rows(imports, collection),
+        key=lambda row: row[3 if args.sort == 'self' else 4],
+        reverse=True,
+    )
+    with args.output_dir.joinpath('report.csv').open('w', newline='') as report:
+        writer = csv.writer(report)
+        writer.writerow(REPORT_FIELDS)
+        writer.writerows((*row[:3], f'{row[3]:.6f}', f'{row[4]:.6f}') for row in rows)
+    args.output_dir.joinpath('profile.speedscope.json').write_text(
+        json.dumps(
+            speedscope(
+                {'imports': import_events(imports), 'collection': collection['events']},
+                name='robottelo collection',
+            )
+        )
+    )
+
+    for kind, title in (('import', 'imports'), ('collect', 'test modules'), ('hook', 'hooks')):
+        print(f'\nTop {args.top} {title} by {args.sort} time:')
+        for row in [row for row in rows if row[0] == kind][: args.top]:
+            seconds = row[3 if args.sort == 'self' else 4]
+            print(f'{seconds:10.3f}s  {row[2]:6}  {row[1]}')
+    print(f'\nReport and profiles written to {args.output_dir}')
+
+
+if __name__ == '__main__':
+    main()
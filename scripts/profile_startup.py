@@ -0,0 +1,87 @@
+"""Report where the import time of robottelo modules goes.
+
+Usage: python scripts/profile_startup.py [--top 20] [--repeat N] [module ...]
+
+Every module (``robottelo.config`` by default) is imported in a fresh interpreter with
+``python -X importtime``, the modules and top level packages taking the longest to import
+are then listed, by self and cumulative time.
+
+With ``--repeat``, every module is instead imported N times and the median wall and import
+times are reported, to benchmark an import time change, e.g. ``--repeat 20 robottelo.hosts``
+before and after it.
+"""
+
+import argparse
+from collections import Counter
+import statistics
+import subprocess
+import sys
+import time
+
+from robottelo.utils.profiling import parse_importtime
+
+
+def import_times(module):
+    """Import ``module`` in a new interpreter and return its wall time and import times
+
+    :return: ``(seconds, [(module, self microseconds, cumulative microseconds), ...])``
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode:
+        sys.exit(f'Importing {module} failed:\n{result.stderr}')
+    records = parse_importtime(result.stderr.splitlines())
+    return elapsed, [(name, self_us, cumulative_us) for name, self_us, cumulative_us, _ in records]
+
+
+def report(module, top):
+    elapsed, times = import_times(module)
+    packages = Counter()
+    for name, self_us, _ in times:
+        packages[name.split('.')[0]] += self_us
+    print(f'{module}: {elapsed:.2f}s wall time, {len(times)} modules imported')
+    print(f'\nTop {top} packages by self time:')
+    for name, self_us in packages.most_common(top):
+        print(f'{self_us / 1e6:10.3f}s  {name}')
+    print(f'\nTop {top} modules by self time:')
+    for name, self_us, _ in sorted(times, key=lambda item: -item[1])[:top]:
+        print(f'{self_us / 1e6:10.3f}s  {name}')
+    print(f'\nTop {top} modules by cumulative time:')
+    for name, _, cumulative_us in sorted(times, key=lambda item: -item[2])[:top]:
+        print(f'{cumulative_us / 1e6:10.3f}s  {name}')
+
+
+def benchmark(module, repeat):
+    walls, cumulatives = [], []
+    for _ in range(repeat):
+        elapsed, times = import_times(module)
+        walls.append(elapsed)
+        cumulatives.append(next(cum for name, _, cum in times if name == module))
+    print(
+        f'{module}: median of {repeat} imports, '
+        f'{statistics.median(walls):.3f}s wall time, '
+        f'{statistics.median(cumulatives) / 1e6:.3f}s import time'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=['robottelo.config'])
+    parser.add_argument('--top', type=int, default=20, help='number of entries listed')
+    parser.add_argument('--repeat', type=int, help='benchmark the median of N imports')
+    args = parser.parse_args()
+    for module in args.modules:
+        if args.repeat:
+            benchmark(module, args.repeat)
+            continue
+        report(module, args.top)
+        print()
+
+
+if __name__ == '__main__':
+    main()
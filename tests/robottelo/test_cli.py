@@ -1,10 +1,18 @@
 from functools import partial
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import tempfile
 import unittest
 from unittest import mock
 
 import pytest
 
+from robottelo.cli import batch, hammer, hammer_shell
 from robottelo.cli.base import Base
+from robottelo.cli.contentview import ContentView
+from robottelo.cli.model import Model
 from robottelo.exceptions import (
     CLIBaseError,
     CLIDataBaseError,
@@ -12,6 +20,20 @@ from robottelo.exceptions import (
     CLIReturnCodeError,
 )
 
+# the json create output and the info output of the same hardware model
+MODEL_JSON = """{
+  "Id": 1,
+  "Name": "foo",
+  "Vendor class": "Dell",
+  "HW model": "R720"
+}
+"""
+MODEL_INFO = """Id:           1
+Name:         foo
+Vendor class: Dell
+HW model:     R720
+"""
+
 
 class CLIClass(Base):
     """Class used for the username and password lookup tests"""
@@ -204,6 +226,66 @@ class BaseCliTestCase(unittest.TestCase):
         execute.assert_called_once_with(construct.return_value, output_format='csv', timeout=None)
         info.assert_called_once_with({'id': 'foo', 'organization-id': 'org-id'})
 
+    @mock.patch('robottelo.cli.base.JSON_CREATE_ENTITIES', {'model'})
+    @mock.patch.object(Model, 'command_requires_org', False)
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.model.Model.info')
+    @mock.patch('robottelo.cli.model.Model.execute')
+    @mock.patch('robottelo.cli.model.Model._construct_command')
+    def test_create_with_json_output(self, construct, execute, info, settings):
+        """Check json create result is returned without the info round trip, shaped like info"""
+        settings.performance.get.return_value = True
+        execute.return_value = hammer.parse_json(MODEL_JSON)
+        assert Model.create({'name': 'foo'}) == hammer.parse_info(MODEL_INFO)
+        execute.assert_called_once_with(construct.return_value, output_format='json', timeout=None)
+        assert not info.called
+
+    @mock.patch.object(Model, 'command_requires_org', False)
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.model.Model.info')
+    @mock.patch('robottelo.cli.model.Model.execute')
+    @mock.patch('robottelo.cli.model.Model._construct_command')
+    def test_create_json_output_not_checked(self, construct, execute, info, settings):
+        """Check entities missing from JSON_CREATE_ENTITIES keep the csv output and info"""
+        settings.performance.get.return_value = True
+        execute.return_value = [{'message': 'Hardware model created.', 'id': '1', 'name': 'foo'}]
+        info.return_value = hammer.parse_info(MODEL_INFO)
+        assert Model.create({'name': 'foo'}) == info.return_value
+        execute.assert_called_once_with(construct.return_value, output_format='csv', timeout=None)
+
+    @mock.patch('robottelo.cli.base.JSON_CREATE_ENTITIES', {'model'})
+    @mock.patch.object(Model, 'command_requires_org', False)
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.model.Model.info')
+    @mock.patch('robottelo.cli.model.Model.execute')
+    @mock.patch('robottelo.cli.model.Model._construct_command')
+    def test_create_with_incomplete_json_output(self, construct, execute, info, settings):
+        """Check info is fetched when the json create output lacks required fields or nests"""
+        settings.performance.get.return_value = True
+        info.return_value = hammer.parse_info(MODEL_INFO)
+        for output in (
+            {'message': 'Created.', 'id': '1'},
+            {'id': '1', 'name': 'foo', 'locations': [{'id': '2', 'name': 'loc'}]},
+        ):
+            execute.return_value = output
+            assert Model.create({'name': 'foo'}) == info.return_value
+            info.assert_called_with({'id': '1'})
+
+    @mock.patch('robottelo.cli.base.JSON_CREATE_ENTITIES', {'content-view'})
+    @mock.patch.object(ContentView, 'command_requires_org', False)
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.contentview.ContentView.info')
+    @mock.patch('robottelo.cli.contentview.ContentView.execute')
+    @mock.patch('robottelo.cli.contentview.ContentView._construct_command')
+    def test_create_with_json_stub_output(self, construct, execute, info, settings):
+        """Check info is fetched when the json create output is the message, id and name stub"""
+        settings.performance.get.return_value = True
+        execute.return_value = {'message': 'Content view created.', 'id': '1', 'name': 'foo'}
+        info.return_value = {'id': '1', 'name': 'foo', 'label': 'foo', 'organization': 'org'}
+        assert info.return_value == ContentView.create({'organization-id': '1'})
+        execute.assert_called_once_with(construct.return_value, output_format='json', timeout=None)
+        info.assert_called_once_with({'id': '1'})
+
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
     def test_add_create_with_result_dct_id_required_org_error(self, construct, execute):
@@ -285,6 +367,49 @@ class BaseCliTestCase(unittest.TestCase):
         handle_resp.assert_called_once_with(command.return_value, ignore_stderr=None)
         assert response is handle_resp.return_value
 
+    @mock.patch('robottelo.cli.base.hammer_shell.execute')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_with_hammer_shell(self, settings, command, shell_execute):
+        """Check execute uses the long-lived hammer process when enabled"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.performance.get.return_value = True
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        shell_execute.return_value = mock.Mock(status=0, stdout='out', stderr='')
+        response = Base.execute('some_cmd', hostname='sat.example.com')
+        shell_execute.assert_called_once_with(
+            '-v -u admin -p password  some_cmd',
+            'sat.example.com',
+            user='admin',
+            password='password',
+            env={'LANG': 'en_US'},
+            timeout=None,
+        )
+        command.assert_not_called()
+        assert response == 'out'
+
+    @mock.patch('robottelo.cli.base.hammer_shell.execute')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_hammer_shell_fallback(self, settings, command, shell_execute):
+        """Check execute falls back to one-shot hammer when the shell can't be used"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.performance.get.return_value = True
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        shell_execute.return_value = None
+        response = Base.execute('some_cmd', return_raw_response=True)
+        command.assert_called_once_with(
+            'LANG=en_US  hammer -v -u admin -p password  some_cmd',
+            hostname=mock.ANY,
+            output_format=None,
+            timeout=None,
+        )
+        assert response is command.return_value
+
     @mock.patch('robottelo.cli.base.Base.list')
     def test_exists_without_option_and_empty_return(self, lst_method):
         """Check exists method without options and empty return"""
@@ -387,6 +512,52 @@ class BaseCliTestCase(unittest.TestCase):
             options={'organization-id': 1},
         )
 
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_iter_list_pages(self, construct, execute):
+        """Check iter_list fetches pages until a page is not full"""
+        execute.side_effect = [[{'id': '1'}, {'id': '2'}], [{'id': '3'}]]
+        rows = Base.iter_list({'organization-id': 1, 'per-page': 10000}, per_page=2)
+        assert execute.call_count == 0  # nothing is fetched before iterating
+        assert [row['id'] for row in rows] == ['1', '2', '3']
+        assert Base.command_sub == 'list'
+        assert construct.call_args_list == [
+            mock.call({'organization-id': 1, 'page': 1, 'per-page': 2}),
+            mock.call({'organization-id': 1, 'page': 2, 'per-page': 2}),
+        ]
+        execute.assert_called_with(construct.return_value, output_format='csv')
+
+    @mock.patch.object(Base, 'command_requires_org', False)
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_iter_list_until(self, construct, execute):
+        """Check iter_list stops fetching once the predicate matched"""
+        execute.side_effect = [[{'id': '1'}, {'id': '2'}], [{'id': '3'}, {'id': '4'}]]
+        rows = list(Base.iter_list(per_page=2, until=lambda row: row['id'] == '2'))
+        assert rows == [{'id': '1'}, {'id': '2'}]
+        assert execute.call_count == 1
+
+    @mock.patch.object(Base, 'command_requires_org', False)
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_iter_list_prefetch(self, construct, execute):
+        """Check iter_list with prefetch yields the same rows"""
+        execute.side_effect = [[{'id': '1'}, {'id': '2'}], [{'id': '3'}, {'id': '4'}], {}]
+        rows = list(Base.iter_list(per_page=2, prefetch=True))
+        assert [row['id'] for row in rows] == ['1', '2', '3', '4']
+        assert execute.call_count == 3
+        assert construct.call_args_list[-1] == mock.call({'page': 3, 'per-page': 2})
+
+    @mock.patch.object(Base, 'command_requires_org', True)
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_iter_list_required_org(self, execute):
+        """Check iter_list requires organization-id like info does, before any page"""
+        with pytest.raises(CLIError, match='organization-id option is required'):
+            next(Base.iter_list())
+        assert not execute.called
+        execute.return_value = []
+        assert list(Base.iter_list({'organization-id': 1})) == []
+
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
     def test_puppet_classes(self, construct, execute):
@@ -488,3 +659,145 @@ class CLIBaseErrorTestCase(unittest.TestCase):
         """Check if message is exposed to assertRaisesRegex"""
         with pytest.raises(CLIBaseError, match='msg'):
             raise CLIBaseError(1, 'stderr', 'msg')
+
+
+class HammerShellTestCase(unittest.TestCase):
+    """Tests for the long-lived hammer execution helpers"""
+
+    def test_split_command(self):
+        """Quoted values are kept together like the remote shell would"""
+        assert hammer_shell.split_command(
+            '-v -u admin --output=csv organization create --name="my org; x"'
+        ) == ['-v', '-u', 'admin', '--output=csv', 'organization', 'create', '--name=my org; x']
+
+    def test_split_command_needs_shell(self):
+        """Commands relying on shell features are not split"""
+        for command in (
+            'host list --search="name=$HOSTNAME"',
+            'host list | grep foo',
+            'host list > /tmp/out',
+            'host list --search="`hostname`"',
+            'host list --search="unbalanced',
+        ):
+            assert hammer_shell.split_command(command) is None
+
+    @unittest.skipUnless(shutil.which('ruby'), 'needs ruby to run the hammer shell driver')
+    def test_driver_commands_are_isolated(self):
+        """Options and environment of a command do not carry over to the next one"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(tmp_dir, 'hammer').write_text('')
+            Path(tmp_dir, 'fake_hammer.rb').write_text(FAKE_HAMMER)
+            driver = subprocess.Popen(
+                ['ruby', '-e', hammer_shell.DRIVER],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                env={**os.environ, 'RUBYOPT': f'-r{tmp_dir}/fake_hammer.rb'},
+            )
+            shell = hammer_shell.HammerShell('example.com', timeout=10000)
+            shell._client = mock.Mock()
+            shell._channel = PipeChannel(driver)
+            try:
+                assert shell._read_frame() == {'status': hammer_shell.READY_STATUS}
+                result = shell.run(['--output=csv', 'host', 'list'], env={'HAMMER_SHELL_TEST': '1'})
+                assert result.stdout == 'adapter=csv HAMMER_SHELL_TEST=1\n'
+                result = shell.run(['host', 'info', '--id=1'])
+                assert (result.status, result.stdout) == (0, 'adapter=base HAMMER_SHELL_TEST=\n')
+            finally:
+                driver.stdin.close()
+                driver.wait(timeout=10)
+
+
+# stands in for hammer_cli, storing the --output option in the context like hammer does
+FAKE_HAMMER = """
+module Gem
+  def self.bin_path(*)
+    File.join(__dir__, 'hammer')
+  end
+end
+
+module HammerCLI
+  def self.context
+    @context ||= {api_connection: Object.new, defaults: {}, adapter: :base}
+  end
+
+  class MainCommand
+    def self.run(name, args, context)
+      args.grep(/^--output=/) { |arg| context[:adapter] = arg.split('=', 2).last.to_sym }
+      puts "adapter=#{context[:adapter]} HAMMER_SHELL_TEST=#{ENV['HAMMER_SHELL_TEST']}"
+      0
+    end
+  end
+end
+"""
+
+
+class PipeChannel:
+    """The channel of a local hammer shell driver process, read like an ssh channel"""
+
+    def __init__(self, process):
+        self.process = process
+
+    def write(self, data):
+        self.process.stdin.write(data)
+        self.process.stdin.flush()
+
+    def read(self):
+        data = os.read(self.process.stdout.fileno(), 4096)
+        return len(data), data
+
+
+class HammerBatchTestCase(unittest.TestCase):
+    """Tests for the batched hammer execution"""
+
+    @staticmethod
+    def batch_output(*commands):
+        marker = batch.BATCH_MARKER
+        return ''.join(
+            f'\n{marker}-OUT {index}@@\n{stdout}\n{marker}-ERR {index}@@\n{stderr}'
+            f'\n{marker}-RC {index} {status}@@\n'
+            for index, (stdout, stderr, status) in enumerate(commands)
+        )
+
+    @mock.patch('robottelo.cli.batch.ssh.command')
+    def test_batch_results(self, command):
+        """Each queued command gets its own parsed result, in order"""
+        command.return_value = mock.Mock(
+            status=0,
+            stderr='',
+            stdout=self.batch_output(('Id,Name\n1,foo', '', 0), ('Id: 1\nName: foo', '', 0)),
+        )
+        with CLIClass.batch() as hammer_batch:
+            hammer_batch.add(CLIClass, 'list', output_format='csv')
+            hammer_batch.add(CLIClass, 'info', {'id': 1}, output_format='info')
+        command.assert_called_once()
+        script = command.call_args[0][0]
+        assert '_robottelo_batch_run 0' in script
+        assert '_robottelo_batch_run 1' in script
+        assert hammer_batch.results == [[{'id': '1', 'name': 'foo'}], {'id': '1', 'name': 'foo'}]
+
+    @mock.patch('robottelo.cli.batch.ssh.command')
+    def test_batch_stop_on_error(self, command):
+        """The first failing command raises like Base.execute would"""
+        command.return_value = mock.Mock(
+            status=0, stderr='', stdout=self.batch_output(('', 'Error: not found', 65))
+        )
+        hammer_batch = batch.HammerBatch(stop_on_error=True)
+        hammer_batch.add(CLIClass, 'info', {'id': 1})
+        hammer_batch.add(CLIClass, 'info', {'id': 2})
+        with pytest.raises(CLIReturnCodeError):
+            hammer_batch.run()
+        assert '|| exit 0' in command.call_args[0][0]
+
+    @mock.patch('robottelo.cli.batch.ssh.command')
+    def test_batch_continue_on_error(self, command):
+        """Errors are returned in place of results when not stopping on error"""
+        command.return_value = mock.Mock(
+            status=0,
+            stderr='',
+            stdout=self.batch_output(('', 'Error: not found', 65), ('out', '', 0)),
+        )
+        with CLIClass.batch(stop_on_error=False) as hammer_batch:
+            hammer_batch.add(CLIClass, 'info', {'id': 1})
+            hammer_batch.add(CLIClass, 'info', {'id': 2})
+        assert isinstance(hammer_batch.results[0], CLIReturnCodeError)
+        assert hammer_batch.results[1] == 'out'
@@ -0,0 +1,91 @@
+import json
+import threading
+
+from robottelo.cli.command_tree import HelpCache, dumps_tree, generate_command_tree
+
+HELP_PAGES = {
+    'hammer': 'Subcommands:\n'
+    ' user                          Manipulate users\n'
+    ' host                          Manipulate hosts\n'
+    'Options:\n'
+    ' --verbose                     Be verbose\n',
+    'hammer host': 'Subcommands:\n'
+    ' list                          List hosts\n'
+    ' info                          Show a host\n',
+    'hammer host list': 'Options:\n --search VALUE                Filter results\n',
+    'hammer host info': 'Options:\n --id VALUE                    Host id\n',
+    'hammer user': 'Subcommands:\n list                          List users\n',
+    'hammer user list': 'Options:\n --search VALUE                Filter results\n',
+}
+
+
+class FakeHammer:
+    def __init__(self, pages):
+        self.pages = dict(pages)
+        self.fetched = []
+        self._lock = threading.Lock()
+
+    def __call__(self, command, hostname):
+        with self._lock:
+            self.fetched.append(command)
+        return self.pages[command]
+
+
+def test_generate_command_tree():
+    fetch = FakeHammer(HELP_PAGES)
+    tree = generate_command_tree(fetch=fetch, workers=3)
+    assert sorted(fetch.fetched) == sorted(HELP_PAGES)
+    assert [subcommand['name'] for subcommand in tree['subcommands']] == ['user', 'host']
+    host = tree['subcommands'][1]
+    assert host['description'] == 'Manipulate hosts'
+    assert [subcommand['name'] for subcommand in host['subcommands']] == ['list', 'info']
+    assert host['subcommands'][1]['options'][0]['name'] == 'id'
+
+
+def test_incremental_generation(tmp_path):
+    cache = HelpCache(tmp_path / 'help.json')
+    generate_command_tree(version='6.19', cache=cache, fetch=FakeHammer(HELP_PAGES))
+    cache.save()
+
+    cache = HelpCache(tmp_path / 'help.json')
+    fetch = FakeHammer(HELP_PAGES)
+    tree = generate_command_tree(version='6.19', cache=cache, fetch=fetch)
+    assert fetch.fetched == ['hammer']
+    assert tree == generate_command_tree(fetch=FakeHammer(HELP_PAGES))
+
+    # a new command: the hammer children are fetched again, not the unchanged grandchildren
+    fetch = FakeHammer(HELP_PAGES)
+    fetch.pages['hammer'] = fetch.pages['hammer'].replace(
+        'Options:', ' domain                        Manipulate domains\nOptions:'
+    )
+    fetch.pages['hammer domain'] = 'Subcommands:\n list                          List domains\n'
+    fetch.pages['hammer domain list'] = 'Options:\n --search VALUE                Filter\n'
+    tree = generate_command_tree(version='6.19', cache=cache, fetch=fetch)
+    assert sorted(fetch.fetched) == [
+        'hammer',
+        'hammer domain',
+        'hammer domain list',
+        'hammer host',
+        'hammer user',
+    ]
+    assert tree['subcommands'][2]['subcommands'][0]['name'] == 'list'
+
+    # other versions don't share cached help pages
+    fetch = FakeHammer(HELP_PAGES)
+    generate_command_tree(version='6.20', cache=cache, fetch=fetch)
+    assert len(fetch.fetched) == len(HELP_PAGES)
+
+    fetch = FakeHammer(HELP_PAGES)
+    generate_command_tree(version='6.19', cache=cache, incremental=False, fetch=fetch)
+    assert len(fetch.fetched) == len(HELP_PAGES)
+
+
+def test_dumps_tree_is_sorted():
+    tree = generate_command_tree(fetch=FakeHammer(HELP_PAGES))
+    dumped = json.loads(dumps_tree(tree))
+    assert [subcommand['name'] for subcommand in dumped['subcommands']] == ['host', 'user']
+    assert [subcommand['name'] for subcommand in dumped['subcommands'][0]['subcommands']] == [
+        'info',
+        'list',
+    ]
+    assert dumps_tree(tree).endswith('}\n')
@@ -0,0 +1,66 @@
+"""Tests for module ``robottelo.utils.concurrency``."""
+
+import asyncio
+
+import pytest
+
+from robottelo.exceptions import ParallelExecutionError
+from robottelo.utils.concurrency import gather_limited, run_concurrently, run_on_hosts
+
+
+async def _tracked(index, running, peak):
+    running.append(index)
+    peak.append(len(running))
+    await asyncio.sleep(0.01)
+    running.remove(index)
+    return index
+
+
+def test_run_concurrently_keeps_order():
+    """Results are returned in the order the coroutines were given"""
+    running, peak = [], []
+    assert run_concurrently(*(_tracked(i, running, peak) for i in range(5))) == list(range(5))
+
+
+def test_run_concurrently_limit():
+    """No more than ``limit`` coroutines run at the same time"""
+    running, peak = [], []
+    run_concurrently(*(_tracked(i, running, peak) for i in range(6)), limit=2)
+    assert max(peak) == 2
+
+
+def test_gather_limited_exceptions():
+    """Exceptions are raised, or returned in place when asked to"""
+
+    async def _fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError, match='boom'):
+        asyncio.run(gather_limited(_fail()))
+    results = run_concurrently(_fail(), asyncio.sleep(0, result='ok'), return_exceptions=True)
+    assert isinstance(results[0], ValueError)
+    assert results[1] == 'ok'
+
+
+def test_run_on_hosts_results():
+    """Each host gets its own result and timing, in the order of the hosts"""
+    results = run_on_hosts(['host1', 'host2'], lambda host, suffix: host + suffix, '.example.com')
+    assert [task.result for task in results] == ['host1.example.com', 'host2.example.com']
+    assert all(task.duration >= 0 and not task.failed for task in results)
+
+
+def test_run_on_hosts_aggregates_errors():
+    """Every host is processed and all failures are reported together"""
+    processed = []
+
+    def _setup(host):
+        processed.append(host)
+        if host != 'good':
+            raise RuntimeError(f'{host} broke')
+
+    with pytest.raises(ParallelExecutionError, match='Failed on 2 of 3 hosts') as err:
+        run_on_hosts(['bad1', 'good', 'bad2'], _setup)
+    assert sorted(processed) == ['bad1', 'bad2', 'good']
+    assert set(err.value.errors) == {'bad1', 'bad2'}
+    results = run_on_hosts(['bad1', 'good'], _setup, raise_errors=False)
+    assert [task.failed for task in results] == [True, False]
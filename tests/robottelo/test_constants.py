@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import pytest
+
+from robottelo import constants
+
+
+def test_lazy_constants_are_resolved():
+    from robottelo.constants import PERMISSIONS, DataFile
+
+    assert 'view_hosts' in PERMISSIONS['Host']
+    assert DataFile.HAMMER_COMMANDS_JSON.name == 'hammer_commands.json'
+    assert constants.BOOKMARK_ENTITIES_SELECTION[0]['name'] == 'ActivationKey'
+    assert 'FAM_TEST_PLAYBOOKS' in dir(constants)
+    with pytest.raises(AttributeError, match='NOT_A_CONSTANT'):
+        getattr(constants, 'NOT_A_CONSTANT')  # noqa: B009
+
+
+def test_lazy_constants_are_not_imported():
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            'import sys, robottelo.constants;'
+            'print(sorted(name for name in sys.modules if name.startswith(("robottelo.constants.",'
+            ' "nailgun.entities", "box"))))',
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == '[]'
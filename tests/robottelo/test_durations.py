@@ -0,0 +1,220 @@
+import json
+import types
+from unittest import mock
+
+import pytest
+
+from pytest_plugins import xdist_scheduling
+from pytest_plugins.xdist_scheduling import DurationScheduling, affinity_report_key, work_unit
+from robottelo.utils.durations import DEFAULT_DURATION, DurationHistory, junit_name
+from robottelo.utils.scheduling import affinity_report, group_units, simulate
+
+JUNIT = """\
+<testsuites><testsuite>
+<testcase classname="tests.foreman.api.test_host.TestHost" name="test_create[rhel9]" time="12.5"/>
+<testcase classname="tests.foreman.api.test_host" name="test_skipped" time="0.1">
+<skipped/></testcase>
+</testsuite></testsuites>
+"""
+
+
+class MockNode:
+    def __init__(self, id):
+        self.gateway = types.SimpleNamespace(id=id)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.append(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def test_junit_name():
+    assert (
+        junit_name('tests/foreman/api/test_host.py::TestHost::test_create[rhel9]')
+        == 'tests.foreman.api.test_host.TestHost.test_create[rhel9]'
+    )
+    assert (
+        junit_name('tests/foreman/api/test_host.py::test_x') == 'tests.foreman.api.test_host.test_x'
+    )
+
+
+def test_duration_history(tmp_path):
+    junit = tmp_path / 'junit.xml'
+    junit.write_text(JUNIT)
+    assert DurationHistory().estimate('tests/test_a.py::test_a') == DEFAULT_DURATION
+    history = DurationHistory.load(tmp_path / 'durations.json', junit_files=[junit])
+    assert history.get('tests/foreman/api/test_host.py::TestHost::test_create[rhel9]') == 12.5
+    assert history.get('tests/foreman/api/test_host.py::test_skipped') is None
+    history.update({'tests/test_a.py::test_a': 2, 'tests/test_a.py::test_b': 4})
+    # module mean, then median of every duration
+    assert history.estimate('tests/test_a.py::test_c') == 3
+    assert history.estimate('tests/test_b.py::test_a') == 4
+    history.save(tmp_path / 'durations.json')
+    assert DurationHistory.load(tmp_path / 'durations.json').durations == history.durations
+
+
+def test_merge_durations(tmp_path):
+    path = tmp_path / 'durations.json'
+    DurationHistory.merge({'tests/test_a.py::test_a': 2, 'tests/test_a.py::test_b': 4}, path)
+    # a run of a single test keeps the durations of the others
+    DurationHistory.merge({'tests/test_a.py::test_a': 3}, path)
+    assert DurationHistory.load(path).durations == {
+        'tests/test_a.py::test_a': 3,
+        'tests/test_a.py::test_b': 4,
+    }
+
+
+@pytest.mark.parametrize(
+    ('options', 'recorded'),
+    [
+        ({}, False),
+        ({'record_durations': True}, True),
+        ({'schedule_durations': True}, True),
+        ({'record_durations': True, 'collectonly': True}, False),
+    ],
+)
+def test_durations_recorded(options, recorded):
+    options = {
+        'record_durations': False,
+        'schedule_durations': False,
+        'schedule_affinity': False,
+        'collectonly': False,
+        **options,
+    }
+    config = types.SimpleNamespace(
+        option=types.SimpleNamespace(collectonly=options['collectonly']),
+        getoption=options.get,
+        pluginmanager=mock.Mock(),
+        stash={},
+    )
+    xdist_scheduling.pytest_configure(config)
+    assert config.pluginmanager.register.called == recorded
+
+
+def test_work_unit():
+    def item(nodeid, *scopes):
+        fixturedefs = {scope: [types.SimpleNamespace(scope=scope)] for scope in scopes}
+        return types.SimpleNamespace(
+            nodeid=nodeid, _fixtureinfo=types.SimpleNamespace(name2fixturedefs=fixturedefs)
+        )
+
+    assert work_unit(item('tests/test_a.py::TestA::test_a', 'function', 'session')) == (
+        'tests/test_a.py::TestA::test_a'
+    )
+    assert work_unit(item('tests/test_a.py::TestA::test_a', 'class')) == 'tests/test_a.py::TestA'
+    assert work_unit(item('tests/test_a.py::TestA::test_a', 'class', 'module')) == 'tests/test_a.py'
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    collection = [
+        'tests/test_a.py::test_1',
+        'tests/test_a.py::test_2',
+        'tests/test_b.py::test_long',
+        'tests/test_c.py::test_short',
+    ]
+    work_units = tmp_path / 'work_units.json'
+    work_units.write_text(
+        json.dumps(
+            {nodeid: {'unit': nodeid, 'module': [], 'session': []} for nodeid in collection[2:]}
+        )
+    )
+    history = DurationHistory(
+        {
+            'tests/test_a.py::test_1': 10,
+            'tests/test_a.py::test_2': 10,
+            'tests/test_b.py::test_long': 100,
+            'tests/test_c.py::test_short': 1,
+        }
+    )
+    config = types.SimpleNamespace(getvalue=lambda name: ['2*popen'])
+    scheduler = DurationScheduling(config, history=history, work_units_file=work_units)
+    nodes = [MockNode('gw0'), MockNode('gw1')]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    return scheduler, nodes
+
+
+def test_longest_work_units_first(scheduler):
+    scheduler, (first, second) = scheduler
+    scheduler.schedule()
+    # test_a.py tests have no work unit, they are grouped by module
+    assert first.sent[0] == [2]
+    assert second.sent[0] == [0, 1]
+    assert first.sent[1] == [3]
+
+
+TESTS = {
+    'tests/test_a.py::test_1': ('tests/test_a.py', ['align', 'sat'], 10),
+    'tests/test_a.py::test_2': ('tests/test_a.py', ['align', 'sat'], 10),
+    'tests/test_b.py::test_long': ('tests/test_b.py::test_long', ['align', 'capsule'], 100),
+    'tests/test_c.py::test_sat': ('tests/test_c.py::test_sat', ['align', 'sat'], 15),
+    'tests/test_c.py::test_none': ('tests/test_c.py::test_none', ['align'], 10),
+    'tests/test_c.py::test_capsule': ('tests/test_c.py::test_capsule', ['align', 'capsule'], 5),
+}
+
+
+@pytest.fixture
+def affinity_scheduler(request, tmp_path):
+    work_units = tmp_path / 'work_units.json'
+    work_units.write_text(
+        json.dumps(
+            {
+                nodeid: {'unit': unit, 'module': [], 'session': session}
+                for nodeid, (unit, session, _) in TESTS.items()
+                # tests without work unit are grouped by module
+                if not nodeid.startswith('tests/test_a.py')
+            }
+        )
+    )
+    history = DurationHistory({nodeid: duration for nodeid, (*_, duration) in TESTS.items()})
+    config = types.SimpleNamespace(getvalue=lambda name: ['2*popen'], stash={})
+    scheduler = DurationScheduling(
+        config, history=history, work_units_file=work_units, affinity=request.param
+    )
+    nodes = [MockNode('gw0'), MockNode('gw1')]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, list(TESTS))
+    return scheduler, nodes
+
+
+@pytest.mark.parametrize('affinity_scheduler', [False], indirect=True)
+def test_without_fixture_affinity(affinity_scheduler):
+    scheduler, (first, second) = affinity_scheduler
+    scheduler.schedule()
+    assert first.sent[:2] == [[2], [3]]
+    assert second.sent[:2] == [[0, 1], [4]]
+    assert affinity_report_key not in scheduler.config.stash
+
+
+@pytest.mark.parametrize('affinity_scheduler', [True], indirect=True)
+def test_fixture_affinity(affinity_scheduler):
+    scheduler, (first, second) = affinity_scheduler
+    scheduler.schedule()
+    # test_b.py::test_long built capsule, test_a.py sat
+    assert first.sent[:2] == [[2], [5]]
+    assert second.sent[:2] == [[0, 1], [3]]
+    assert scheduler.config.stash[affinity_report_key]['workers'] == 2
+
+
+def test_affinity_report():
+    history = DurationHistory({nodeid: duration for nodeid, (*_, duration) in TESTS.items()})
+    tests = {
+        nodeid: {'unit': unit, 'module': ['org'] if unit.endswith('.py') else [], 'session': s}
+        for nodeid, (unit, s, _) in TESTS.items()
+    }
+    units = group_units(tests, history)
+    assert units[0] == ('tests/test_b.py::test_long', 100, frozenset({'capsule'}))
+    assert units[1] == ('tests/test_a.py', 20, frozenset({'sat'}))
+    loads = simulate(units, 2, affinity=True)
+    # the second worker runs out of sat tests and builds capsule too
+    assert loads == [(100, {'capsule'}), (50, {'sat', 'capsule'})]
+    report = affinity_report(tests, history, 2)
+    assert report['grouped_instantiations'] == 4
+    # org needed by 2 tests, sat by 3 and capsule by 2, align by all of them
+    assert report['scattered_instantiations'] == round(1.5 + 1.75 + 1.5, 1)
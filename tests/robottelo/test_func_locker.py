@@ -1,11 +1,14 @@
+import json
 import multiprocessing
 import os
 from pathlib import Path
 import tempfile
 import time
+import types
 
 import pytest
 
+from pytest_plugins import lock_metrics
 from robottelo.utils.decorators import func_locker
 
 _this_module_name_string = 'tests.robottelo.test_func_locker'
@@ -194,10 +197,15 @@ def simple_function_not_locked():
 
 
 class TestFuncLocker:
+    # the default lock backend, of the settings
+    lock_backend = None
+
     @pytest.fixture(autouse=True)
     def count_and_pool(self):
         global counter_file
         counter_file.write('0')
+        # set before forking the pool processes
+        func_locker.set_lock_backend(self.lock_backend)
         # Always use the same start method for all Python versions
         # 'fork' is consistent with pre-3.14 behavior
         ctx = multiprocessing.get_context('fork')
@@ -206,6 +214,7 @@ class TestFuncLocker:
 
         pool.terminate()
         pool.join()
+        func_locker.set_lock_backend(None)
 
     def test_simple(self):
         pid, content = simple_locked_function()
@@ -422,3 +431,91 @@ class TestFuncLocker:
             func_locker.locking_function(simple_function_not_locked),
         ):
             pass
+
+    def test_contention_metrics(self, count_and_pool):
+        res = count_and_pool.apply_async(hold_simple_function_lock, (1,))
+        lock_file_path = _get_function_lock_path('simple_function_to_lock')
+        # wait for the pool process to hold the lock
+        while not os.path.exists(lock_file_path) or not Path(lock_file_path).read_text():
+            time.sleep(0.01)
+        with func_locker.locking_function(simple_function_to_lock, timeout=5):
+            pass
+        holder = res.get(timeout=5)
+        lock_name = os.path.relpath(lock_file_path, func_locker._get_temp_lock_function_dir())
+        metrics = func_locker.LOCK_METRICS[lock_name]
+        assert metrics['contended'] >= 1
+        assert str(holder) in metrics['holders']
+
+
+def hold_simple_function_lock(seconds):
+    with func_locker.locking_function(simple_function_to_lock):
+        time.sleep(seconds)
+    return os.getpid()
+
+
+class TestFlockFuncLocker(TestFuncLocker):
+    lock_backend = 'flock'
+
+    def test_lock_timeout_and_metrics(self, count_and_pool, tmp_path):
+        res = count_and_pool.apply_async(hold_simple_function_lock, (1,))
+        lock_file_path = _get_function_lock_path('simple_function_to_lock')
+        # wait for the pool process to hold the lock
+        while not os.path.exists(lock_file_path) or not Path(lock_file_path).read_text():
+            time.sleep(0.01)
+        with (
+            pytest.raises(func_locker.FunctionLockerError, match=r'could not acquire'),
+            func_locker.locking_function(simple_function_to_lock, timeout=0.1),
+        ):
+            pass
+        with func_locker.locking_function(simple_function_to_lock, timeout=5):
+            assert Path(lock_file_path).read_text() == str(os.getpid())
+        holder = res.get(timeout=5)
+
+        lock_name = os.path.relpath(lock_file_path, func_locker._get_temp_lock_function_dir())
+        metrics = func_locker.LOCK_METRICS[lock_name]
+        assert metrics['contended'] >= 1
+        assert metrics['max_wait_time'] > 0.5
+        assert str(holder) in metrics['holders']
+        # merged with the metrics of another process
+        metrics_path = func_locker.export_lock_metrics()
+        Path(tmp_path, Path(metrics_path).name).write_text(Path(metrics_path).read_text())
+        Path(tmp_path, '1.json').write_text(
+            json.dumps(
+                {lock_name: {**metrics, 'acquired': 1, 'max_hold_time': 60, 'holders': ['1']}}
+            )
+        )
+        merged = func_locker.read_lock_metrics(tmp_path)[lock_name]
+        assert merged['acquired'] == metrics['acquired'] + 1
+        assert merged['max_hold_time'] == 60
+        assert merged['holders'] == sorted({'1', *metrics['holders']})
+        assert sorted(merged['processes']) == sorted(['1', str(os.getpid())])
+
+
+def test_lock_metrics_plugin(monkeypatch, tmp_path):
+    monkeypatch.setattr(func_locker, '_get_lock_metrics_dir', lambda create=True: str(tmp_path))
+    metrics = {
+        'acquired': 4,
+        'contended': 2,
+        'wait_time': 3.0,
+        'max_wait_time': 2.0,
+        'hold_time': 1.0,
+        'max_hold_time': 0.5,
+        'holders': ['1'],
+    }
+    Path(tmp_path, '1.json').write_text(json.dumps({'previous_run.lock': metrics}))
+    config = types.SimpleNamespace(
+        option=types.SimpleNamespace(collectonly=False), stash=pytest.Stash()
+    )
+    lock_metrics.pytest_configure(config)
+    # the metrics of the previous runs are cleared at the session start
+    assert list(tmp_path.iterdir()) == []
+    Path(tmp_path, '2.json').write_text(
+        json.dumps({'contended.lock': metrics, 'free.lock': {**metrics, 'contended': 0}})
+    )
+    lines = []
+    reporter = types.SimpleNamespace(write_sep=lambda *args: None, write_line=lines.append)
+    lock_metrics.pytest_terminal_summary(reporter, config)
+    assert lines == [
+        'contended.lock: 2 of 4 acquisitions contended, waited 3.0s (max 2.0s), '
+        'held 1.0s (max 0.5s)'
+    ]
@@ -1,7 +1,15 @@
 """Tests for Robottelo's hammer helpers"""
 
+import json
+from pathlib import Path
+
+import pytest
+
 from robottelo.cli import hammer
 
+HAMMER_DATA_DIR = Path(__file__).parent / 'data' / 'hammer'
+HAMMER_PARSERS = {'.csv': hammer.parse_csv, '.json': hammer.parse_json, '.txt': hammer.parse_info}
+
 
 class TestParseCSV:
     """Tests for parsing CSV hammer output"""
@@ -534,3 +542,35 @@ class TestParseInfo:
     def test_parse_json_list(self):
         """Can parse a list in json"""
         assert hammer.parse_json('["item1", "item2"]') == ['item1', 'item2']
+
+
+class TestParserEngine:
+    """Tests for the parsers of robottelo.cli.hammer_parser"""
+
+    @pytest.mark.parametrize('output_file', sorted(HAMMER_DATA_DIR.iterdir()), ids=lambda p: p.name)
+    def test_parse_samples(self, output_file):
+        """Sample outputs are parsed the same way the former line by line parsers did"""
+        expected = json.loads(HAMMER_DATA_DIR.with_name('hammer_expected.json').read_text())
+        parser = HAMMER_PARSERS[output_file.suffix]
+        assert parser(output_file.read_text()) == expected[output_file.name]
+
+    def test_iter_csv(self):
+        rows = hammer.iter_csv('Id,Full Name\n1,a\n\n2\n3,c,extra\n')
+        assert next(rows) == {'id': '1', 'full-name': 'a'}
+        assert list(rows) == [
+            {'id': '2', 'full-name': None},
+            {'id': '3', 'full-name': 'c', None: ['extra']},
+        ]
+        assert list(hammer.iter_csv('')) == []
+
+    def test_parse_info_tab_indentation(self):
+        assert hammer.parse_info('Status:\n \tGlobal: OK\n\tBuild: Installed') == {
+            'status': {'global': 'OK'},
+            'build': 'Installed',
+        }
+
+    def test_parse_json_last_object(self):
+        assert hammer.parse_json('{\n"Id": 1\n}\n{\n"Id": 2, "A b": [3, true, 1.5]\n}') == {
+            'id': '2',
+            'a-b': ['3', True, 1.5],
+        }
@@ -0,0 +1,87 @@
+import json
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import schema
+from robottelo.cli.base import Base
+from robottelo.constants import DataFile
+from robottelo.exceptions import CLIOptionError
+
+TREE = {
+    'options': [{'name': 'verbose'}],
+    'subcommands': [
+        {
+            'name': 'host',
+            'options': [{'name': 'help'}],
+            'subcommands': [
+                {'name': 'info', 'options': [{'name': 'id'}, {'name': 'name'}]},
+                {
+                    'name': 'interface',
+                    'subcommands': [{'name': 'list', 'options': [{'name': 'host-id'}]}],
+                },
+            ],
+        },
+        {'name': 'ping', 'options': []},
+    ],
+}
+
+
+class Host(Base):
+    command_base = 'host'
+
+
+def test_compile_tree():
+    assert schema.compile_tree(TREE) == {
+        'host info': ['id', 'name', 'verbose'],
+        'host interface list': ['host-id', 'verbose'],
+        'ping': ['verbose'],
+    }
+
+
+def test_validate():
+    hammer_schema = schema.HammerSchema(schema.compile_tree(TREE), version='6.19')
+    hammer_schema.validate('host', 'info', {'id': 1, 'no-verbose': True, 'nme': None})
+    hammer_schema.validate('host', 'unknown', {'whatever': 1})
+    hammer_schema.validate('ping', None, {'verbose': True})
+    with pytest.raises(CLIOptionError, match='--nme, --idd'):
+        hammer_schema.validate('host', 'info', {'id': 1, 'nme': 'x', 'idd': 1})
+    with pytest.raises(CLIOptionError, match='--id'):
+        hammer_schema.validate('host interface', 'list', {'id': 1})
+
+
+def test_write_and_read_schema(tmp_path):
+    path = tmp_path.joinpath('schema.json')
+    written = schema.write_schema(TREE, '6.19', path)
+    # written aside and renamed into place
+    assert [file.name for file in tmp_path.iterdir()] == ['schema.json']
+    read = schema.read_schema(path)
+    assert read.version == '6.19'
+    assert read.to_dict() == written.to_dict()
+    assert schema.read_schema(tmp_path.joinpath('missing.json')) is None
+    path.write_text('{"format": 0, "commands": {}}')
+    assert schema.read_schema(path) is None
+
+
+def test_bundled_tree_explodes_grouped_options():
+    hammer_schema = schema.HammerSchema(
+        schema.compile_tree(json.loads(DataFile.HAMMER_COMMANDS_JSON.read_text()))
+    )
+    assert len(hammer_schema) > 100
+    assert {'hostgroups', 'hostgroup-ids', 'hostgroup-titles'} <= hammer_schema.options(
+        'organization update'
+    )
+
+
+def test_construct_command_validates_options():
+    hammer_schema = schema.HammerSchema(schema.compile_tree(TREE))
+    Host.command_sub = 'info'
+    with mock.patch('robottelo.cli.schema.get_schema', return_value=hammer_schema):
+        assert Host._construct_command({'id': 1, 'verbose': True}).split() == [
+            'host',
+            'info',
+            '--id="1"',
+            '--verbose',
+        ]
+        with pytest.raises(CLIOptionError):
+            Host._construct_command({'host-id': 1})
@@ -0,0 +1,71 @@
+from unittest import mock
+
+import pytest
+import requests
+
+from robottelo.utils import http
+
+
+def test_base_url():
+    assert http.base_url('https://Sat.example.com/api/v2/hosts?x=1') == 'https://sat.example.com'
+    assert http.base_url('https://sat.example.com:8443') == 'https://sat.example.com:8443'
+
+
+def test_new_session_is_pooled_and_cookieless():
+    session = http.new_session(pool_size=3)
+    adapter = session.get_adapter('https://sat.example.com')
+    assert adapter._pool_maxsize == 3
+    assert session.cookies.get_policy().is_not_allowed('sat.example.com')
+
+
+def test_router_shares_session_per_base_url():
+    router = http.SessionRouter()
+    session = router.register('https://sat.example.com')
+    assert router.register('https://sat.example.com/api/v2') is session
+    assert router.session_for('https://sat.example.com/katello/api/v2') is session
+    assert router.session_for('https://other.example.com') is None
+    with mock.patch.object(session, 'request') as request:
+        router.get('https://sat.example.com/api/v2/hosts', params={'per_page': 1}, verify=False)
+    request.assert_called_once_with(
+        'get', 'https://sat.example.com/api/v2/hosts', params={'per_page': 1}, verify=False
+    )
+    router.close_all()
+    assert router.session_for('https://sat.example.com') is None
+
+
+def test_router_falls_back_to_requests():
+    router = http.SessionRouter()
+    with mock.patch('robottelo.utils.http.requests.request') as request:
+        router.delete('https://other.example.com/api/v2/hosts/1', verify=False)
+    request.assert_called_once_with(
+        'delete', 'https://other.example.com/api/v2/hosts/1', verify=False
+    )
+    assert router.exceptions is requests.exceptions
+
+
+def test_router_records_stats():
+    router = http.SessionRouter()
+    session = router.register('https://sat.example.com', pool_size=2)
+    responses = [mock.Mock(ok=True), mock.Mock(ok=False)]
+    with mock.patch.object(session, 'request', side_effect=responses):
+        router.get('https://sat.example.com/api/v2/hosts')
+        router.post('https://sat.example.com/api/v2/hosts', json={})
+    with (
+        mock.patch.object(session, 'request', side_effect=requests.ConnectionError),
+        pytest.raises(requests.ConnectionError),
+    ):
+        router.get('https://sat.example.com/api/v2/hosts')
+    stats = router.stats()['https://sat.example.com']
+    assert stats['requests'] == 3
+    assert stats['errors'] == 2
+    assert stats['connections'] == 0
+    assert stats['max_time'] >= stats['mean_time'] >= 0
+
+
+def test_new_session_retries_idempotent_requests():
+    retry = http.new_session(retries=2, backoff_factor=0.1).get_adapter('https://x').max_retries
+    assert retry.total == 2
+    assert retry.status_forcelist == http.RETRY_STATUSES
+    assert retry.is_retry('GET', 503)
+    assert not retry.is_retry('POST', 503)
+    assert not retry.raise_on_status
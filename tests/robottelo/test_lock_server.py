@@ -0,0 +1,173 @@
+import multiprocessing
+import os
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+from robottelo.utils.decorators import func_locker
+from robottelo.utils.decorators.lock_backends import (
+    FunctionLockerError,
+    LeaseLockBackend,
+    SocketLeaseBackend,
+    _LockServerConnection,
+)
+from robottelo.utils.decorators.lock_server import LockServer
+
+LEASE = {'name': 'scope/function.lock', 'ttl': 60}
+
+
+@pytest.fixture
+def socket_path():
+    # unix socket paths are limited to about a hundred characters
+    with tempfile.TemporaryDirectory(prefix='lock') as tmp_dir:
+        yield os.path.join(tmp_dir, 'lock_server.sock')
+
+
+@pytest.fixture
+def server(socket_path):
+    with LockServer(socket_path) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+
+
+@pytest.fixture
+def connect(server):
+    connections = []
+
+    def connect():
+        connections.append(_LockServerConnection(server.server_address))
+        return connections[-1]
+
+    yield connect
+    for connection in connections:
+        connection.close()
+
+
+def test_leases(connect):
+    first, second = connect(), connect()
+    assert first.request('acquire', owner='first', **LEASE) == {'ok': True, 'fence': 1}
+    assert second.request('acquire', owner='second', timeout=0, **LEASE) == {
+        'ok': False,
+        'holder': 'first',
+    }
+    assert second.request('release', owner='second', name=LEASE['name']) == {'ok': False}
+    assert first.request('renew', owner='first', **LEASE) == {'ok': True}
+    assert first.request('release', owner='first', name=LEASE['name']) == {'ok': True}
+    assert second.request('acquire', owner='second', timeout=0, **LEASE) == {'ok': True, 'fence': 2}
+    assert first.request('renew', owner='first', **LEASE) == {'ok': False}
+
+
+def test_expired_and_disconnected_leases(connect):
+    first, second = connect(), connect()
+    first.request('acquire', owner='first', name=LEASE['name'], ttl=0.2)
+    started = time.monotonic()
+    # woken up when the lease of first expires
+    assert second.request('acquire', owner='second', timeout=5, **LEASE)['fence'] == 2
+    assert 0.1 < time.monotonic() - started < 2
+    assert first.request('renew', owner='first', **LEASE) == {'ok': False}
+    # woken up when second closes its connection
+    threading.Timer(0.2, second.close).start()
+    assert connect().request('acquire', owner='third', timeout=5, **LEASE)['fence'] == 3
+
+
+def test_fences_outlive_the_server(socket_path):
+    for fence in (1, 2):
+        with LockServer(socket_path) as server:
+            assert server.acquire(owner='first', **LEASE) == {'ok': True, 'fence': fence}
+        # as the server leaves it when it exits
+        os.unlink(socket_path)
+
+
+class UnreachableLeaseBackend(LeaseLockBackend):
+    def _acquire(self, lease, timeout, on_contention):
+        lease.fence = 1
+        return True
+
+    def _renew(self, lease):
+        raise TimeoutError('unreachable')
+
+    def _release(self, lease):
+        raise TimeoutError('unreachable')
+
+
+def test_lease_lost_once_expired(tmp_path):
+    backend = UnreachableLeaseBackend(ttl=0.3)
+    with backend.lock(str(tmp_path / 'function.lock'), timeout=1) as lease:
+        lease.check()
+        time.sleep(0.5)
+        assert lease.lost.is_set()
+        with pytest.raises(FunctionLockerError, match='was lost'):
+            lease.check()
+
+
+def test_lease_lost_with_the_server(socket_path):
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'robottelo.utils.decorators.lock_server', socket_path, '5']
+    )
+    try:
+        # the server is already running, it is not started by the backend
+        while not os.path.exists(socket_path):
+            time.sleep(0.05)
+        backend = SocketLeaseBackend(socket_path, ttl=3, idle_timeout=5)
+        with backend.lock(socket_path, timeout=10) as lease:
+            server.kill()
+            server.wait()
+            # lost at the next renewal, a second later, before the lease expires
+            assert lease.lost.wait(2.5)
+            with pytest.raises(FunctionLockerError, match='was lost'):
+                lease.check()
+    finally:
+        server.kill()
+        server.wait()
+
+
+@pytest.fixture
+def lock_scope():
+    # shared by the pool processes, the default scope is the process id
+    previous = func_locker.LOCK_DEFAULT_SCOPE
+    func_locker.set_default_scope('lock_server_unittest_scope')
+    yield
+    func_locker.set_default_scope(previous)
+
+
+@func_locker.lock_function
+def simple_locked_function():
+    pass
+
+
+def locked_counter(counter_path):
+    with func_locker.locking_function(simple_locked_function) as lease:
+        count = int(Path(counter_path).read_text())
+        time.sleep(0.05)
+        Path(counter_path).write_text(str(count + 1))
+        lease.check()
+        return lease.fence
+
+
+@pytest.mark.usefixtures('lock_scope')
+def test_socket_backend(socket_path, tmp_path):
+    counter_path = tmp_path / 'counter'
+    counter_path.write_text('0')
+    # the lock server is started on demand by the first process, and exits once idle
+    backend = SocketLeaseBackend(socket_path, ttl=1, idle_timeout=2)
+    func_locker._lock_backend = backend
+    try:
+        with multiprocessing.get_context('fork').Pool(4) as pool:
+            fences = pool.map(locked_counter, [counter_path] * 8)
+        with (
+            func_locker.locking_function(simple_locked_function),
+            pytest.raises(func_locker.FunctionLockerError, match=r'recursion detected'),
+            func_locker.locking_function(simple_locked_function),
+        ):
+            pass
+    finally:
+        func_locker.set_lock_backend(None)
+    assert counter_path.read_text() == '8'
+    assert sorted(fences) == list(range(1, 9))
@@ -0,0 +1,117 @@
+import os
+from pathlib import Path
+import types
+
+import pytest
+
+from robottelo.utils import marker_cache
+from robottelo.utils.marker_cache import MarkerTokenCache, is_cacheable
+
+
+class Extractor:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return Path(path).read_text().split()
+
+
+@pytest.fixture
+def test_file(tmp_path):
+    path = tmp_path / 'test_foo.py'
+    path.write_text(':CaseComponent: Repositories')
+    return path
+
+
+def reload(cache):
+    cache.save()
+    return MarkerTokenCache(cache.path, cache.root)
+
+
+def test_tokens_are_reused(tmp_path, test_file):
+    extract = Extractor()
+    cache = MarkerTokenCache(tmp_path / 'cache.json', tmp_path)
+    assert cache.tokens(test_file, 'docstrings', extract, test_file) == [
+        ':CaseComponent:',
+        'Repositories',
+    ]
+    cache = reload(cache)
+    assert cache.files['test_foo.py']['tokens']['docstrings'] == [':CaseComponent:', 'Repositories']
+    cache.tokens(test_file, 'docstrings', extract, test_file)
+    assert extract.calls == 1
+    assert not cache.changed
+
+
+def test_changed_files_are_extracted_again(tmp_path, test_file):
+    extract = Extractor()
+    cache = MarkerTokenCache(tmp_path / 'cache.json', tmp_path)
+    cache.tokens(test_file, 'docstrings', extract, test_file)
+    # same contents, another modification time
+    os.utime(test_file, ns=(0, 0))
+    cache = reload(cache)
+    cache.tokens(test_file, 'docstrings', extract, test_file)
+    assert extract.calls == 1
+    test_file.write_text(':CaseComponent: Hosts')
+    cache = reload(cache)
+    assert cache.tokens(test_file, 'docstrings', extract, test_file)[1] == 'Hosts'
+    assert extract.calls == 2
+
+
+def test_fresh_and_changed_extractors(tmp_path, test_file, monkeypatch):
+    extract = Extractor()
+    cache = MarkerTokenCache(tmp_path / 'cache.json', tmp_path)
+    cache.tokens(test_file, 'docstrings', extract, test_file)
+    cache.save()
+    assert not MarkerTokenCache(cache.path, tmp_path, fresh=True).files
+    monkeypatch.setattr(marker_cache, 'extractors_hash', lambda: 'changed')
+    assert not MarkerTokenCache(cache.path, tmp_path).files
+    cache.path.write_text('{')
+    assert not MarkerTokenCache(cache.path, tmp_path).files
+
+
+class Documented:
+    """Documented class"""
+
+    def test_documented(self):
+        """Documented test"""
+
+
+class Undocumented(Documented):
+    def test_documented(self):
+        pass
+
+
+class Inheriting(Documented):
+    """Inheriting class"""
+
+
+def test_is_cacheable():
+    module = types.ModuleType(__name__)
+    path = Path(__file__)
+
+    def item(function, cls=None):
+        return types.SimpleNamespace(function=function, cls=cls, module=module, path=path)
+
+    assert is_cacheable(item(test_is_cacheable))
+    assert is_cacheable(item(Documented.test_documented, Documented))
+    # docstrings inherited from Documented
+    assert not is_cacheable(item(Undocumented.test_documented, Undocumented))
+    assert not is_cacheable(item(pytest.fixture))
+
+
+def test_inherited_item_tokens(tmp_path):
+    cache = MarkerTokenCache(tmp_path / 'cache.json', Path(__file__).parent)
+    module = types.ModuleType(__name__)
+
+    def item(cls):
+        return types.SimpleNamespace(
+            function=cls.test_documented, cls=cls, module=module, path=Path(__file__)
+        )
+
+    def extract(item):
+        return [item.cls.__doc__]
+
+    assert cache.item_tokens(item(Documented), 'docstrings', extract) == ['Documented class']
+    # the test inherited from Documented is extracted again for its own class
+    assert cache.item_tokens(item(Inheriting), 'docstrings', extract) == ['Inheriting class']
@@ -0,0 +1,53 @@
+import pytest
+
+from robottelo.cli.base import Base
+from robottelo.cli.org import Org
+from robottelo.host_helpers.namespaces import CLINamespace, cli_registry
+
+
+def test_cli_registry_built_once():
+    """The cli classes are discovered once per process and prefix"""
+    assert cli_registry() is cli_registry()
+    assert cli_registry()['Org'] is Org
+    assert 'Backup' in cli_registry('sm_')
+    assert 'Org' not in cli_registry('sm_')
+
+
+def test_cli_namespace_binds_on_first_access():
+    """Host-bound classes are only created when accessed and then reused"""
+    cli = CLINamespace('sat.example.com')
+    assert cli.materialized() == {}
+    org = cli.Org
+    assert issubclass(org, Org)
+    assert org is not Org
+    assert org.hostname == 'sat.example.com'
+    assert cli.Org is org
+    assert set(cli.materialized()) == {'Org'}
+    assert 'Repository' in dir(cli)
+
+
+def test_cli_namespaces_are_isolated():
+    """Namespaces of different hosts never share their bound classes"""
+    first, second = CLINamespace('first.example.com'), CLINamespace('second.example.com')
+    assert first.Org is not second.Org
+    assert first.Org.hostname != second.Org.hostname
+    assert Base.hostname is None
+
+
+def test_cli_namespace_omitting_credentials():
+    """Credentials omission applies to bound and not yet bound classes"""
+    cli = CLINamespace('sat.example.com')
+    org = cli.Org
+    cli.set_omitting_credentials(True)
+    assert org.omitting_credentials is True
+    assert cli.Repository.omitting_credentials is True
+    cli.set_omitting_credentials(False)
+    assert org.omitting_credentials is False
+
+
+def test_cli_namespace_unknown_attribute():
+    cli = CLINamespace('sat.example.com')
+    with pytest.raises(AttributeError):
+        getattr(cli, 'NotAHammerCommand')  # noqa: B009
+    with pytest.raises(AttributeError):
+        getattr(cli, '_private')  # noqa: B009
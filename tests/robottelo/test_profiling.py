@@ -0,0 +1,72 @@
+import json
+import types
+
+import pytest
+
+from pytest_plugins.collection_profiler import CollectionProfiler
+from robottelo.utils.profiling import import_events, parse_importtime, speedscope
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:        10 |         10 |     json.decoder
+import time:        20 |         30 |   json
+import time:         5 |          5 |   re
+import time:       100 |        135 | robottelo
+collected 3 items
+import time:        40 |         40 | yaml
+"""
+
+
+def test_parse_importtime():
+    assert parse_importtime(IMPORTTIME.splitlines()) == [
+        ('json.decoder', 10, 10, 2),
+        ('json', 20, 30, 1),
+        ('re', 5, 5, 1),
+        ('robottelo', 100, 135, 0),
+        ('yaml', 40, 40, 0),
+    ]
+
+
+def test_import_events():
+    assert import_events(parse_importtime(IMPORTTIME.splitlines())) == [
+        ('O', 'robottelo', 0),
+        ('O', 'json', 0),
+        ('O', 'json.decoder', 0),
+        ('C', 'json.decoder', 10),
+        ('C', 'json', 30),
+        ('O', 're', 30),
+        ('C', 're', 35),
+        ('C', 'robottelo', 135),
+        ('O', 'yaml', 135),
+        ('C', 'yaml', 175),
+    ]
+
+
+def test_speedscope():
+    profile = speedscope({'imports': [('O', 'a', 0), ('O', 'b', 1), ('C', 'b', 2), ('C', 'a', 3)]})
+    assert profile['shared']['frames'] == [{'name': 'a'}, {'name': 'b'}]
+    (imports,) = profile['profiles']
+    assert (imports['type'], imports['startValue'], imports['endValue']) == ('evented', 0, 3)
+    assert imports['events'][1] == {'type': 'O', 'frame': 1, 'at': 1}
+
+
+def test_collection_profiler_times_plugin_hooks(tmp_path):
+    plugin = types.ModuleType('pytest_plugins.dummy')
+    plugin.pytest_collection_modifyitems = lambda session, config, items: items.reverse()
+    manager = pytest.PytestPluginManager()
+    manager.register(plugin)
+    profiler = CollectionProfiler(tmp_path / 'collection.json')
+    manager.register(profiler)
+    items = [1, 2]
+    for _ in range(2):
+        manager.hook.pytest_collection_modifyitems(session=None, config=None, items=items)
+    assert items == [1, 2]
+    profiler.pytest_collection_finish(session=None)
+    collection = json.loads(profiler.path.read_text())
+    (hook,) = collection['hooks']
+    assert hook['plugin'] == 'pytest_plugins.dummy'
+    assert hook['calls'] == 2
+    assert [event[:2] for event in collection['events'][:2]] == [
+        ['O', 'pytest_plugins.dummy:pytest_collection_modifyitems'],
+        ['C', 'pytest_plugins.dummy:pytest_collection_modifyitems'],
+    ]
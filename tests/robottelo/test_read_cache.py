@@ -0,0 +1,137 @@
+from unittest import mock
+
+import pytest
+
+from robottelo.cli.base import Base
+from robottelo.utils import http, read_cache
+
+
+@pytest.fixture
+def cache():
+    cache = read_cache.ReadCache(maxsize=2, ttl=60)
+    with (
+        mock.patch('robottelo.utils.read_cache._cache', cache),
+        mock.patch('robottelo.utils.read_cache.get_cache', return_value=cache),
+    ):
+        yield cache
+
+
+class Org(Base):
+    command_base = 'organization'
+    hostname = 'sat.example.com'
+
+
+def test_values_are_copied():
+    cache = read_cache.ReadCache()
+    value = {'name': 'org'}
+    cache.set('key', value)
+    value['name'] = 'changed'
+    cache.get('key')['name'] = 'changed'
+    assert cache.get('key') == {'name': 'org'}
+
+
+def test_expiry_and_lru():
+    cache = read_cache.ReadCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is read_cache.MISSING
+    assert cache.get('a') == 1
+    with mock.patch('robottelo.utils.read_cache.time.monotonic', return_value=10**9):
+        assert cache.get('a', None) is None
+    assert len(cache) == 1
+
+
+def test_invalidate_by_prefix():
+    cache = read_cache.ReadCache()
+    cache.set(('cli', 'sat1', 'organization', 'list'), 1)
+    cache.set(('cli', 'sat1', 'product', 'list'), 2)
+    cache.set(('cli', 'sat2', 'organization', 'list'), 3)
+    cache.invalidate('cli', 'sat1', 'organization')
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_hammer_command():
+    assert read_cache.hammer_command('content-view version list --id="1"') == (
+        'content-view',
+        'list',
+    )
+    assert read_cache.hammer_command('organization add-user --user-id 3') == (
+        'organization',
+        'add-user',
+    )
+    assert read_cache.is_cached_command('organization', 'info')
+    assert not read_cache.is_cached_command('organization', 'delete')
+    assert not read_cache.is_cached_command('task', 'list')
+
+
+@mock.patch('robottelo.cli.base.Base._resolve_credentials', return_value=('admin', 'changeme'))
+@mock.patch('robottelo.cli.base.Base._run_command')
+def test_execute_caches_reads(run_command, credentials, cache):
+    run_command.return_value = mock.Mock(status=0, stderr='', stdout=[{'id': '1'}])
+    first = Org.execute('organization list --search="name=org"', output_format='csv')
+    first.append('changed')
+    assert Org.execute('organization list --search="name=org"', output_format='csv') == [
+        {'id': '1'}
+    ]
+    assert run_command.call_count == 1
+    # another user doesn't share the result
+    credentials.return_value = ('viewer', 'changeme')
+    Org.execute('organization list --search="name=org"', output_format='csv')
+    assert run_command.call_count == 2
+    # a mutating command drops the cached results of the resource
+    Org.execute('organization add-user --id="1" --user-id="2"')
+    Org.execute('organization list --search="name=org"', output_format='csv')
+    assert run_command.call_count == 4
+
+
+@mock.patch('robottelo.cli.base.Base._resolve_credentials', return_value=('admin', 'changeme'))
+@mock.patch('robottelo.cli.base.Base._run_command')
+def test_execute_does_not_cache_raw_responses(run_command, credentials, cache):
+    Org.execute('organization info --id="1"', return_raw_response=True)
+    Org.execute('organization info --id="1"', return_raw_response=True)
+    assert run_command.call_count == 2
+    assert len(cache) == 0
+
+
+def test_router_drops_cached_searches(cache):
+    router = http.SessionRouter()
+    cache.set(('api', 'https://sat.example.com', 'admin', 'api/v2/hosts', '{}'), [])
+    cache.set(('api', 'https://other.example.com', 'admin', 'api/v2/hosts', '{}'), [])
+    with mock.patch('robottelo.utils.http.requests.request'):
+        router.get('https://sat.example.com/api/v2/hosts')
+        assert len(cache) == 2
+        router.post('https://sat.example.com/api/v2/hosts', json={})
+    assert len(cache) == 1
+
+
+def test_cached_search_json(cache):
+    from robottelo.host_helpers.namespaces import _cached_search_json
+
+    calls = []
+
+    class Host:
+        _server_config = mock.Mock(url='https://sat.example.com', auth=('admin', 'changeme'))
+
+        def path(self, which):
+            return 'https://sat.example.com/api/v2/hosts'
+
+        def search_payload(self, fields, query):
+            return dict(query or {})
+
+        def search_json(self, fields=None, query=None):
+            calls.append(query)
+            return {'results': [{'id': len(calls)}]}
+
+    Host.search_json = _cached_search_json(Host.search_json)
+    with mock.patch.object(http.router, 'session_for', return_value=None):
+        Host().search_json(query={'search': 'name=a'})
+        Host().search_json(query={'search': 'name=a'})
+        assert len(calls) == 2
+    with mock.patch.object(http.router, 'session_for'):
+        assert Host().search_json(query={'search': 'name=a'}) == {'results': [{'id': 3}]}
+        assert Host().search_json(query={'search': 'name=a'}) == {'results': [{'id': 3}]}
+        assert Host().search_json(query={'search': 'name=b'}) == {'results': [{'id': 4}]}
@@ -0,0 +1,127 @@
+import types
+
+import pytest
+
+from pytest_plugins.run_planner import fixture_checkouts, plan
+from robottelo.utils.durations import DurationHistory
+from robottelo.utils.scheduling import recommend_workers
+
+
+class Broker:
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def rhel_contenthost(request):
+    with Broker(**request.param) as host:
+        yield host
+
+
+def content_hosts(request):
+    with Broker(**request.param, _count=2) as hosts:
+        yield hosts
+
+
+def module_capsule_host(request, capsule_factory):
+    return capsule_factory()
+
+
+def target_sat(request, _default_sat, satellite_factory):
+    with _target_sat_imp(request, _default_sat, satellite_factory) as sat:  # noqa: F821
+        yield sat
+
+
+def module_org():
+    return 'org'
+
+
+FIXTURES = {
+    'rhel_contenthost': ('function', rhel_contenthost),
+    'content_hosts': ('function', content_hosts),
+    'module_capsule_host': ('module', module_capsule_host),
+    'target_sat': ('function', target_sat),
+    'module_org': ('module', module_org),
+    'satellite_factory': ('session', None),
+    'capsule_factory': ('session', None),
+}
+
+
+class Item:
+    def __init__(self, nodeid, *fixtures, params=None, markers=()):
+        self.nodeid = nodeid
+        self.markers = [getattr(pytest.mark, name).mark for name in markers]
+        self._fixtureinfo = types.SimpleNamespace(
+            argnames=fixtures,
+            name2fixturedefs={
+                name: [types.SimpleNamespace(scope=FIXTURES[name][0], func=FIXTURES[name][1])]
+                for name in fixtures
+            },
+        )
+        if params:
+            self.callspec = types.SimpleNamespace(params=params)
+
+    def iter_markers(self, name=None):
+        return (marker for marker in self.markers if name in (None, marker.name))
+
+    def get_closest_marker(self, name):
+        return next(self.iter_markers(name), None)
+
+
+def test_fixture_checkouts():
+    assert fixture_checkouts(rhel_contenthost) == (1, False)
+    assert fixture_checkouts(content_hosts) == (2, False)
+    assert fixture_checkouts(module_capsule_host) == (1, False)
+    assert fixture_checkouts(target_sat) == (1, True)
+    assert fixture_checkouts(module_org) == (0, False)
+
+
+def test_plan():
+    items = [
+        Item('tests/test_a.py::test_a[rhel8]', 'rhel_contenthost', params={'rhel_contenthost': 8}),
+        Item('tests/test_a.py::test_a[rhel9]', 'rhel_contenthost', params={'rhel_contenthost': 9}),
+        Item('tests/test_a.py::test_hosts', 'content_hosts', 'target_sat'),
+        Item('tests/test_a.py::test_destructive', 'target_sat', markers=['destructive']),
+        Item('tests/test_b.py::test_capsule', 'module_capsule_host', 'satellite_factory'),
+        Item('tests/test_b.py::test_capsule_again', 'module_capsule_host', 'module_org'),
+        Item('tests/test_b.py::test_skipped', 'rhel_contenthost', markers=['skip']),
+    ]
+    history = DurationHistory(
+        {
+            'tests/test_a.py::test_a[rhel8]': 10,
+            'tests/test_a.py::test_a[rhel9]': 10,
+            'tests/test_a.py::test_hosts': 600,
+            'tests/test_a.py::test_destructive': 20,
+            'tests/test_b.py::test_capsule': 30,
+        }
+    )
+    report = plan(items, history, max_workers=4)
+    assert report['tests'] == 6
+    assert report['skipped'] == 1
+    assert report['checkouts_by_fixture'] == {
+        'rhel_contenthost': 2,
+        'content_hosts': 2,
+        'target_sat': 1,
+        # once for the module, the test requesting the factory calls it
+        'module_capsule_host': 1,
+        'satellite_factory': 1,
+    }
+    assert report['checkouts'] == 7
+    # test_hosts is longer than every other test together
+    assert report['workers'] == 2
+    assert report['wall_time'] == 600
+    assert report['without_history'] == 1
+    report = plan(items, DurationHistory(), max_workers=4, hostnames=1, on_demand=True)
+    assert report['checkouts_by_fixture']['align_to_satellite'] == report['workers'] - 1
+
+
+def test_recommend_workers():
+    units = [(f'unit_{index}', 10, frozenset()) for index in range(8)]
+    assert recommend_workers(units, 16) == 8
+    assert recommend_workers(units, 16, tolerance=1) == 4
+    assert recommend_workers([], 16) == 1
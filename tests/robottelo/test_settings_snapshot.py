@@ -0,0 +1,70 @@
+from dynaconf import LazySettings
+import pytest
+
+from robottelo.config import snapshot
+
+
+@pytest.fixture
+def root(tmp_path):
+    tmp_path.joinpath('conf').mkdir()
+    tmp_path.joinpath('settings.yaml').write_text('server: {hostname: sat.example.com}\n')
+    tmp_path.joinpath('conf', 'robottelo.yaml').write_text('robottelo: {locale: en_US}\n')
+    return tmp_path
+
+
+def build_settings(root, **options):
+    settings = LazySettings(
+        root_path=str(root),
+        settings_file='settings.yaml',
+        preload=['conf/*.yaml'],
+        envless_mode=True,
+        lowercase_read=True,
+    )
+    settings.set('robottelo.settings', {'get_fresh': False, 'compiled': True, **options})
+    settings.set('server.version', {'source': 'ga'})
+    return settings
+
+
+def test_fingerprint(root):
+    key = snapshot.fingerprint(root, environ={}, cwd=root)
+    assert snapshot.fingerprint(root, environ={'HOME': '/root'}, cwd=root) == key
+    assert snapshot.fingerprint(root, environ={'ROBOTTELO_SERVER__PORT': '443'}, cwd=root) != key
+    root.joinpath('conf', 'robottelo.yaml').write_text('robottelo: {locale: de_DE}\n')
+    changed = snapshot.fingerprint(root, environ={}, cwd=root)
+    assert changed != key
+    root.joinpath('.secrets.yaml').write_text('server: {admin_password: changeme}\n')
+    secrets = snapshot.fingerprint(root, environ={}, cwd=root)
+    assert secrets != changed
+    root.joinpath('settings_cache-6.19-1.0.json').write_text('{"REPOS": {}}')
+    assert snapshot.fingerprint(root, environ={}, cwd=root) != secrets
+
+
+def test_is_compilable(root):
+    assert snapshot.is_compilable(build_settings(root))
+    assert not snapshot.is_compilable(build_settings(root, compiled=False))
+    assert not snapshot.is_compilable(build_settings(root, get_fresh=True))
+    assert not snapshot.is_compilable(build_settings(root, ignore_validation_errors=True))
+    settings = build_settings(root, get_fresh=True)
+    settings.set('server.version.source', 'nightly')
+    assert snapshot.is_compilable(settings)
+
+
+def test_save_and_load(root):
+    settings = build_settings(root)
+    assert snapshot.load('key', root) is None
+    snapshot.save(settings, 'old', root)
+    snapshot.save(settings, 'key', root)
+    assert [path.name for path in root.joinpath('.settings_snapshots').iterdir()] == ['key.pickle']
+    loaded = snapshot.load('key', root, envless_mode=True, lowercase_read=True)
+    assert loaded.server.hostname == 'sat.example.com'
+    assert loaded.get('robottelo.locale') == 'en_US'
+    assert loaded.as_dict()['SERVER'] == settings.as_dict()['SERVER']
+    loaded.set('server.hostname', 'other.example.com')
+    assert loaded.server.hostname == 'other.example.com'
+
+
+def test_load_ignores_broken_snapshot(root):
+    path = snapshot.snapshot_path('key', root)
+    path.parent.mkdir()
+    path.write_bytes(b'not a pickle')
+    assert snapshot.load('key', root) is None
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from dynaconf import Validator
+from dynaconf.validator import ValidationError
+import pytest
+
+from robottelo.config.validation import LazyValidatedSettings, group_by_section
+
+
+@pytest.fixture
+def settings(tmp_path):
+    tmp_path.joinpath('settings.yaml').write_text(
+        'server: {hostname: sat.example.com}\nazure: {client_id: 1}\n'
+    )
+    return LazyValidatedSettings(
+        {
+            'server': [
+                Validator('server.hostname', must_exist=True),
+                Validator('server.port', default=443),
+            ],
+            'azure': [Validator('azure.client_id', is_type_of=str)],
+            'mcp': [Validator('foreman_mcp.port', default=8080)],
+        },
+        root_path=str(tmp_path),
+        settings_file='settings.yaml',
+        envless_mode=True,
+        lowercase_read=True,
+    )
+
+
+def test_group_by_section():
+    server = Validator('server.hostname') | Validator('server.hostnames')
+    mcp = Validator('foreman_mcp.port')
+    assert group_by_section({'server': [server], 'mcp': [mcp]}) == {
+        'server': [server],
+        'foreman_mcp': [mcp],
+    }
+
+
+def test_sections_are_validated_on_first_read(settings):
+    assert not settings.is_validated('server')
+    assert settings.server.port == 443
+    assert settings.is_validated('server')
+    assert not settings.is_validated('azure')
+    assert settings.get('foreman_mcp.port') == 8080
+    assert settings['FOREMAN_MCP'].port == 8080
+    settings.set('server.port', 8443)
+    assert settings.server.port == 8443
+
+
+def test_invalid_section_raises_on_every_read(settings):
+    assert settings.server.hostname == 'sat.example.com'
+    for _ in range(2):
+        with pytest.raises(ValidationError, match='azure.client_id'):
+            getattr(settings, 'azure')  # noqa: B009
+    with pytest.raises(ValidationError):
+        settings.get('azure.client_id')
+    with pytest.raises(ValidationError):
+        settings.validate_all()
+
+
+def test_ignored_validation_errors(settings):
+    settings.set('robottelo.settings.ignore_validation_errors', True)
+    assert settings.azure.client_id == 1
+    assert settings.as_dict()['SERVER']['port'] == 443
+
+
+def test_concurrent_reads(settings):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        ports = list(pool.map(lambda _: settings.server.port, range(32)))
+    assert ports == [443] * 32
@@ -1,7 +1,10 @@
 """Tests for module ``robottelo.utils.ssh``."""
 
+import time
 from unittest import mock
 
+import pytest
+
 from robottelo import ssh
 
 
@@ -90,6 +93,7 @@ class MockSSHClient:
 class TestSSH:
     """Tests for module ``robottelo.utils.ssh``."""
 
+    @mock.patch.object(ssh, '_pool', None)
     @mock.patch('robottelo.config.settings')
     def test_command(self, settings):
         ssh.get_client = MockSSHClient
@@ -99,6 +103,108 @@ class TestSSH:
         settings.server.ssh_password = 'test_password'
         settings.server.ssh_client.command_timeout = 300000
         settings.server.ssh_client.connection_timeout = 10000
+        settings.server.ssh_client.get.side_effect = {
+            'pool_max_sessions': 2,
+            'pool_idle_timeout': 300,
+        }.get
 
         ret = ssh.command('ls -la')
         assert ret[1].cmd == 'ls -la'
+
+
+class MockResult:
+    def __init__(self, status=0):
+        self.status = status
+
+
+class MockPooledClient:
+    """A mock host object counting how it is used by the pool."""
+
+    def __init__(self):
+        self._session = object()
+        self.executed = []
+        self.closed = False
+
+    def execute(self, cmd, timeout=None):
+        self.executed.append(cmd)
+        return MockResult()
+
+    def close(self):
+        self.closed = True
+        self._session = None
+
+
+class TestSSHConnectionPool:
+    """Tests for ``robottelo.ssh.SSHConnectionPool``."""
+
+    key = ('example.com', 'root', 22, 'ipv4')
+
+    def test_client_is_reused(self):
+        pool = ssh.SSHConnectionPool()
+        factory = mock.Mock(side_effect=MockPooledClient)
+        with pool.connection(self.key, factory) as first:
+            pass
+        with pool.connection(self.key, factory) as second:
+            pass
+        assert first is second
+        assert factory.call_count == 1
+
+    def test_clients_are_keyed(self):
+        pool = ssh.SSHConnectionPool()
+        with pool.connection(self.key, MockPooledClient) as first:
+            pass
+        with pool.connection(('other.com', 'root', 22, 'ipv4'), MockPooledClient) as second:
+            pass
+        assert first is not second
+
+    @mock.patch.object(ssh, '_pool', None)
+    @mock.patch.object(ssh, 'get_client')
+    @mock.patch('robottelo.config.settings')
+    def test_credentials_are_keyed(self, settings, get_client):
+        get_client.side_effect = lambda **kwargs: MockPooledClient()
+        settings.server.ssh_client.get.side_effect = {}.get
+        with ssh.pooled_client('example.com', 'root', 'first') as first:
+            pass
+        with ssh.pooled_client('example.com', 'root', 'second') as second:
+            pass
+        with ssh.pooled_client('example.com', 'root', 'first') as again:
+            pass
+        assert first is not second
+        assert first is again
+
+    def test_client_discarded_on_error(self):
+        pool = ssh.SSHConnectionPool()
+        with pytest.raises(RuntimeError), pool.connection(self.key, MockPooledClient) as first:
+            raise RuntimeError('broken channel')
+        assert first.closed
+        with pool.connection(self.key, MockPooledClient) as second:
+            pass
+        assert first is not second
+
+    def test_idle_client_evicted(self):
+        pool = ssh.SSHConnectionPool(idle_timeout=0)
+        with pool.connection(self.key, MockPooledClient) as first:
+            pass
+        time.sleep(0.01)
+        with pool.connection(self.key, MockPooledClient) as second:
+            pass
+        assert first.closed
+        assert first is not second
+
+    def test_health_check(self):
+        pool = ssh.SSHConnectionPool(health_check_interval=0)
+        with pool.connection(self.key, MockPooledClient) as first:
+            pass
+        with pool.connection(self.key, MockPooledClient) as second:
+            pass
+        assert first is second
+        assert second.executed == [pool.health_check_command]
+
+    def test_max_sessions_per_host(self):
+        pool = ssh.SSHConnectionPool(max_sessions_per_host=1, acquire_timeout=0.1)
+        with pool.connection(self.key, MockPooledClient):
+            with pytest.raises(ssh.SSHPoolTimeoutError):
+                pool.acquire(self.key, MockPooledClient)
+            # other hosts are not limited by this one
+            pool.acquire(('other.com', 'root', 22, 'ipv4'), MockPooledClient)
+        assert pool.acquire(self.key, MockPooledClient)
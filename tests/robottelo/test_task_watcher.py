@@ -0,0 +1,113 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from nailgun.entity_mixins import TaskFailedError, TaskTimedOutError
+import pytest
+
+from robottelo.host_helpers.task_watcher import TaskWatcher
+
+
+class FakeTask:
+    def __init__(self, task_id, state='running', result='pending'):
+        self.id = task_id
+        self.state = state
+        self.result = result
+
+    def to_json_dict(self):
+        return {'id': self.id, 'state': self.state, 'result': self.result}
+
+
+class FakeTasks:
+    """Tasks that finish after being searched ``finish_after`` times"""
+
+    def __init__(self, finish_after, result='success'):
+        self.finish_after = finish_after
+        self.result = result
+        self.searches = []
+
+    def search(self, query):
+        self.searches.append(query)
+        ids = [part.split(' = ')[1] for part in query['search'].split(' or ')]
+        done = len(self.searches) >= self.finish_after
+        return [FakeTask(task_id, *(('stopped', self.result) if done else ())) for task_id in ids]
+
+
+@pytest.fixture
+def watcher():
+    satellite = mock.Mock(hostname='sat.example.com')
+    watcher = TaskWatcher(satellite, min_interval=0.01, max_interval=0.05)
+    watcher.fake_tasks = FakeTasks(finish_after=3)
+    satellite.api.ForemanTask.return_value = watcher.fake_tasks
+    return watcher
+
+
+def test_wait_polls_tasks_in_bulk(watcher):
+    tasks = watcher.wait(['a', 'b', 'c'], timeout=5)
+    assert [task.id for task in tasks] == ['a', 'b', 'c']
+    assert len(watcher.fake_tasks.searches) == 3
+    assert watcher.fake_tasks.searches[0] == {'search': 'id = a or id = b or id = c', 'per_page': 3}
+
+
+def test_callers_share_polling(watcher):
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: watcher.wait(['a', 'b'], timeout=5), range(4)))
+    assert all([task.id for task in tasks] == ['a', 'b'] for tasks in results)
+    # four callers waiting for the same tasks, not four polling loops
+    assert len(watcher.fake_tasks.searches) < 8
+
+
+def test_await_tasks(watcher):
+    async def wait_both():
+        return await asyncio.gather(
+            watcher.await_tasks(['a'], timeout=5), watcher.await_tasks(['b'], timeout=5)
+        )
+
+    first, second = asyncio.run(wait_both())
+    assert first[0].id == 'a'
+    assert second[0].id == 'b'
+
+
+def test_failed_task(watcher):
+    watcher.fake_tasks.result = 'error'
+    assert watcher.wait(['a'], timeout=5, must_succeed=False)[0].result == 'error'
+    with pytest.raises(TaskFailedError):
+        watcher.wait(['a'], timeout=5)
+
+
+def test_timeout_stops_polling(watcher):
+    watcher.fake_tasks.finish_after = 1000
+    with pytest.raises(TaskTimedOutError, match='a'):
+        watcher.wait(['a'], timeout=0.1)
+    assert watcher._futures == {}
+    assert watcher._waiters == {}
+
+
+def test_search_errors_fail_waits(watcher):
+    watcher._satellite.api.ForemanTask.return_value = mock.Mock(
+        search=mock.Mock(side_effect=ConnectionError('boom'))
+    )
+    watcher.max_errors = 2
+    with pytest.raises(ConnectionError):
+        watcher.wait(['a'], timeout=5)
+
+
+def test_search_errors_reset_after_failing_waits(watcher):
+    later = []
+
+    def search(query):
+        searches = len(watcher.fake_tasks.searches)
+        if searches < 3:
+            watcher.fake_tasks.searches.append(query)
+            if searches == 1:
+                # watched while the failing searches of 'a' are retried
+                later.extend(watcher.watch(['b']))
+            raise ConnectionError('boom')
+        return watcher.fake_tasks.search(query)
+
+    watcher._satellite.api.ForemanTask.return_value = mock.Mock(search=search)
+    watcher.max_errors = 2
+    with pytest.raises(ConnectionError):
+        watcher.wait(['a'], timeout=5)
+    assert later[0].result(timeout=5).id == 'b'
+    watcher.unwatch(['b'])